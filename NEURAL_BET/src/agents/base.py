@@ -32,6 +32,11 @@ class BaseAgent(ABC):
     # Default: agents are CRITICAL (pipeline stops on failure)
     is_critical: bool = True
     
+    # What the agent reads, fingerprinted for incremental re-analysis:
+    # state fields and upstream report keys (see collect_inputs)
+    input_fields: tuple = ("match_data",)
+    input_reports: tuple = ()
+    
     def __init__(self, name: str, role: str):
         self.name = name
         self.role = role
@@ -87,6 +92,16 @@ class BaseAgent(ABC):
             self.log("Continuing in degraded mode (non-critical agent)...", level="warning")
             return working_state
 
+    async def collect_inputs(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Inputs the agent's output depends on. The pipeline reuses a stored
+        output when their fingerprint is unchanged, so an agent reading more
+        than input_fields / input_reports must override this.
+        """
+        inputs = {field: getattr(state, field) for field in self.input_fields}
+        inputs.update({key: state.analysis_reports.get(key) for key in self.input_reports})
+        return inputs
+
     @abstractmethod
     async def process(self, state: AgentState) -> AgentState:
         """
@@ -2,22 +2,45 @@
 from src.agents.base import BaseAgent, AgentState
 import asyncio
 import random
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from src.core.data_provider import MatchDataProvider
+from src.core.poisson import match_prior
+from src.core.ratings import RatingTable, get_rating_table
 
 class DataMinerAgent(BaseAgent):
     """
     Agent responsible for fetching raw match data (Stats, Lineups, H2H).
     Now enforces a provider via Dependency Injection.
+    Long-term team ratings (Elo, xG attack/defence) are added from the rating table.
     """
     
     # No data = no analysis possible. MUST stop pipeline.
     is_critical: bool = True
     
-    def __init__(self, provider: MatchDataProvider):
+    def __init__(self, provider: MatchDataProvider, ratings: Optional[RatingTable] = None):
         super().__init__(name="Miner_01", role="Data Mining")
         self.provider = provider
+        self.ratings = ratings if ratings is not None else get_rating_table()
+
+    @staticmethod
+    def _prior_line(prior) -> str:
+        if not prior:
+            return "No xG prior (insufficient data)."
+        return (
+            f"xG prior (Dixon-Coles): 1 {prior['home_win']:.0%} / X {prior['draw']:.0%} / 2 {prior['away_win']:.0%}, "
+            f"most likely {prior['most_likely_score']}."
+        )
+
+    @staticmethod
+    def _ratings_line(ratings) -> str:
+        if not ratings:
+            return "No team ratings yet."
+        home, away = ratings["home"], ratings["away"]
+        return (
+            f"Elo {home['elo']:.0f} vs {away['elo']:.0f} (home expectation {ratings['home_expectation']:.0%}), "
+            f"attack/defence {home['attack']:.2f}/{home['defence']:.2f} vs {away['attack']:.2f}/{away['defence']:.2f}."
+        )
 
     async def process(self, state: AgentState) -> AgentState:
         # Fetch from Provider
@@ -27,12 +50,23 @@ class DataMinerAgent(BaseAgent):
             raise ValueError("Provider returned no data.")
 
         state.match_data = data
+
+        # Long-term strength (providers with their own as-of ratings, e.g. backtests, keep them)
+        if "ratings" not in data and self.ratings is not None:
+            data["ratings"] = self.ratings.match_ratings(data.get("home_team", ""), data.get("away_team", ""))
+        
+        # Numeric baseline (Dixon-Coles on xG) given to the agents as a prior
+        prior = match_prior(data)
+        if prior:
+            state.match_data["prior"] = prior
         
         # UI Summary Report
         state.analysis_reports["miner_report"] = f"""
 ### 🧪 Reasoning
 Successfully extracted raw metrics from {data.get('meta', {}).get('provider', 'Multi-source')}.
 Targeting match: {data.get('home_team')} vs {data.get('away_team')}.
+{self._prior_line(prior)}
+{self._ratings_line(data.get("ratings"))}
 
 ### 🎯 Verdict
 DATA_READY - Pipeline sequence initialized.
@@ -14,6 +14,8 @@ class DevilsAdvocateAgent(BaseAgent):
     # Enrichment agent: nice-to-have but not required for output
     is_critical: bool = False
     
+    input_reports: tuple = ("metrician_report", "tactician_report")
+    
     def __init__(self):
         super().__init__(name="Mephisto_01", role="System Critic")
         # Groq Compound for cold logic
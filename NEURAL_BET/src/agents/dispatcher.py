@@ -5,6 +5,8 @@ from typing import Optional, Dict, Any
 from src.agents.base import BaseAgent, AgentState
 from src.core.llm import LLMFactory
 from src.core.schemas import DispatcherOutput
+from src.core.fixture_calendar import FixtureCalendar, get_fixture_calendar
+from src.core.team_names import TeamAliasIndex, get_team_index
 from src.providers.neural_bet_provider import NeuralBetProvider
 from langchain_core.messages import SystemMessage, HumanMessage
 
@@ -12,16 +14,18 @@ class DispatcherAgent(BaseAgent):
     """
     Agent 0: The Dispatcher (Refactored).
     Strict 3-Step Process:
-    1. EXTRACT: LLM extracts entity names (JSON only).
-    2. VERIFY: Python Provider validates match/date.
+    1. EXTRACT: Rule-based alias index + date parser; LLM (JSON only) only for ambiguous input.
+    2. VERIFY: Local fixture calendar first, then Python Provider validates match/date.
     3. OUTPUT: Return standard DispatcherOutput.
     """
     
-    def __init__(self):
+    def __init__(self, calendar: Optional[FixtureCalendar] = None, team_index: Optional[TeamAliasIndex] = None):
         super().__init__(name="Dispatcher_00", role="Traffic Control")
         # Fast Model (Llama 8b Instant)
         self.llm = LLMFactory.create("dispatcher")
         self.provider = NeuralBetProvider()
+        self.calendar = calendar or get_fixture_calendar()
+        self.team_index = team_index or get_team_index()
         self.feedback_callback = None
 
     def set_feedback_callback(self, callback):
@@ -48,12 +52,11 @@ class DispatcherAgent(BaseAgent):
             
         return text.strip()
 
-    async def run(self, user_input: str) -> DispatcherOutput:
-        from datetime import datetime
-        current_date_str = datetime.now().strftime("%Y-%m-%d")
-        
-        # Step 1: Extraction (LLM)
-        await self._think(f"📅 Date système : {current_date_str}")
+    async def _extract_with_llm(self, user_input: str, current_date_str: str):
+        """
+        Step 1b: LLM entity extraction (fallback for ambiguous queries).
+        Returns (team1, team2, date_hint), or a failed DispatcherOutput.
+        """
         await self._think("🧠 Analyse sémantique (Nettoyage entités)...")
         
         system_prompt = f"""You are an ENTITY EXTRACTOR for football matches.
@@ -92,6 +95,11 @@ class DispatcherAgent(BaseAgent):
             
             await self._think(f"🔍 Entités brutes : {t1} | {t2 or 'Any'} | Date: {d_hint or 'None'}")
             
+            # Align LLM spellings with provider names ("FC Barcelona" -> "Barcelona")
+            t1 = self.team_index.canonical(t1)
+            t2 = self.team_index.canonical(t2) if t2 else t2
+            return t1, t2, d_hint
+            
         except Exception as e:
             # Try to log the raw content if available, else generic error
             raw_preview = locals().get('raw_content', 'No content')[:200]
@@ -102,7 +110,39 @@ class DispatcherAgent(BaseAgent):
                 reasoning=f"LLM Parsing Failed: {str(e)}"
             )
 
-        # Step 2: Verification (Python Provider) with TIMEOUT
+    async def run(self, user_input: str) -> DispatcherOutput:
+        from datetime import datetime
+        current_date_str = datetime.now().strftime("%Y-%m-%d")
+        
+        # Step 1a: Rule-based extraction (alias index + date parser, no network)
+        await self._think(f"📅 Date système : {current_date_str}")
+        parsed = self.team_index.parse_query(user_input, today=datetime.now().date())
+        if parsed["confident"]:
+            t1, t2, d_hint = parsed["team1"], parsed["team2"], parsed["date_hint"]
+            await self._think(f"⚡ Entités (index local) : {t1} | {t2 or 'Any'} | Date: {d_hint or 'None'}")
+        else:
+            entities = await self._extract_with_llm(user_input, current_date_str)
+            if isinstance(entities, DispatcherOutput):
+                return entities
+            t1, t2, d_hint = entities
+
+        # Step 2a: Local fixture calendar (no network). A stale calendar is
+        # refreshed in the background for the next queries.
+        self.calendar.ensure_fresh(self.provider.fbref)
+        calendar_hit = self.calendar.find(t1, t2, d_hint, today=current_date_str)
+        if calendar_hit:
+            await self._think(f"⚡ Match trouvé dans le calendrier local : {calendar_hit['home']} vs {calendar_hit['away']} ({calendar_hit['date']})")
+            return DispatcherOutput(
+                match_found=True,
+                match_id=calendar_hit["match_id"],
+                home=calendar_hit["home"],
+                away=calendar_hit["away"],
+                date=calendar_hit["date"],
+                competition=calendar_hit["league"],
+                reasoning=f"Validated via {calendar_hit['source']}"
+            )
+
+        # Step 2b: Verification (Python Provider) with TIMEOUT
         # This prevents UI freeze if provider is slow/blocked
         await self._think(f"🌍 Interrogation Provider pour {t1}...")
         
@@ -124,7 +164,7 @@ class DispatcherAgent(BaseAgent):
             if not match_data.get("found"):
                 reason = match_data.get("reason", "Match not found.")
                 await self._think(f"❌ échec Provider : {reason}")
-                return DispatcherOutput(match_found=False, reasoning=reason)
+                return DispatcherOutput(match_found=False, home=t1, away=t2, reasoning=reason)
             
             # Step 3: Success
             src = match_data.get("source", "Unknown")
@@ -145,11 +185,13 @@ class DispatcherAgent(BaseAgent):
             await self._think(f"⏱️ Provider timeout après {PROVIDER_TIMEOUT_SECONDS}s")
             return DispatcherOutput(
                 match_found=False, 
+                home=t1,
+                away=t2,
                 reasoning=f"Provider verification timed out after {PROVIDER_TIMEOUT_SECONDS}s. Try again or specify a date."
             )
             
         except Exception as e:
-             return DispatcherOutput(match_found=False, reasoning=f"Provider Verification Error: {str(e)}")
+             return DispatcherOutput(match_found=False, home=t1, away=t2, reasoning=f"Provider Verification Error: {str(e)}")
 
 
     async def process(self, state: AgentState) -> AgentState:
@@ -1,26 +1,43 @@
 # -*- coding: utf-8 -*-
+from typing import Optional
+
 from src.agents.base import BaseAgent, AgentState
-from src.core.market_provider import MarketDataProvider, MockMarketProvider
+from src.core.market_provider import MarketDataProvider, get_market_provider
+from src.core.odds_store import DEFAULT_BOOKMAKER, OddsStore, get_odds_store
 
 class MarketAgent(BaseAgent):
     """
     The Bookie Watcher (Branch B).
     Responsibility: Gather market data (Cotes) in parallel to the analysis.
     This data IS NOT used by Metrician/Tactician (Double Blind).
+    Every snapshot is appended to the odds history (src/core/odds_store.py),
+    which also answers when the provider has nothing and gives the line movement.
     """
     
-    def __init__(self, provider: MarketDataProvider = None):
+    def __init__(self, provider: MarketDataProvider = None, store: Optional[OddsStore] = None):
         super().__init__(name="Market_01", role="Odds Scraper")
         if provider:
             self.provider = provider
         else:
-            self.provider = MockMarketProvider()
+            self.provider = get_market_provider()
+        self.store = store if store is not None else get_odds_store()
 
     async def process(self, state: AgentState) -> AgentState:
         odds = await self.provider.get_odds(state.match_id)
         if odds:
             state.market_data = odds
+            # Polling providers record their own price changes
+            if self.store is not None and getattr(self.provider, "store", None) is None:
+                self.store.record(state.match_id, odds, bookmaker=getattr(self.provider, "bookmaker", DEFAULT_BOOKMAKER))
+        elif self.store is not None and (recorded := self.store.latest(state.match_id)):
+            self.log("No live odds - using the last recorded prices.", level="warning")
+            state.market_data = recorded
         else:
             self.log("No odds found for this match.", level="warning")
+        
+        if self.store is not None:
+            movement = self.store.movement(state.match_id)
+            if movement:
+                state.analysis_reports["market_movement"] = movement
             
         return state
@@ -41,6 +41,8 @@ class MetricianAgent(BaseAgent):
         1. Analyze the difference between Expected Goals (xG) and Actual Goals.
         2. Identify if a team is unsustainably over-performing or under-performing.
         3. Determine if the current league position is a reflection of skill or statistical noise.
+        4. If match_data contains a "prior" (Dixon-Coles probabilities computed from xG), use it as the numeric baseline and explain where the variance makes it too high or too low.
+        5. If a team has "understat_features" (xG, xGA, xG difference, goal difference and points per game over the last 3/5/10 matches and the season, overall and home/away), compare the windows to separate a trend from noise, and use the home split for the home team and the away split for the away team.
         
         STRICT CONSTRAINT: Do not be conversational. 
         If data is missing or insufficient, state "INSUFFICIENT_DATA".
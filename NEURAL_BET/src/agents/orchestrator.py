@@ -15,13 +15,22 @@ class OrchestratorAgent(BaseAgent):
     # Final synthesis MUST succeed for valid output
     is_critical: bool = True
     
+    input_fields: tuple = ()
+    input_reports: tuple = ("metrician_report", "tactician_report", "devils_advocate_report")
+    
     def __init__(self):
         super().__init__(name="Orchestrator_X", role="Synthesis Loop")
         # Kimi k2.5 for high-level reasoning
         self.llm = LLMFactory.create("orchestrator")
 
+    async def collect_inputs(self, state: AgentState):
+        inputs = await super().collect_inputs(state)
+        inputs["prior"] = (state.match_data or {}).get("prior")
+        return inputs
+
     async def process(self, state: AgentState) -> AgentState:
         # Gather Intelligence
+        prior = (state.match_data or {}).get("prior") or "N/A"
         metrician_rpt = state.analysis_reports.get("metrician_report", "N/A")
         tactician_rpt = state.analysis_reports.get("tactician_report", "N/A")
         devil_rpt = state.analysis_reports.get("devils_advocate_report", "N/A")
@@ -45,8 +54,13 @@ class OrchestratorAgent(BaseAgent):
         <critic_report>{devil_rpt}</critic_report>
         </intelligence_reports>
 
+        <statistical_prior>
+        {prior}
+        </statistical_prior>
+
         <instructions>
         Your task is to reach a final, probabilistic conclusion about the match outcome.
+        0. **Anchor on the Prior**: The statistical prior is a Dixon-Coles model on xG. Start from its 1X2 probabilities and only move away from them for reasons given in the reports.
         1. **Weigh the Evidence**: Does the tactical fit (Tactician) confirm or negate the statistical noise (Metrician)?
         2. **Assess the Threat**: Is the Devil's Advocate warning a credible 'Black Swan' or just noise?
         3. **Synthesize the Script**: Describe the most likely narrative flow of the game.
@@ -68,6 +82,7 @@ class OrchestratorAgent(BaseAgent):
             "metrician_rpt": str(metrician_rpt),
             "tactician_rpt": str(tactician_rpt),
             "devil_rpt": str(devil_rpt),
+            "prior": str(prior),
             "format_instructions": parser.get_format_instructions()
         })
         
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
+import asyncio
+from typing import Any, Dict, Tuple
+
 from src.agents.base import BaseAgent, AgentState
 from src.core.llm import LLMFactory
 from src.core.news_provider import NewsDataProvider, MockNewsProvider
+from src.core.team_names import parse_match_id
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
@@ -24,20 +28,35 @@ class PsychAgent(BaseAgent):
         else:
              self.news_provider = MockNewsProvider()
 
+    def _teams(self, match_id: str) -> Tuple[str, str]:
+        parts = parse_match_id(match_id)
+        if parts is None:
+             return "HomeTeam", "AwayTeam"
+        return parts.home, parts.away
+
+    async def _fetch_news(self, match_id: str) -> Tuple[Any, Any]:
+        home_team, away_team = self._teams(match_id)
+        home_news, away_news = await asyncio.gather(
+            self.news_provider.get_team_news(home_team),
+            self.news_provider.get_team_news(away_team),
+        )
+        return home_news, away_news
+
+    async def collect_inputs(self, state: AgentState) -> Dict[str, Any]:
+        """
+        The psych report depends on the news only (not on match_data).
+        process() reads them again: the news providers cache them (TTL), so
+        that second read is served from memory.
+        """
+        home_news, away_news = await self._fetch_news(state.match_id)
+        return {"home_news": home_news, "away_news": away_news}
+
     async def process(self, state: AgentState) -> AgentState:
         match_id = state.match_id
-        # Simple parser for MVP "Home_Away"
-        try:
-             parts = match_id.split("_")
-             home_team = parts[0]
-             away_team = parts[1]
-        except:
-             home_team = "HomeTeam"
-             away_team = "AwayTeam"
+        home_team, away_team = self._teams(match_id)
              
-        # Fetch News
-        home_news = await self.news_provider.get_team_news(home_team)
-        away_news = await self.news_provider.get_team_news(away_team)
+        # Fetch News (cached by the provider when just collected for the input fingerprint)
+        home_news, away_news = await self._fetch_news(match_id)
         
         # Construct Prompt using Professional Standards
         prompt = ChatPromptTemplate.from_template("""
@@ -14,6 +14,9 @@ class TacticianAgent(BaseAgent):
     # Tactical analysis is core to prediction
     is_critical: bool = True
     
+    # No input_reports: the pipeline runs the swarm isolated (AnalysisPipeline._run_isolated),
+    # so the Metrician's report is only there in the sequential main.py run.
+    
     def __init__(self):
         super().__init__(name="Tactician_Prime", role="Tactical Analyst")
         # Mistral Large for tactical depth
@@ -1,55 +1,98 @@
 # -*- coding: utf-8 -*-
+from typing import Optional, Union
+
 from src.agents.base import BaseAgent, AgentState
 from src.core.llm import LLMFactory
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+from src.core.schemas import ValueHunterOutput
+from src.core.odds_store import OddsStore, get_odds_store
+from src.core.calibration import CalibrationStore, get_calibration_store
+from src.core.value import KELLY_FRACTION, MARKET_LABELS, model_probabilities, scan_card, stake_units
 
 class ValueHunterAgent(BaseAgent):
     """
     The Value Hunter (Convergence Point).
-    Responsibility: Compare Orchestrator's Verdict vs Market Odds.
-    Identify POSITIVE EXPECTED VALUE (EV+) Bets.
+    Responsibility: Compare the model probabilities (numeric prior + Orchestrator's Verdict)
+    with Market Odds on every market. Identify POSITIVE EXPECTED VALUE (EV+) Bets.
+    EV, margin removal and Kelly staking are pure computation (src/core/value.py);
+    the LLM only writes the justification when explain=True.
+    Current (if not in the state) and opening prices come from the odds history.
+    The verdict's confidence is logged and calibrated (src/core/calibration.py)
+    before it is used as a probability; calibration=False uses it raw and
+    never opens the shared calibration store.
     """
     
-    def __init__(self):
+    def __init__(self, explain: bool = False, store: Optional[OddsStore] = None, calibration: Union[CalibrationStore, bool, None] = None):
         super().__init__(name="Hunter_01", role="Financial Strategist")
-        # Groq Compound for cold math/logic
-        self.llm = LLMFactory.create("value_hunter") 
+        self.explain = explain
+        self.store = store if store is not None else get_odds_store()
+        if calibration is False:
+            self.calibration = None
+        else:
+            self.calibration = calibration if calibration is not None else get_calibration_store()
+        # Groq Compound for cold math/logic (only needed for the explanation)
+        self.llm = LLMFactory.create("value_hunter") if explain else None
 
     async def process(self, state: AgentState) -> AgentState:
+        if not state.market_data and self.store is not None:
+            state.market_data = self.store.latest(state.match_id) or None
         if not state.market_data:
             self.log("Skipping Value Hunt - No market data available.", level="warning")
             return state
             
         orchestrator_output = state.analysis_reports.get("orchestrator_final")
+        prior = (state.match_data or {}).get("prior")
         
         # Check if Orchestrator failed or returned string (e.g. error)
-        if not orchestrator_output or not hasattr(orchestrator_output, "confidence_score"):
-             self.log("Orchestrator output missing or invalid (not an object).", level="error")
-             return state
+        if not hasattr(orchestrator_output, "confidence_score"):
+             orchestrator_output = None
+             if not prior:
+                 self.log("Orchestrator output missing or invalid and no numeric prior.", level="error")
+                 return state
 
-        market_odds = state.market_data
-        
-        # --- Python Math Logic ---
-        confidence = orchestrator_output.confidence_score # float 0.0-1.0
-        prediction = orchestrator_output.winner_prediction # HOME, DRAW, AWAY
+        confidence = orchestrator_output.confidence_score if orchestrator_output else None
+        if confidence is not None and self.calibration is not None:
+            self.calibration.record(state.match_id, orchestrator_output.winner_prediction, confidence)
+            confidence = self.calibration.calibrate(confidence)
+            state.analysis_reports["calibrated_confidence"] = confidence
+
+        # --- Python Math Logic (every market at once) ---
+        probs = model_probabilities(
+            prior,
+            orchestrator_output.winner_prediction if orchestrator_output else None,
+            confidence,
+        )
+        opening = self.store.opening(state.match_id) if self.store is not None else None
+        bets = scan_card([{"match_id": state.match_id, "odds": state.market_data, "probs": probs, "opening": opening}])
+        state.analysis_reports["value_scan"] = bets
         
-        # Map prediction to odd key
-        odd_key_map = {
-            "HOME": "home_win",
-            "DRAW": "draw",
-            "AWAY": "away_win"
-        }
+        if not bets:
+            self.log("No EV+ market found.")
+            return state
         
-        target_odd_key = odd_key_map.get(prediction)
-        target_odd = market_odds.get(target_odd_key, 1.0)
+        best = bets[0]
+        match_data = state.match_data or {}
+        label = MARKET_LABELS[best["market"]].format(
+            home=match_data.get("home_team", "Home"), away=match_data.get("away_team", "Away")
+        )
+        report = ValueHunterOutput(
+            ev_percentage=best["ev"],
+            bet_recommendation=label,
+            stake_unit=stake_units(best["stake"]),
+            reasoning=(
+                f"Model {best['prob']:.1%} vs fair market {best['fair_prob']:.1%} at {best['odds']:.2f} "
+                f"(edge {best['edge']:+.1%}, EV {best['ev']:+.1%}, {KELLY_FRACTION:g} Kelly stake {best['stake']:.1%})."
+            ),
+        )
         
-        # EV Computation: (Probability * Odd) - 1
-        # Probability is our confidence
-        ev_value = (confidence * target_odd) - 1.0
+        # --- Optional LLM Reasoning Portion ---
+        if self.explain:
+            report = await self._explain(report, best, orchestrator_output)
         
-        # --- LLM Reasoning Portion ---
-        from src.core.schemas import ValueHunterOutput
+        state.analysis_reports["value_report"] = report
+        return state
+
+    async def _explain(self, report: ValueHunterOutput, best: dict, orchestrator_output) -> ValueHunterOutput:
         from langchain_core.output_parsers import PydanticOutputParser
         
         parser = PydanticOutputParser(pydantic_object=ValueHunterOutput)
@@ -83,17 +126,17 @@ class ValueHunterAgent(BaseAgent):
 
         chain = prompt | self.llm | parser
         
-        report = await chain.ainvoke({
-            "narrative": orchestrator_output.logic_summary,
-            "prediction": prediction,
-            "odd": target_odd,
-            "ev": ev_value,
-            "ev_formatted": f"{ev_value*100:.2f}%",
+        explained = await chain.ainvoke({
+            "narrative": orchestrator_output.logic_summary if orchestrator_output else report.reasoning,
+            "prediction": report.bet_recommendation,
+            "odd": best["odds"],
+            "ev": best["ev"],
+            "ev_formatted": f"{best['ev']*100:.2f}%",
             "format_instructions": parser.get_format_instructions()
         })
         
-        # Override the EV in the report with our precise python float to ensure accuracy
-        report.ev_percentage = ev_value
-        
-        state.analysis_reports["value_report"] = report
-        return state
+        # Override the numbers in the report with our precise python values to ensure accuracy
+        explained.ev_percentage = report.ev_percentage
+        explained.bet_recommendation = report.bet_recommendation
+        explained.stake_unit = report.stake_unit
+        return explained
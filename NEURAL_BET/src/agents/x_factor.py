@@ -11,6 +11,9 @@ class XFactorAgent(BaseAgent):
     Detects if a team is over-performing or under-performing.
     """
     
+    # No input_reports: the pipeline runs the swarm isolated (AnalysisPipeline._run_isolated),
+    # so the Metrician's report is only there in the sequential main.py run.
+    
     def __init__(self):
         super().__init__(name="X-Factor_Unit", role="Variance Analyst")
         self.llm = LLMFactory.create("x_factor")
@@ -0,0 +1,604 @@
+# -*- coding: utf-8 -*-
+"""
+NEURAL BET: Backtesting over historical seasons.
+Replays past fixtures through the agent graph (DataMinerAgent and the
+analysis agents) and the ValueHunter, then scores the predictions against
+the results and the bets against the stored odds.
+
+- Data: each fixture sees an as-of snapshot built from the results played
+  before its kickoff (recent form + season totals, xG or goals as a proxy).
+- LLMs: agents get a stand-in model (LLMFactory.create is patched in the
+  worker processes). "stub" answers from the numeric prior, "cached" replays
+  responses stored by an earlier "live" run (stub on a miss), "live" calls
+  the real models and stores their responses.
+- Odds: the ValueHunter reads the last price before kickoff from an OddsStore.
+- Fixtures are sharded across a process pool.
+- Bets are scored twice: at their per-match Kelly stake, and re-sized per
+  matchday as one card by the portfolio optimiser (src/core/portfolio.py),
+  which accounts for the exposure of several bets settled together.
+- Verdict confidences are reported raw; the --json report can seed the
+  confidence calibration (python -m src.core.calibration --backtest).
+
+Usage:
+    neuralbet-backtest E0_2425.csv E0_2324.csv --workers 8 --bookmaker pinnacle
+"""
+import argparse
+import asyncio
+import contextvars
+import csv
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Ensure root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import get_data_dir
+from src.core.data_provider import MatchDataProvider
+from src.core.odds_store import OddsStore, football_data_fixture, to_timestamp
+from src.core.poisson import match_prior
+from src.core.portfolio import card_bets, optimise_card
+from src.core.ratings import RatingTable
+from src.core.value import RESULT_MARKETS, fair_probabilities, model_probabilities, settle_market
+
+logger = logging.getLogger(__name__)
+
+LLM_MODES = ("stub", "cached", "live")
+LLM_CACHE_FILENAME = "backtest_llm.db"
+FORM_MATCHES = 5  # recent form window, like UnderstatProvider.get_team_form
+MIN_HISTORY = 3  # matches a team must have played before a fixture is predicted
+SHARDS_PER_WORKER = 4
+OUTCOMES = ("HOME", "DRAW", "AWAY")
+
+
+# --- Fixtures ---
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _season(day: datetime) -> int:
+    """Season start year (a season runs from July to June)."""
+    return day.year if day.month >= 7 else day.year - 1
+
+
+def load_fixtures(paths: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Played fixtures of historical CSV files, in kickoff order.
+
+    Accepted layouts:
+    - football-data.co.uk: Div, Date, HomeTeam, AwayTeam, FTHG, FTAG (odds columns are read by OddsStore.load_csv);
+    - long: date, home, away, home_goals, away_goals [, home_xg, away_xg, league, match_id].
+    Goals stand in for xG when the file has none.
+    """
+    fixtures = []
+    for path in paths:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for line in csv.DictReader(f):
+                if "HomeTeam" in line:
+                    parsed = football_data_fixture(line)
+                    if parsed is None:
+                        continue
+                    match_id, kickoff = parsed
+                    home, away = line["HomeTeam"], line["AwayTeam"]
+                    goals = (_number(line.get("FTHG")), _number(line.get("FTAG")))
+                    xg = (_number(line.get("HxG")), _number(line.get("AxG")))
+                else:
+                    kickoff = datetime.fromisoformat(line["date"])
+                    home, away = line["home"], line["away"]
+                    league = line.get("league") or "PL"
+                    match_id = line.get("match_id") or f"{home}_{away}_{kickoff.date().isoformat()}_{league}".replace(" ", "_")
+                    goals = (_number(line.get("home_goals")), _number(line.get("away_goals")))
+                    xg = (_number(line.get("home_xg")), _number(line.get("away_xg")))
+                if None in goals:
+                    continue
+                fixtures.append({
+                    "match_id": match_id,
+                    "kickoff": kickoff.timestamp(),
+                    "season": _season(kickoff),
+                    "home": home,
+                    "away": away,
+                    "home_goals": int(goals[0]),
+                    "away_goals": int(goals[1]),
+                    "home_xg": xg[0] if xg[0] is not None else goals[0],
+                    "away_xg": xg[1] if xg[1] is not None else goals[1],
+                })
+    return sorted(fixtures, key=lambda fixture: fixture["kickoff"])
+
+
+class SeasonSnapshots:
+    """
+    As-of team data: for a fixture, only the team's matches of the same
+    season that kicked off strictly before it are visible. Team ratings
+    (src/core/ratings.py) carry over seasons and are taken before kickoff.
+    """
+
+    def __init__(self, fixtures: Sequence[Dict[str, Any]], form_matches: int = FORM_MATCHES, min_history: int = MIN_HISTORY):
+        self.form_matches = form_matches
+        self.min_history = min_history
+        self.fixtures = {fixture["match_id"]: fixture for fixture in fixtures}
+        # (team, season) -> kickoffs, and cumulative xG for / against (leading 0)
+        rows: Dict[tuple, List[tuple]] = {}
+        for fixture in fixtures:
+            rows.setdefault((fixture["home"], fixture["season"]), []).append(
+                (fixture["kickoff"], fixture["home_xg"], fixture["away_xg"]))
+            rows.setdefault((fixture["away"], fixture["season"]), []).append(
+                (fixture["kickoff"], fixture["away_xg"], fixture["home_xg"]))
+        self._teams = {}
+        for key, team_rows in rows.items():
+            team_rows.sort()
+            kickoffs = [row[0] for row in team_rows]
+            xg = np.concatenate([[0.0], np.cumsum([row[1] for row in team_rows])])
+            xga = np.concatenate([[0.0], np.cumsum([row[2] for row in team_rows])])
+            self._teams[key] = (kickoffs, xg, xga)
+
+        # Ratings before each fixture; fixtures sharing a kickoff don't see each other
+        table = RatingTable()
+        self._ratings: Dict[str, Optional[Dict[str, Any]]] = {}
+        ordered = sorted(fixtures, key=lambda fixture: fixture["kickoff"])
+        for _, group in groupby(ordered, key=lambda fixture: fixture["kickoff"]):
+            group = list(group)
+            for fixture in group:
+                self._ratings[fixture["match_id"]] = table.match_ratings(fixture["home"], fixture["away"])
+            for fixture in group:
+                table.apply({
+                    "match_id": fixture["match_id"],
+                    "date": datetime.fromtimestamp(fixture["kickoff"]).date().isoformat(),
+                    "home": fixture["home"],
+                    "away": fixture["away"],
+                    "home_goals": fixture["home_goals"],
+                    "away_goals": fixture["away_goals"],
+                    "home_xg": fixture["home_xg"],
+                    "away_xg": fixture["away_xg"],
+                })
+
+    def team_stats(self, team: str, season: int, before: float) -> Dict[str, Any]:
+        """understat_form / fbref_stats-shaped data of a team as of a kickoff."""
+        kickoffs, xg, xga = self._teams.get((team, season), ([], np.zeros(1), np.zeros(1)))
+        played = bisect_left(kickoffs, before)
+        if played < self.min_history:
+            error = {"error": f"Only {played} match(es) before kickoff"}
+            return {"understat_form": error, "fbref_stats": error}
+        recent = min(self.form_matches, played)
+        return {
+            "understat_form": {
+                "matches_analyzed": recent,
+                "avg_xg": round(float(xg[played] - xg[played - recent]) / recent, 3),
+                "avg_xga": round(float(xga[played] - xga[played - recent]) / recent, 3),
+            },
+            "fbref_stats": {"matches_played": played, "xG": round(float(xg[played]), 2), "xGA": round(float(xga[played]), 2)},
+        }
+
+    def match_data(self, match_id: str) -> Optional[Dict[str, Any]]:
+        fixture = self.fixtures.get(match_id)
+        if fixture is None:
+            return None
+        as_of = datetime.fromtimestamp(fixture["kickoff"]).isoformat()
+        return {
+            "id": match_id,
+            "home_team": fixture["home"],
+            "away_team": fixture["away"],
+            "stats": {
+                "home": self.team_stats(fixture["home"], fixture["season"], fixture["kickoff"]),
+                "away": self.team_stats(fixture["away"], fixture["season"], fixture["kickoff"]),
+            },
+            "ratings": self._ratings.get(match_id),
+            "meta": {"provider": f"Backtest snapshot (as of {as_of})"},
+        }
+
+
+class SnapshotProvider(MatchDataProvider):
+    """MatchDataProvider serving as-of snapshots to the DataMiner."""
+
+    def __init__(self, snapshots: SeasonSnapshots):
+        self.snapshots = snapshots
+
+    async def get_match_stats(self, match_id: str) -> Optional[Dict[str, Any]]:
+        return self.snapshots.match_data(match_id)
+
+    async def get_team_form(self, team_id: str, last_n: int = 5) -> Dict[str, Any]:
+        return {}
+
+
+# --- LLM stand-ins ---
+
+# Prior of the fixture being replayed (set per task, read by the stub answers)
+_current_prior: contextvars.ContextVar = contextvars.ContextVar("backtest_prior", default=None)
+
+
+def stub_response(role: str, prior: Optional[Dict[str, Any]]) -> str:
+    """Deterministic answer of an agent's LLM, derived from the numeric prior."""
+    from src.core.schemas import MetricianOutput, OrchestratorOutput, TacticianOutput
+
+    probs = [float((prior or {}).get(market) or 0.0) for market in RESULT_MARKETS]
+    if role == "orchestrator":
+        best = int(np.argmax(probs)) if any(probs) else 0
+        return OrchestratorOutput(
+            confidence_score=round(min(1.0, probs[best]), 4) if any(probs) else 0.34,
+            winner_prediction=OUTCOMES[best],
+            logic_summary="Backtest stub: verdict follows the statistical prior.",
+            decisive_factor="xG prior",
+        ).model_dump_json()
+    if role == "metrician":
+        return MetricianOutput(
+            variance_level="Unknown", xg_diff=0.0, verdict="STABLE", reasoning="Backtest stub."
+        ).model_dump_json()
+    if role == "tactician":
+        advantage = "NEUTRAL"
+        if probs[0] - probs[2] > 0.1:
+            advantage = "HOME"
+        elif probs[2] - probs[0] > 0.1:
+            advantage = "AWAY"
+        return TacticianOutput(
+            tactical_advantage=advantage, key_battle="n/a", verdict_summary="Backtest stub."
+        ).model_dump_json()
+    return "Backtest stub: no qualitative input."
+
+
+class LLMResponseCache:
+    """SQLite store of LLM responses keyed by (role, prompt hash), shared by the workers."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else get_data_dir() / LLM_CACHE_FILENAME
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (role TEXT, prompt_hash TEXT, response TEXT, "
+            "PRIMARY KEY (role, prompt_hash))"
+        )
+        self._conn.commit()
+
+    def get(self, role: str, prompt_hash: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT response FROM responses WHERE role = ? AND prompt_hash = ?", (role, prompt_hash)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, role: str, prompt_hash: str, response: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (role, prompt_hash, response))
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class BacktestLLM:
+    """
+    Stand-in for an agent's chat model (a runnable placed in `prompt | llm | parser`).
+    Counts the answers by source: cache, live or stub.
+    """
+
+    stats: Dict[str, int] = {"cache": 0, "live": 0, "stub": 0}
+
+    def __init__(self, role: str, mode: str = "stub", cache: Optional[LLMResponseCache] = None, live_factory=None):
+        from langchain_core.runnables import RunnableLambda
+
+        self.role = role
+        self.mode = mode
+        self.cache = cache
+        self.live_factory = live_factory
+        self.runnable = RunnableLambda(self._respond)
+
+    async def _respond(self, prompt) -> str:
+        text = prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+        prompt_hash = hashlib.sha256(text.encode()).hexdigest()
+        if self.cache is not None:
+            cached = self.cache.get(self.role, prompt_hash)
+            if cached is not None:
+                BacktestLLM.stats["cache"] += 1
+                return cached
+        if self.mode == "live":
+            message = await self.live_factory(self.role).ainvoke(prompt)
+            response = getattr(message, "content", message)
+            if self.cache is not None:
+                self.cache.put(self.role, prompt_hash, response)
+            BacktestLLM.stats["live"] += 1
+            return response
+        BacktestLLM.stats["stub"] += 1
+        return stub_response(self.role, _current_prior.get())
+
+
+def install_backtest_llms(mode: str = "stub", cache_path: Optional[Path] = None) -> None:
+    """Route LLMFactory.create to BacktestLLM stand-ins in this process."""
+    from src.core.llm import LLMFactory
+
+    live_factory = LLMFactory.create
+    cache = LLMResponseCache(cache_path) if mode in ("cached", "live") else None
+    LLMFactory.create = staticmethod(lambda role: BacktestLLM(role, mode, cache, live_factory).runnable)
+
+
+# --- Replay ---
+
+def outcome_of(home_goals: int, away_goals: int) -> str:
+    if home_goals > away_goals:
+        return "HOME"
+    return "DRAW" if home_goals == away_goals else "AWAY"
+
+
+class Replayer:
+    """Replays fixtures through the agent graph with as-of data and odds (one per process)."""
+
+    def __init__(self, fixtures: Sequence[Dict[str, Any]], odds_path: Optional[Path], bookmaker: Optional[str] = None):
+        from src.agents.value_hunter import ValueHunterAgent
+        from src.core.news_provider import MockNewsProvider
+        from src.pipeline import AnalysisPipeline
+
+        self.fixtures = list(fixtures)
+        self.snapshots = SeasonSnapshots(self.fixtures)
+        self.odds = OddsStore(odds_path) if odds_path else None
+        self.bookmaker = bookmaker
+        self.pipeline = AnalysisPipeline(SnapshotProvider(self.snapshots), MockNewsProvider())
+        # Raw confidences: backtest reports are what the calibration is fitted on
+        self.value_hunter = ValueHunterAgent(store=self.odds, calibration=False) if self.odds is not None else None
+
+    async def replay(self, index: int) -> Dict[str, Any]:
+        fixture = self.fixtures[index]
+        match_id = fixture["match_id"]
+        result = {
+            "match_id": match_id,
+            "kickoff": fixture["kickoff"],
+            "outcome": outcome_of(fixture["home_goals"], fixture["away_goals"]),
+            "probs": None,
+            "prediction": None,
+            "confidence": None,
+            "market_probs": None,
+            "bets": [],
+        }
+        prior = match_prior(self.snapshots.match_data(match_id))
+        if prior is None:
+            result["skipped"] = "insufficient history"
+            return result
+
+        token = _current_prior.set(prior)
+        try:
+            state = await self.pipeline.run(match_id)
+        except Exception as e:
+            result["skipped"] = f"pipeline failed: {e}"
+            return result
+        finally:
+            _current_prior.reset(token)
+
+        verdict = state.analysis_reports.get("orchestrator_final")
+        prediction = getattr(verdict, "winner_prediction", None)
+        confidence = getattr(verdict, "confidence_score", None)
+        probs = model_probabilities(state.match_data.get("prior"), prediction, confidence)
+        result["prediction"] = prediction
+        result["confidence"] = confidence
+        result["probs"] = [probs.get(market) for market in RESULT_MARKETS]
+
+        if self.odds is None:
+            return result
+        odds = self.odds.latest(match_id, bookmaker=self.bookmaker, at=fixture["kickoff"])
+        if not odds:
+            return result
+        fair = fair_probabilities([odds], RESULT_MARKETS)[0]
+        if np.all(np.isfinite(fair)):
+            result["market_probs"] = [float(p) for p in fair]
+        state.market_data = odds
+        state = await self.value_hunter.execute(state)
+        for bet in card_bets([state]):
+            won = settle_market(bet["market"], fixture["home_goals"], fixture["away_goals"])
+            if won is None:
+                continue
+            result["bets"].append({
+                **{key: bet[key] for key in ("lambda_home", "lambda_away") if key in bet},
+                "market": bet["market"],
+                "odds": bet["odds"],
+                "prob": bet["prob"],
+                "stake": bet["stake"],
+                "won": bool(won),
+                "profit": round(bet["stake"] * (bet["odds"] - 1.0) if won else -bet["stake"], 6),
+            })
+        return result
+
+    async def replay_many(self, indexes: Sequence[int], concurrency: int = 8) -> List[Dict[str, Any]]:
+        slots = asyncio.Semaphore(concurrency)
+
+        async def bounded(index: int) -> Dict[str, Any]:
+            async with slots:
+                return await self.replay(index)
+
+        return await asyncio.gather(*(bounded(index) for index in indexes))
+
+
+# Worker process state (set by the pool initializer)
+_replayer: Optional[Replayer] = None
+
+
+def _init_worker(fixtures, odds_path, bookmaker, llm_mode, cache_path) -> None:
+    global _replayer
+    # Per-agent INFO/WARNING logs of thousands of replays would dominate the run
+    logging.disable(logging.WARNING)
+    install_backtest_llms(llm_mode, cache_path)
+    _replayer = Replayer(fixtures, odds_path, bookmaker)
+
+
+def _run_shard(indexes: List[int], concurrency: int) -> Dict[str, Any]:
+    from src.core.llm import LLMFactory
+
+    BacktestLLM.stats.update(cache=0, live=0, stub=0)
+    # Each shard runs in a new event loop: clients cached by the previous shard are bound to a closed one
+    LLMFactory.clear_clients()
+    results = asyncio.run(_replayer.replay_many(indexes, concurrency))
+    return {"results": results, "llm": dict(BacktestLLM.stats)}
+
+
+# --- Metrics ---
+
+def compute_metrics(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Hit rate, Brier score and log-loss of the 1X2 probabilities, ROI of the bets."""
+    predicted = [r for r in results if r.get("probs") and None not in r["probs"]]
+    metrics: Dict[str, Any] = {"matches": len(results), "predicted": len(predicted), "skipped": len(results) - len(predicted)}
+    if predicted:
+        probs = np.array([r["probs"] for r in predicted], dtype=float)
+        probs = probs / probs.sum(axis=1, keepdims=True)
+        actual = np.array([OUTCOMES.index(r["outcome"]) for r in predicted])
+        onehot = np.eye(3)[actual]
+        metrics["hit_rate"] = round(float(np.mean(probs.argmax(axis=1) == actual)), 4)
+        metrics["brier"] = round(float(np.mean(((probs - onehot) ** 2).sum(axis=1))), 4)
+        metrics["log_loss"] = round(float(-np.mean(np.log(np.clip(probs[np.arange(len(actual)), actual], 1e-12, 1.0)))), 4)
+
+        priced = [r for r in predicted if r.get("market_probs")]
+        if priced:
+            market = np.array([r["market_probs"] for r in priced], dtype=float)
+            market_actual = np.eye(3)[[OUTCOMES.index(r["outcome"]) for r in priced]]
+            metrics["market_brier"] = round(float(np.mean(((market - market_actual) ** 2).sum(axis=1))), 4)
+
+    bets = [bet for r in results for bet in r.get("bets", [])]
+    staked = sum(bet["stake"] for bet in bets)
+    profit = sum(bet["profit"] for bet in bets)
+    metrics.update({
+        "bets": len(bets),
+        "bet_hit_rate": round(sum(bet["won"] for bet in bets) / len(bets), 4) if bets else None,
+        "staked": round(staked, 4),
+        "profit": round(profit, 4),
+        "roi": round(profit / staked, 4) if staked else None,
+    })
+    return metrics
+
+
+def portfolio_metrics(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """ROI of the bets re-sized per matchday (kickoff date) as one card by optimise_card."""
+    staked = profit = 0.0
+    largest = 0.0
+    dated = sorted((r for r in results if r.get("bets")), key=lambda r: r["kickoff"])
+    for _, day in groupby(dated, key=lambda r: datetime.fromtimestamp(r["kickoff"]).date()):
+        settled = [(r["match_id"], bet) for r in day for bet in r["bets"]]
+        card = optimise_card([{**bet, "match_id": match_id} for match_id, bet in settled])
+        for bet in card["bets"]:
+            stake = bet["portfolio_stake"]
+            staked += stake
+            profit += stake * (bet["odds"] - 1.0) if bet["won"] else -stake
+        largest = max(largest, card["exposure"])
+    return {
+        "portfolio_staked": round(staked, 4),
+        "portfolio_profit": round(profit, 4),
+        "portfolio_roi": round(profit / staked, 4) if staked else None,
+        "portfolio_max_exposure": round(largest, 4),
+    }
+
+
+# --- Runner ---
+
+def run_backtest(
+    fixtures: Sequence[Dict[str, Any]],
+    odds_path: Optional[Path] = None,
+    bookmaker: Optional[str] = None,
+    workers: Optional[int] = None,
+    llm_mode: str = "stub",
+    cache_path: Optional[Path] = None,
+    concurrency: int = 8,
+    start: Any = None,
+) -> Dict[str, Any]:
+    """
+    Replay fixtures (load_fixtures) and score them.
+
+    Args:
+        odds_path: OddsStore directory holding the historical prices (no bets without it).
+        workers: Worker processes (default: CPU count); 0 or 1 runs in this process.
+        start: Only fixtures from this date are replayed (earlier ones still feed the snapshots).
+
+    Returns {"metrics": {...}, "results": [...], "llm": {...}, "seconds": ...}.
+    """
+    if llm_mode not in LLM_MODES:
+        raise ValueError(f"Unknown LLM mode '{llm_mode}' (expected one of {', '.join(LLM_MODES)})")
+    started = time.perf_counter()
+    fixtures = list(fixtures)
+    first = to_timestamp(start) if start is not None else float("-inf")
+    indexes = [i for i, fixture in enumerate(fixtures) if fixture["kickoff"] >= first]
+    workers = (os.cpu_count() or 1) if workers is None else workers
+
+    if workers <= 1:
+        from src.core.llm import LLMFactory
+        original, disabled = LLMFactory.create, logging.root.manager.disable
+        try:
+            _init_worker(fixtures, odds_path, bookmaker, llm_mode, cache_path)
+            shards = [_run_shard(indexes, concurrency)]
+        finally:
+            LLMFactory.create = original
+            logging.disable(disabled)
+    else:
+        # Contiguous shards keep each worker's matches close in time; several per worker balance the load
+        size = max(1, -(-len(indexes) // (workers * SHARDS_PER_WORKER)))
+        chunks = [indexes[i:i + size] for i in range(0, len(indexes), size)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(fixtures, odds_path, bookmaker, llm_mode, cache_path),
+        ) as pool:
+            shards = list(pool.map(_run_shard, chunks, [concurrency] * len(chunks)))
+
+    results = [result for shard in shards for result in shard["results"]]
+    llm = {key: sum(shard["llm"][key] for shard in shards) for key in ("cache", "live", "stub")}
+    return {
+        "metrics": {**compute_metrics(results), **portfolio_metrics(results)},
+        "results": results,
+        "llm": llm,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="neuralbet-backtest", description="Replay historical fixtures through the agents")
+    parser.add_argument("files", nargs="+", type=Path, help="Historical results CSV files (football-data.co.uk or long format)")
+    parser.add_argument("--odds-store", type=Path, help="Existing odds store (default: load the odds columns of the files)")
+    parser.add_argument("--bookmaker", help="Bookmaker whose prices are used (default: latest of any)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--llm", choices=LLM_MODES, default="stub", help="LLM answers: stub, cached or live")
+    parser.add_argument("--llm-cache", type=Path, help=f"Response cache (default: <data dir>/{LLM_CACHE_FILENAME})")
+    parser.add_argument("--from", dest="start", help="First kickoff date replayed (YYYY-MM-DD)")
+    parser.add_argument("--json", type=Path, help="Write the metrics and per-match results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    args = parse_args(argv)
+
+    fixtures = load_fixtures(args.files)
+    logger.info(f"{len(fixtures)} played fixtures loaded")
+    with tempfile.TemporaryDirectory(prefix="neuralbet-odds-") as tmp:
+        odds_path = args.odds_store
+        if odds_path is None:
+            store = OddsStore(Path(tmp))
+            for path in args.files:
+                try:
+                    store.load_csv(path)
+                except ValueError as e:
+                    logger.warning(f"No odds read from {path}: {e}")
+            odds_path = Path(tmp)
+        report = run_backtest(
+            fixtures, odds_path, args.bookmaker, args.workers, args.llm, args.llm_cache, start=args.start
+        )
+
+    metrics = report["metrics"]
+    print("\n--- 📈 BACKTEST ---")
+    for key, value in metrics.items():
+        print(f"{key:>14}: {value}")
+    print(f"{'llm answers':>14}: {report['llm']}")
+    print(f"{'seconds':>14}: {report['seconds']}")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+    return report
+
+
+if __name__ == "__main__":
+    main()
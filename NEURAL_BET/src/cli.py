@@ -13,7 +13,22 @@ if project_root not in sys.path:
 
 
 def main():
-    """CLI entry point - launches the TUI."""
+    """
+    CLI entry point - launches the TUI.
+
+    Flags:
+        --profile-imports  Run under `python -X importtime` and print the slowest
+                           imports and the time-to-interactive on exit.
+        --warmup           Warm up providers and LLM clients in the background
+                           (same as NEURALBET_WARMUP=1).
+    """
+    if "--warmup" in sys.argv[1:]:
+        os.environ["NEURALBET_WARMUP"] = "1"
+    if "--profile-imports" in sys.argv[1:]:
+        from src.core.config import get_data_dir
+        from src.core.startup import profile_startup
+        sys.exit(profile_startup(project_root, get_data_dir() / "importtime.log"))
+
     from src.tui import NeuralBetApp
     
     app = NeuralBetApp()
@@ -21,11 +36,28 @@ def main():
 
 
 def run_pipeline():
-    """Alternative entry point - runs the headless pipeline."""
+    """
+    Alternative entry point - runs the headless pipeline.
+    Flags: --warmup, --batch MATCH_ID [...], --resume, --max-runs N (see src/main.py).
+    """
     import asyncio
-    from src.main import main as pipeline_main
+    from src.main import run as pipeline_run
     
-    asyncio.run(pipeline_main())
+    asyncio.run(pipeline_run(sys.argv[1:]))
+
+
+def run_daemon():
+    """Daemon entry point - local HTTP/JSON analysis service (see src/daemon.py)."""
+    from src.daemon import main as daemon_main
+
+    daemon_main()
+
+
+def run_backtest():
+    """Backtest entry point - replays historical seasons through the agents (see src/backtest.py)."""
+    from src.backtest import main as backtest_main
+
+    backtest_main(sys.argv[1:])
 
 
 if __name__ == "__main__":
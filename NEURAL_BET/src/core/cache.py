@@ -7,7 +7,7 @@ import asyncio
 import functools
 import hashlib
 import time
-from typing import Any, Callable, Dict, Optional, TypeVar
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,7 @@ class TTLCache:
         self._cache: Dict[str, tuple[Any, float]] = {}
         self._default_ttl = default_ttl
         self._lock = asyncio.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
     
     def _make_key(self, *args, **kwargs) -> str:
         """Create a hash key from arguments."""
@@ -56,6 +57,54 @@ class TTLCache:
             self._cache[key] = (value, expiry)
             logger.debug(f"Cache SET: {key[:8]}... (TTL: {ttl or self._default_ttl}s)")
     
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Cached value, or the result of factory() stored with TTL (single-flight:
+        concurrent misses on the same key share one factory call).
+
+        Args:
+            cache_if: Predicate deciding whether a result is stored (e.g. not an error).
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.debug(f"Cache JOIN: {key[:8]}...")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # this caller was cancelled
+                # The leading call was cancelled: try again
+                return await self.get_or_set(key, factory, ttl, cache_if)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: no "never retrieved" warning without waiters
+            raise
+        else:
+            if value is not None and (cache_if is None or cache_if(value)):
+                await self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
     async def clear(self) -> None:
         """Clear all cache entries."""
         async with self._lock:
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+"""
+Confidence calibration.
+OrchestratorOutput.confidence_score is produced by the LLM, not measured:
+a "75%" verdict may come true 60% of the time. The ValueHunter records
+every verdict, outcomes are resolved later (results CSV, backtest report),
+and a monotone map fitted on the resolved verdicts turns the raw confidence
+into the hit rate observed at that confidence before the EV/Kelly math.
+
+- Resolved verdicts are kept as counts per confidence bin (0.01 wide): a new
+  outcome is an O(1) update and a refit only touches the BINS bins.
+- Isotonic regression (pool adjacent violators) once ISOTONIC_MIN_SAMPLES
+  verdicts are resolved, Platt scaling (logistic on the logit) before that,
+  identity below MIN_SAMPLES.
+- The fitted map is tabulated per bin: applying it is one lookup.
+- Refit every REFIT_EVERY new outcomes. Verdicts are logged in SQLite,
+  bins and fit are JSON, both under <data dir>/calibration.
+
+Usage:
+    python -m src.core.calibration --results E0.csv     # resolve logged verdicts
+    python -m src.core.calibration --backtest report.json  # seed from neuralbet-backtest --json
+"""
+import csv
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_DIRNAME = "calibration"
+VERDICTS_FILENAME = "verdicts.db"
+MODEL_FILENAME = "calibration.json"
+
+BINS = 101  # confidence resolution 0.01
+MIN_SAMPLES = 30  # identity below
+ISOTONIC_MIN_SAMPLES = 300  # Platt below (isotonic overfits small samples)
+REFIT_EVERY = 25  # new outcomes between refits
+METHODS = ("auto", "isotonic", "platt")
+OUTCOMES = ("HOME", "DRAW", "AWAY")
+
+_GRID = np.linspace(0.0, 1.0, BINS)
+
+
+def confidence_bin(confidence) -> np.ndarray:
+    """Bin index of one or many confidences (clipped to [0, 1])."""
+    return np.rint(np.clip(np.asarray(confidence, dtype=float), 0.0, 1.0) * (BINS - 1)).astype(int)
+
+
+def fit_isotonic(counts: np.ndarray, hits: np.ndarray) -> np.ndarray:
+    """
+    Non-decreasing hit rate per bin (pool adjacent violators, weighted by the
+    bin counts), linearly interpolated over the empty bins.
+    """
+    filled = np.flatnonzero(counts)
+    if filled.size == 0:
+        return _GRID.copy()
+    # Blocks: [weight, hits, first filled index]; merge while the rate decreases
+    blocks = []
+    for position, i in enumerate(filled):
+        blocks.append([float(counts[i]), float(hits[i]), position])
+        while len(blocks) > 1 and blocks[-2][1] * blocks[-1][0] >= blocks[-1][1] * blocks[-2][0]:
+            weight, hit, _ = blocks.pop()
+            blocks[-1][0] += weight
+            blocks[-1][1] += hit
+    rates = np.empty(filled.size)
+    starts = [block[2] for block in blocks] + [filled.size]
+    for block, start, end in zip(blocks, starts, starts[1:]):
+        rates[start:end] = block[1] / block[0]
+    return np.interp(_GRID, _GRID[filled], rates)
+
+
+def fit_platt(counts: np.ndarray, hits: np.ndarray, iterations: int = 50) -> Tuple[float, float]:
+    """(a, b) of p = sigmoid(a * logit(confidence) + b), Newton steps on the binned log-loss."""
+    filled = np.flatnonzero(counts)
+    z = np.log(np.clip(_GRID[filled], 0.005, 0.995) / (1.0 - np.clip(_GRID[filled], 0.005, 0.995)))
+    design = np.column_stack([z, np.ones_like(z)])
+    weights, successes = counts[filled].astype(float), hits[filled].astype(float)
+    params = np.array([1.0, 0.0])
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-(design @ params)))
+        gradient = design.T @ (weights * p - successes)
+        hessian = (design * (weights * p * (1.0 - p))[:, None]).T @ design + 1e-6 * np.eye(2)
+        step = np.linalg.solve(hessian, gradient)
+        params -= step
+        if np.max(np.abs(step)) < 1e-8:
+            break
+    return float(params[0]), float(params[1])
+
+
+def platt_table(a: float, b: float) -> np.ndarray:
+    z = np.log(np.clip(_GRID, 0.005, 0.995) / (1.0 - np.clip(_GRID, 0.005, 0.995)))
+    return 1.0 / (1.0 + np.exp(-(a * z + b)))
+
+
+class Calibrator:
+    """
+    Confidence -> probability map fitted on binned (verdicts, hits).
+
+    Usage:
+        calibrator = Calibrator()
+        calibrator.observe(confidences, hits)
+        calibrator.fit()
+        probability = calibrator.apply(0.75)
+    """
+
+    def __init__(self, method: str = "auto"):
+        if method not in METHODS:
+            raise ValueError(f"Unknown calibration method {method!r} (expected one of {METHODS})")
+        self.method = method
+        self.counts = np.zeros(BINS, dtype=np.int64)
+        self.hits = np.zeros(BINS, dtype=np.int64)
+        self.fitted: Optional[Dict[str, Any]] = None  # method, params, samples, fitted_at
+        self._table: Optional[np.ndarray] = None
+
+    @property
+    def samples(self) -> int:
+        return int(self.counts.sum())
+
+    def observe(self, confidences, hits) -> None:
+        """Add resolved verdicts (vectorized: arrays of confidences and booleans)."""
+        bins = confidence_bin(np.atleast_1d(confidences))
+        np.add.at(self.counts, bins, 1)
+        np.add.at(self.hits, bins, np.atleast_1d(hits).astype(np.int64))
+
+    def fit(self) -> Dict[str, Any]:
+        """Refit on every observed verdict; returns the fit summary."""
+        samples = self.samples
+        method = self.method
+        if method == "auto":
+            method = "isotonic" if samples >= ISOTONIC_MIN_SAMPLES else "platt"
+        if samples < MIN_SAMPLES:
+            self.fitted, self._table = None, None
+            return {"method": "identity", "samples": samples}
+        if method == "isotonic":
+            table = fit_isotonic(self.counts, self.hits)
+            params = {"table": [round(float(p), 6) for p in table]}
+        else:
+            a, b = fit_platt(self.counts, self.hits)
+            table = platt_table(a, b)
+            params = {"a": a, "b": b}
+        self._table = table
+        self.fitted = {"method": method, "params": params, "samples": samples, "fitted_at": time.time()}
+        return self.summary()
+
+    def apply(self, confidence: float) -> float:
+        """Calibrated probability of a verdict (identity until fitted)."""
+        if self._table is None:
+            return float(confidence)
+        return float(self._table[round(min(1.0, max(0.0, float(confidence))) * (BINS - 1))])
+
+    def summary(self) -> Dict[str, Any]:
+        """Fit method, sample count and Brier score of the verdicts before/after calibration."""
+        samples = self.samples
+        if samples == 0:
+            return {"method": "identity", "samples": 0}
+        mapped = self._table if self._table is not None else _GRID
+        misses = self.counts - self.hits
+
+        def brier(p: np.ndarray) -> float:
+            return float((self.hits * (1.0 - p) ** 2 + misses * p ** 2).sum() / samples)
+
+        return {
+            "method": self.fitted["method"] if self.fitted else "identity",
+            "samples": samples,
+            "hit_rate": round(float(self.hits.sum()) / samples, 4),
+            "brier_raw": round(brier(_GRID), 4),
+            "brier_calibrated": round(brier(mapped), 4),
+        }
+
+    # --- Persistence ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "counts": self.counts.tolist(),
+            "hits": self.hits.tolist(),
+            "fitted": self.fitted,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Calibrator":
+        calibrator = cls(data.get("method", "auto"))
+        if len(data.get("counts") or []) == BINS:
+            calibrator.counts = np.asarray(data["counts"], dtype=np.int64)
+            calibrator.hits = np.asarray(data["hits"], dtype=np.int64)
+        fitted = data.get("fitted")
+        if fitted:
+            params = fitted["params"]
+            if fitted["method"] == "isotonic" and len(params.get("table", [])) == BINS:
+                calibrator._table = np.asarray(params["table"], dtype=float)
+            elif fitted["method"] == "platt":
+                calibrator._table = platt_table(params["a"], params["b"])
+            if calibrator._table is not None:
+                calibrator.fitted = fitted
+        return calibrator
+
+
+class CalibrationStore:
+    """
+    Verdict log + persisted Calibrator.
+
+    Usage:
+        store = get_calibration_store()
+        store.record(match_id, "HOME", 0.72)        # at analysis time
+        probability = store.calibrate(0.72)          # O(1)
+        store.resolve(match_id, "AWAY")              # once the result is known
+    """
+
+    def __init__(self, path: Optional[Path] = None, method: str = "auto", refit_every: int = REFIT_EVERY):
+        self.path = Path(path) if path else get_data_dir() / CALIBRATION_DIRNAME
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.refit_every = refit_every
+        self._conn = sqlite3.connect(str(self.path / VERDICTS_FILENAME), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS verdicts (
+                match_id TEXT PRIMARY KEY,
+                prediction TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                recorded_at REAL NOT NULL,
+                outcome TEXT
+            )"""
+        )
+        self._conn.commit()
+        self.calibrator = self._load(method)
+        self.pending = 0  # outcomes observed since the last fit
+
+    def _load(self, method: str) -> Calibrator:
+        try:
+            data = json.loads((self.path / MODEL_FILENAME).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return Calibrator(method)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Calibration unreadable, starting over: {e}")
+            return Calibrator(method)
+        calibrator = Calibrator.from_dict(data)
+        calibrator.method = method
+        return calibrator
+
+    def save(self) -> None:
+        model_path = self.path / MODEL_FILENAME
+        tmp = model_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.calibrator.to_dict()), encoding="utf-8")
+        os.replace(tmp, model_path)
+
+    def calibrate(self, confidence: float) -> float:
+        return self.calibrator.apply(confidence)
+
+    def record(self, match_id: str, prediction: str, confidence: float) -> None:
+        """Log a verdict (a re-analysis replaces it until the match is resolved)."""
+        with self._conn:
+            self._conn.execute(
+                """INSERT INTO verdicts (match_id, prediction, confidence, recorded_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(match_id) DO UPDATE SET
+                    prediction = excluded.prediction, confidence = excluded.confidence, recorded_at = excluded.recorded_at
+                WHERE outcome IS NULL""",
+                (match_id, prediction, float(confidence), time.time()),
+            )
+
+    def resolve(self, match_id: str, outcome: str) -> Optional[bool]:
+        """Settle a logged verdict; whether it was right, None if unknown or already settled."""
+        return self.resolve_many([(match_id, outcome)]).get(match_id)
+
+    def resolve_many(self, results: Iterable[Tuple[str, str]]) -> Dict[str, bool]:
+        """Settle logged verdicts in one transaction; refits when REFIT_EVERY outcomes accumulated."""
+        settled: Dict[str, bool] = {}
+        confidences = []
+        with self._conn:
+            for match_id, outcome in results:
+                row = self._conn.execute(
+                    "SELECT prediction, confidence FROM verdicts WHERE match_id = ? AND outcome IS NULL", (match_id,)
+                ).fetchone()
+                if row is None or outcome not in OUTCOMES:
+                    continue
+                self._conn.execute("UPDATE verdicts SET outcome = ? WHERE match_id = ?", (outcome, match_id))
+                settled[match_id] = row[0] == outcome
+                confidences.append(row[1])
+        if settled:
+            self.observe(confidences, list(settled.values()))
+        return settled
+
+    def observe(self, confidences: Sequence[float], hits: Sequence[bool]) -> None:
+        """Add resolved verdicts that were not logged here (e.g. a backtest)."""
+        self.calibrator.observe(confidences, hits)
+        self.pending += len(confidences)
+        if self.pending >= self.refit_every:
+            self.refit()
+        else:
+            self.save()
+
+    def refit(self) -> Dict[str, Any]:
+        summary = self.calibrator.fit()
+        self.pending = 0
+        self.save()
+        logger.info(f"Calibration refitted: {summary}")
+        return summary
+
+    def unresolved(self) -> Dict[str, Tuple[str, float]]:
+        rows = self._conn.execute("SELECT match_id, prediction, confidence FROM verdicts WHERE outcome IS NULL")
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# Shared store (opened on first use)
+_calibration_store: Optional[CalibrationStore] = None
+
+
+def get_calibration_store() -> Optional[CalibrationStore]:
+    """Get the shared calibration store, or None when disabled (NEURALBET_CALIBRATION=0)."""
+    global _calibration_store
+    if os.getenv("NEURALBET_CALIBRATION", "1").lower() in ("0", "false", "no"):
+        return None
+    if _calibration_store is None:
+        _calibration_store = CalibrationStore()
+    return _calibration_store
+
+
+def results_from_csv(path: Path) -> Dict[str, str]:
+    """Outcome per match id of a football-data.co.uk results file."""
+    from src.core.odds_store import football_data_fixture
+
+    results = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for line in csv.DictReader(f):
+            fixture = football_data_fixture(line)
+            try:
+                home_goals, away_goals = int(line["FTHG"]), int(line["FTAG"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if fixture is None:
+                continue
+            if home_goals > away_goals:
+                results[fixture[0]] = "HOME"
+            else:
+                results[fixture[0]] = "DRAW" if home_goals == away_goals else "AWAY"
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Resolve logged verdicts and refit the confidence calibration")
+    parser.add_argument("--results", nargs="*", type=Path, default=[], help="football-data.co.uk results CSV files")
+    parser.add_argument("--backtest", nargs="*", type=Path, default=[], help="neuralbet-backtest --json reports")
+    parser.add_argument("--method", choices=METHODS, default="auto")
+    parser.add_argument("--path", type=Path, help=f"Store directory (default: <data dir>/{CALIBRATION_DIRNAME})")
+    args = parser.parse_args()
+
+    store = CalibrationStore(args.path, method=args.method)
+    for path in args.results:
+        settled = store.resolve_many(results_from_csv(path).items())
+        print(f"{path}: {len(settled)} verdicts resolved")
+    for path in args.backtest:
+        rows = [
+            r for r in json.loads(path.read_text(encoding="utf-8")).get("results", [])
+            if r.get("prediction") and r.get("confidence") is not None
+        ]
+        store.observe([r["confidence"] for r in rows], [r["prediction"] == r["outcome"] for r in rows])
+        print(f"{path}: {len(rows)} backtest verdicts added")
+    print(json.dumps(store.refit(), indent=2))
+    store.close()
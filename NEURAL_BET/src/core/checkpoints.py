@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline checkpoints.
+The AgentState produced by each completed stage is stored in a local SQLite
+database, keyed by (match_id, input_hash, stage). A re-run of the same
+analysis resumes from the last completed stage, and only the agents that
+failed (their output is never checkpointed) call their LLM again.
+
+Agent outputs are keyed by a fingerprint of the agent's own inputs
+(fingerprint_inputs), so a re-analysis after, say, a news update only
+recomputes the agents that read the news.
+
+Reports are pydantic models: they are stored with their class path and
+re-validated on load, so restored states are typed like fresh ones.
+"""
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from pydantic import BaseModel
+
+from src.core.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINTS_FILENAME = "checkpoints.db"
+CHECKPOINT_MAX_AGE = 7 * 24 * 3600  # seconds - older checkpoints are pruned on open
+
+_MODEL_TAG = "__model__"
+
+
+def compute_input_hash(match_id: str, agents: Dict[str, Any], extra: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Hash of what a run depends on: the match, the agent graph and the day
+    (provider data is refreshed daily, so yesterday's checkpoints don't resume today).
+    """
+    payload = {
+        "match_id": match_id,
+        "day": date.today().isoformat(),
+        "agents": {key: type(agent).__name__ for key, agent in sorted(agents.items())},
+        "extra": extra or {},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def fingerprint_inputs(agent: Any, inputs: Dict[str, Any]) -> str:
+    """Hash of an agent's inputs (see BaseAgent.collect_inputs), scoped to its class."""
+    payload = {"agent": type(agent).__name__, "inputs": encode_value(inputs)}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def encode_value(value: Any) -> Any:
+    """JSON-ready value keeping the class of pydantic models."""
+    if isinstance(value, BaseModel):
+        cls = type(value)
+        return {_MODEL_TAG: f"{cls.__module__}.{cls.__qualname__}", "data": value.model_dump(mode="json")}
+    if isinstance(value, dict):
+        return {str(k): encode_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    """Inverse of encode_value (models are re-validated from their class path)."""
+    if isinstance(value, dict):
+        if _MODEL_TAG in value and "data" in value:
+            module_name, _, class_name = value[_MODEL_TAG].rpartition(".")
+            cls = getattr(importlib.import_module(module_name), class_name)
+            return cls.model_validate(value["data"])
+        return {k: decode_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    return value
+
+
+class CheckpointStore:
+    """
+    SQLite-backed AgentState checkpoints.
+
+    Usage:
+        store = get_checkpoint_store()
+        store.save(match_id, input_hash, "data_miner", state)
+        state = store.load(match_id, input_hash, "data_miner")  # None if absent
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_age: int = CHECKPOINT_MAX_AGE):
+        self.path = Path(path) if path else get_data_dir() / CHECKPOINTS_FILENAME
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS checkpoints (
+                match_id TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                state TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (match_id, input_hash, stage)
+            )"""
+        )
+        self._conn.execute("DELETE FROM checkpoints WHERE created_at < ?", (time.time() - max_age,))
+        self._conn.commit()
+
+    def save(self, match_id: str, input_hash: str, stage: str, state) -> None:
+        # Field by field: model_dump() would flatten the report models into dicts
+        fields = {name: encode_value(getattr(state, name)) for name in type(state).model_fields}
+        payload = json.dumps(fields, default=str, ensure_ascii=False)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+                (match_id, input_hash, stage, payload, time.time()),
+            )
+
+    def load(self, match_id: str, input_hash: str, stage: str):
+        """Restored AgentState of a stage, or None (absent or unreadable)."""
+        from src.agents.base import AgentState
+
+        row = self._conn.execute(
+            "SELECT state FROM checkpoints WHERE match_id = ? AND input_hash = ? AND stage = ?",
+            (match_id, input_hash, stage),
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return AgentState(**decode_value(json.loads(row[0])))
+        except Exception as e:
+            logger.warning(f"Checkpoint {match_id}/{stage} unreadable, re-running the stage: {e}")
+            return None
+
+    def stages(self, match_id: str, input_hash: str) -> Iterable[str]:
+        rows = self._conn.execute(
+            "SELECT stage FROM checkpoints WHERE match_id = ? AND input_hash = ? ORDER BY created_at",
+            (match_id, input_hash),
+        )
+        return [row[0] for row in rows]
+
+    def clear(self, match_id: Optional[str] = None) -> None:
+        with self._conn:
+            if match_id is None:
+                self._conn.execute("DELETE FROM checkpoints")
+            else:
+                self._conn.execute("DELETE FROM checkpoints WHERE match_id = ?", (match_id,))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# Shared store (opened on first use)
+_checkpoint_store: Optional[CheckpointStore] = None
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """Get the shared checkpoint store, or None when disabled (NEURALBET_CHECKPOINTS=0)."""
+    global _checkpoint_store
+    if os.getenv("NEURALBET_CHECKPOINTS", "1").lower() in ("0", "false", "no"):
+        return None
+    if _checkpoint_store is None:
+        _checkpoint_store = CheckpointStore()
+    return _checkpoint_store
@@ -4,6 +4,7 @@ Configuration validation and utilities.
 Ensures required settings are present before pipeline execution.
 """
 import os
+from pathlib import Path
 from typing import List, Optional
 from src.core.exceptions import ConfigurationError
 
@@ -21,6 +22,10 @@ OPTIONAL_API_KEYS = [
     "GOOGLE_API_KEY",
 ]
 
+# Local state (fixture calendar, caches...) lives here unless overridden
+DATA_DIR_ENV = "NEURALBET_DATA_DIR"
+DEFAULT_DATA_DIR = Path.home() / ".neuralbet"
+
 
 def validate_api_keys(
     required: Optional[List[str]] = None,
@@ -107,3 +112,14 @@ def get_api_key(key_name: str, required: bool = True) -> Optional[str]:
         return None
     
     return value
+
+
+def get_data_dir() -> Path:
+    """
+    Get the local data directory (created on first use).
+    
+    Defaults to ~/.neuralbet, overridable with NEURALBET_DATA_DIR.
+    """
+    path = Path(os.getenv(DATA_DIR_ENV) or DEFAULT_DATA_DIR).expanduser()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Rule-based date hint parser (French & English).
+Turns "demain", "samedi", "4 février", "04/02", "2026-02-04", "next saturday"...
+into YYYY-MM-DD without an LLM call.
+"""
+import re
+import unicodedata
+from datetime import date, timedelta
+from typing import Optional, Pattern, Tuple
+
+_MONTHS = {
+    "janvier": 1, "janv": 1, "jan": 1, "january": 1,
+    "fevrier": 2, "fevr": 2, "fev": 2, "february": 2, "feb": 2,
+    "mars": 3, "march": 3, "mar": 3,
+    "avril": 4, "avr": 4, "april": 4, "apr": 4,
+    "mai": 5, "may": 5,
+    "juin": 6, "june": 6, "jun": 6,
+    "juillet": 7, "juil": 7, "july": 7, "jul": 7,
+    "aout": 8, "august": 8, "aug": 8,
+    "septembre": 9, "september": 9, "sept": 9, "sep": 9,
+    "octobre": 10, "october": 10, "oct": 10,
+    "novembre": 11, "november": 11, "nov": 11,
+    "decembre": 12, "december": 12, "dec": 12,
+}
+
+_WEEKDAYS = {
+    "lundi": 0, "monday": 0,
+    "mardi": 1, "tuesday": 1,
+    "mercredi": 2, "wednesday": 2,
+    "jeudi": 3, "thursday": 3,
+    "vendredi": 4, "friday": 4,
+    "samedi": 5, "saturday": 5,
+    "dimanche": 6, "sunday": 6,
+}
+
+_MONTH_ALT = "|".join(sorted(_MONTHS, key=len, reverse=True))
+_WEEKDAY_ALT = "|".join(_WEEKDAYS)
+
+_ISO = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_NUMERIC = re.compile(r"\b(\d{1,2})[/.](\d{1,2})(?:[/.](\d{2,4}))?\b")
+_DAY_MONTH = re.compile(rf"\b(\d{{1,2}})(?:er|st|nd|rd|th)?\s+({_MONTH_ALT})\.?(?:\s+(\d{{4}}))?\b")
+_MONTH_DAY = re.compile(rf"\b({_MONTH_ALT})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?(?:,?\s+(\d{{4}}))?\b")
+_RELATIVE = [
+    (re.compile(r"\b(?:apres[- ]demain|day after tomorrow)\b"), 2),
+    (re.compile(r"\b(?:demain|tomorrow)\b"), 1),
+    (re.compile(r"\b(?:aujourd'?hui|today|ce soir|tonight|cet apres[- ]midi|this afternoon)\b"), 0),
+]
+_WEEKDAY = re.compile(rf"\b(?:(next|prochain)\s+)?({_WEEKDAY_ALT})(?:\s+(prochain|next))?\b")
+
+# Words a date expression can be built on (club names containing one, e.g.
+# "Sheffield Wednesday", are passed as protected spans)
+DATE_WORDS = frozenset(_MONTHS) | frozenset(_WEEKDAYS) | {
+    "demain", "tomorrow", "today", "aujourd", "hui", "tonight", "soir",
+}
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents so patterns stay ASCII."""
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).lower().replace("’", "'")
+
+
+def _build(today: date, year: Optional[str], month: int, day: int) -> Optional[date]:
+    """Build a date; without an explicit year, pick the nearest upcoming occurrence."""
+    try:
+        if year:
+            y = int(year)
+            return date(y + 2000 if y < 100 else y, month, day)
+        candidate = date(today.year, month, day)
+        # A date well in the past most likely means next year's occurrence
+        if candidate < today - timedelta(days=30):
+            candidate = date(today.year + 1, month, day)
+        return candidate
+    except ValueError:
+        return None
+
+
+def parse_date_hint(
+    text: str, today: Optional[date] = None, protected: Optional[Pattern[str]] = None
+) -> Tuple[Optional[str], str]:
+    """
+    Extract the first date expression from a query.
+
+    protected: spans (matched on the folded text) that are never read as a
+    date, such as club names ("Sheffield Wednesday").
+
+    Returns:
+        (YYYY-MM-DD or None, folded query text with the date expression removed)
+    """
+    today = today or date.today()
+    original = _fold(text)
+    # Protected spans are blanked for matching; offsets stay valid on the original
+    folded = protected.sub(lambda m: " " * len(m.group()), original) if protected else original
+
+    match = _ISO.search(folded)
+    if match:
+        found = _build(today, match.group(1), int(match.group(2)), int(match.group(3)))
+        if found:
+            return found.isoformat(), original[:match.start()] + original[match.end():]
+
+    for pattern, day_idx, month_idx in ((_DAY_MONTH, 1, 2), (_MONTH_DAY, 2, 1)):
+        match = pattern.search(folded)
+        if match:
+            found = _build(today, match.group(3), _MONTHS[match.group(month_idx)], int(match.group(day_idx)))
+            if found:
+                return found.isoformat(), original[:match.start()] + original[match.end():]
+
+    match = _NUMERIC.search(folded)
+    if match:
+        # European order (day/month) - the UI is French-first
+        found = _build(today, match.group(3), int(match.group(2)), int(match.group(1)))
+        if found:
+            return found.isoformat(), original[:match.start()] + original[match.end():]
+
+    for pattern, offset in _RELATIVE:
+        match = pattern.search(folded)
+        if match:
+            found = today + timedelta(days=offset)
+            return found.isoformat(), original[:match.start()] + original[match.end():]
+
+    match = _WEEKDAY.search(folded)
+    if match:
+        delta = (_WEEKDAYS[match.group(2)] - today.weekday()) % 7
+        if delta == 0 and (match.group(1) or match.group(3)):
+            delta = 7
+        found = today + timedelta(days=delta)
+        return found.isoformat(), original[:match.start()] + original[match.end():]
+
+    return None, original
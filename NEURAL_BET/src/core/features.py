@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Rolling team features.
+Built once per team page when it is ingested: cumulative sums of xG, xGA,
+goals, goals against and points, overall and for home/away games only, so
+the totals over the last N matches (any N) are a subtraction instead of a
+fetch-and-sum loop per window.
+
+Usage:
+    features = TeamFeatures("Arsenal", rows)
+    features.window(5)                  # last 5 matches
+    features.window(None, split="home")  # season, home games
+    features.table()                    # WINDOWS x SPLITS summary for the agents
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+WINDOWS = (3, 5, 10)  # last N matches, plus the whole season
+SPLITS = ("all", "home", "away")
+COLUMNS = ("xg", "xga", "goals", "goals_against", "points")
+POINTS = {"w": 3, "d": 1, "l": 0}
+
+
+class TeamFeatures:
+    """
+    Prefix sums of a team's played matches (oldest first).
+
+    rows: dicts with date, home (bool), xg, xga, goals, goals_against and
+    result ("w"/"d"/"l"; derived from the goals when missing).
+    """
+
+    def __init__(self, team: str, rows: Iterable[Dict[str, Any]]):
+        self.team = team
+        rows = sorted(rows, key=lambda row: str(row.get("date") or ""))
+        self.results: List[str] = [row.get("result") or self._result(row) for row in rows]
+        values = np.array(
+            [[float(row.get(column) or 0.0) for column in COLUMNS[:-1]] + [POINTS.get(result, 0)]
+             for row, result in zip(rows, self.results)],
+            dtype=float,
+        ).reshape(-1, len(COLUMNS))
+        home = np.array([bool(row.get("home")) for row in rows], dtype=bool)
+        masks = {"all": np.ones(len(rows), dtype=bool), "home": home, "away": ~home}
+        # split -> (matches + 1, columns) prefix sums with a leading zero row
+        self._prefix = {
+            split: np.vstack([np.zeros((1, len(COLUMNS))), np.cumsum(values[mask], axis=0)])
+            for split, mask in masks.items()
+        }
+
+    @staticmethod
+    def _result(row: Dict[str, Any]) -> str:
+        goals, against = float(row.get("goals") or 0), float(row.get("goals_against") or 0)
+        return "w" if goals > against else "d" if goals == against else "l"
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def window(self, last_n: Optional[int] = None, split: str = "all") -> Dict[str, Any]:
+        """Totals and averages over the last_n matches of a split (None = season)."""
+        prefix = self._prefix[split]
+        played = len(prefix) - 1
+        matches = played if last_n is None else min(last_n, played)
+        total = dict(zip(COLUMNS, prefix[played] - prefix[played - matches]))
+        per_match = 1.0 / matches if matches else 0.0
+        return {
+            "matches": matches,
+            "xg": round(total["xg"], 2),
+            "xga": round(total["xga"], 2),
+            "avg_xg": round(total["xg"] * per_match, 2),
+            "avg_xga": round(total["xga"] * per_match, 2),
+            "goals": int(total["goals"]),
+            "goals_against": int(total["goals_against"]),
+            "goal_diff": int(total["goals"] - total["goals_against"]),
+            "xg_diff": round(total["xg"] - total["xga"], 2),
+            "points": int(total["points"]),
+            "ppg": round(total["points"] * per_match, 2),
+        }
+
+    def table(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Compact WINDOWS x SPLITS summary (split -> window -> features)."""
+        keys = ("matches", "avg_xg", "avg_xga", "xg_diff", "goal_diff", "ppg")
+        table = {}
+        for split in SPLITS:
+            windows = {f"last_{n}": self.window(n, split) for n in WINDOWS}
+            windows["season"] = self.window(None, split)
+            table[split] = {name: {key: values[key] for key in keys} for name, values in windows.items()}
+        return table
+
+    def form(self, last_n: int = 5) -> Dict[str, Any]:
+        """Recent form in the UnderstatProvider.get_team_form format."""
+        if not self.results:
+            return {"error": f"No data for {self.team}"}
+        recent = self.window(last_n)
+        return {
+            "source": "Understat",
+            "team": self.team,
+            "matches_analyzed": recent["matches"],
+            "total_xg": recent["xg"],
+            "total_xga": recent["xga"],
+            "avg_xg": recent["avg_xg"],
+            "avg_xga": recent["avg_xga"],
+            "last_match_result": self.results[-1],
+        }
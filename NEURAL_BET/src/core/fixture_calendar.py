@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Local fixture calendar.
+Keeps the season schedule of every supported league on disk, indexed by
+canonical team name and by date, so the dispatcher can resolve a match
+without any network call. Refreshed periodically in the background; a
+refresh where every league fails backs off (CALENDAR_RETRY_DELAY, doubling
+per failure) instead of being retried on every query.
+"""
+import asyncio
+import bisect
+import json
+import logging
+import time
+from datetime import date as date_cls
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core.config import get_data_dir
+from src.core.team_names import team_key, teams_match
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_FILENAME = "fixtures.json"
+CALENDAR_MAX_AGE = 6 * 3600  # seconds before a background refresh is due
+CALENDAR_RETRY_DELAY = 300  # seconds before retrying a failed refresh (doubles per failure, capped at max_age)
+
+
+class FixtureCalendar:
+    """
+    In-memory fixture index backed by a JSON file.
+
+    Each fixture is a dict: {"home", "away", "date" (YYYY-MM-DD), "time", "league"}.
+
+    Usage:
+        calendar = get_fixture_calendar()
+        hit = calendar.find("Arsenal", "Liverpool", date_hint="2026-02-04")
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_age: int = CALENDAR_MAX_AGE):
+        self.path = Path(path) if path else get_data_dir() / CALENDAR_FILENAME
+        self.max_age = max_age
+        self.updated_at: float = 0.0
+        self.attempted_at: float = 0.0  # last refresh attempt (successful or not)
+        self.failures = 0  # consecutive failed refreshes
+        self.fixtures: List[Dict[str, Any]] = []
+        # team key -> (sorted dates, fixture indexes in the same order)
+        self._by_team: Dict[str, tuple[List[str], List[int]]] = {}
+        self._by_date: Dict[str, List[int]] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    # --- Index ---
+
+    def replace(self, fixtures: Iterable[Dict[str, Any]], updated_at: Optional[float] = None) -> None:
+        """Swap the whole fixture list and rebuild the indexes."""
+        self.fixtures = sorted(fixtures, key=lambda f: (f["date"], f.get("time") or ""))
+        self.updated_at = updated_at if updated_at is not None else time.time()
+
+        by_team: Dict[str, tuple[List[str], List[int]]] = {}
+        by_date: Dict[str, List[int]] = {}
+        for idx, fixture in enumerate(self.fixtures):
+            by_date.setdefault(fixture["date"], []).append(idx)
+            for side in ("home", "away"):
+                dates, indexes = by_team.setdefault(team_key(fixture[side]), ([], []))
+                dates.append(fixture["date"])
+                indexes.append(idx)
+        self._by_team = by_team
+        self._by_date = by_date
+
+    def _team_entries(self, team_name: str) -> Optional[tuple[List[str], List[int]]]:
+        """Index entry of a team: canonical/normalized key first, then token containment."""
+        key = team_key(team_name)
+        entry = self._by_team.get(key)
+        if entry is not None:
+            return entry
+        matches = [k for k in self._by_team if teams_match(k, key)]
+        if len(matches) == 1:
+            return self._by_team[matches[0]]
+        return None
+
+    def find(
+        self,
+        team_name: str,
+        opponent_name: Optional[str] = None,
+        date_hint: Optional[str] = None,
+        today: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a fixture locally.
+        - With date_hint: the team's fixture on that exact date.
+        - Without: the team's next fixture from today (against opponent_name if given).
+        Returns a find_next_match-style dict, or None if the calendar can't answer.
+        """
+        entry = self._team_entries(team_name) if team_name else None
+        if entry is None:
+            return None
+        dates, indexes = entry
+
+        start_date = date_hint or today or date_cls.today().isoformat()
+        pos = bisect.bisect_left(dates, start_date)
+        for i in range(pos, len(dates)):
+            if date_hint and dates[i] != date_hint:
+                break
+            fixture = self.fixtures[indexes[i]]
+            home_is_team = teams_match(fixture["home"], team_name)
+            other = fixture["away"] if home_is_team else fixture["home"]
+            if opponent_name and not teams_match(other, opponent_name):
+                continue
+            return self._as_match(fixture)
+        return None
+
+    def on_date(self, date: str) -> List[Dict[str, Any]]:
+        """All fixtures scheduled on a given date."""
+        return [self.fixtures[i] for i in self._by_date.get(date, [])]
+
+    @staticmethod
+    def _as_match(fixture: Dict[str, Any]) -> Dict[str, Any]:
+        home, away, date, league = fixture["home"], fixture["away"], fixture["date"], fixture["league"]
+        return {
+            "found": True,
+            "home": home,
+            "away": away,
+            "date": date,
+            "league": league,
+            "match_id": f"{home}_{away}_{date}_{league}".replace(" ", "_"),
+            "source": "Fixture Calendar (Local)",
+        }
+
+    # --- Persistence ---
+
+    @property
+    def is_stale(self) -> bool:
+        return not self.fixtures or (time.time() - self.updated_at) > self.max_age
+
+    def _retry_delay(self) -> float:
+        if not self.failures:
+            return 0.0
+        return min(CALENDAR_RETRY_DELAY * 2 ** (self.failures - 1), self.max_age)
+
+    @property
+    def retry_due(self) -> bool:
+        """False while backing off after failed refreshes."""
+        return (time.time() - self.attempted_at) >= self._retry_delay()
+
+    def load(self) -> bool:
+        """Load the calendar from disk. Returns False if missing or unreadable."""
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            self.replace(payload.get("fixtures", []), updated_at=payload.get("updated_at", 0.0))
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Fixture calendar unreadable ({self.path}): {e}")
+            return False
+
+    def save(self) -> None:
+        payload = {"updated_at": self.updated_at, "fixtures": self.fixtures}
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.path)
+
+    # --- Refresh ---
+
+    async def refresh(self, fbref, leagues: Optional[Iterable[str]] = None) -> int:
+        """
+        Rebuild the calendar from FBRef league schedules.
+        Leagues that fail keep their previous fixtures; when they all fail the
+        calendar is left untouched (still stale) and the failure counted for
+        the back-off. Returns the fixture count.
+        """
+        self.attempted_at = time.time()
+        leagues = list(leagues or fbref.LEAGUE_MAP.keys())
+        results = await asyncio.gather(
+            *(fbref.get_league_schedule(league) for league in leagues),
+            return_exceptions=True,
+        )
+
+        fixtures: List[Dict[str, Any]] = []
+        refreshed = 0
+        for league, result in zip(leagues, results):
+            if isinstance(result, Exception) or "error" in result:
+                error = result if isinstance(result, Exception) else result["error"]
+                logger.warning(f"Fixture calendar: {league} refresh failed ({error}), keeping cached fixtures")
+                fixtures.extend(f for f in self.fixtures if f["league"] == league)
+            else:
+                fixtures.extend(result["fixtures"])
+                refreshed += 1
+
+        if not refreshed:
+            self.failures += 1
+            logger.warning(f"Fixture calendar: every league failed, next attempt in {self._retry_delay():.0f}s")
+            return len(self.fixtures)
+        self.failures = 0
+        self.replace(fixtures)
+        self.save()
+        logger.info(f"Fixture calendar refreshed: {len(fixtures)} fixtures")
+        return len(fixtures)
+
+    def ensure_fresh(self, fbref) -> Optional[asyncio.Task]:
+        """Schedule a background refresh if the calendar is stale (never blocks)."""
+        if not self.is_stale or not self.retry_due or (self._refresh_task and not self._refresh_task.done()):
+            return self._refresh_task
+        self._refresh_task = asyncio.create_task(self._safe_refresh(fbref))
+        return self._refresh_task
+
+    async def _safe_refresh(self, fbref) -> None:
+        try:
+            await self.refresh(fbref)
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Fixture calendar refresh failed: {e}")
+
+
+# Shared calendar instance (loaded from disk on first use)
+_fixture_calendar: Optional[FixtureCalendar] = None
+
+
+def get_fixture_calendar() -> FixtureCalendar:
+    """Get the shared fixture calendar."""
+    global _fixture_calendar
+    if _fixture_calendar is None:
+        _fixture_calendar = FixtureCalendar()
+        _fixture_calendar.load()
+    return _fixture_calendar
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Durable analysis job queue.
+Batch runs enqueue match ids in a local SQLite table and workers claim them
+one at a time. A claimed job holds a lease that its worker renews
+(heartbeat) while the analysis runs; jobs left "running" with an expired
+lease (killed process) are re-queued on the next start, while jobs of a
+batch still running elsewhere are left alone. Failed jobs are retried
+(resuming from their checkpoints) after a back-off, until max_attempts.
+"""
+import logging
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.core.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+JOBS_FILENAME = "jobs.db"
+DEFAULT_MAX_ATTEMPTS = 3
+JOB_LEASE = 120.0  # seconds a claim stays valid without a heartbeat
+JOB_RETRY_DELAY = 30.0  # seconds before a failed job is retried (doubles per attempt)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class JobQueue:
+    """
+    SQLite job queue (FIFO, at-least-once).
+
+    Usage:
+        queue = JobQueue()
+        queue.enqueue("Arsenal_Liverpool_2026-02-04_PL")
+        job = queue.claim()          # {"id", "match_id", "attempts", ...} or None
+        queue.heartbeat(job["id"])   # while running, at least every lease seconds
+        queue.complete(job["id"])    # or queue.fail(job["id"], "error")
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        lease: float = JOB_LEASE,
+        retry_delay: float = JOB_RETRY_DELAY,
+    ):
+        self.path = Path(path) if path else get_data_dir() / JOBS_FILENAME
+        self.max_attempts = max_attempts
+        self.lease = lease
+        self.retry_delay = retry_delay
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                match_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                owner TEXT,
+                lease_until REAL,
+                not_before REAL NOT NULL DEFAULT 0
+            )"""
+        )
+        # Queues created before leases and back-off
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("lease_until", "REAL"), ("not_before", "REAL NOT NULL DEFAULT 0")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+    def enqueue(self, match_id: str) -> int:
+        """Add a job. A match already queued or running is not enqueued twice."""
+        row = self._conn.execute(
+            "SELECT id FROM jobs WHERE match_id = ? AND status IN (?, ?)",
+            (match_id, JOB_QUEUED, JOB_RUNNING),
+        ).fetchone()
+        if row:
+            return row["id"]
+        now = time.time()
+        cursor = self._conn.execute(
+            "INSERT INTO jobs (match_id, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (match_id, JOB_QUEUED, now, now),
+        )
+        return cursor.lastrowid
+
+    def recover(self) -> int:
+        """
+        Re-queue running jobs whose lease expired (their process was killed).
+        Returns their count.
+        """
+        now = time.time()
+        cursor = self._conn.execute(
+            """UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL, updated_at = ?
+               WHERE status = ? AND (lease_until IS NULL OR lease_until < ?)""",
+            (JOB_QUEUED, now, JOB_RUNNING, now),
+        )
+        if cursor.rowcount:
+            logger.info(f"Recovered {cursor.rowcount} interrupted job(s)")
+        return cursor.rowcount
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the oldest queued job that is due (marked running,
+        leased to this process), or None.
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = ? AND not_before <= ? ORDER BY id LIMIT 1", (JOB_QUEUED, now)
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+            self._conn.execute(
+                """UPDATE jobs SET status = ?, attempts = attempts + 1, owner = ?, lease_until = ?, updated_at = ?
+                   WHERE id = ?""",
+                (JOB_RUNNING, self.owner, now + self.lease, now, row["id"]),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        job = dict(row)
+        job.update(status=JOB_RUNNING, attempts=row["attempts"] + 1, owner=self.owner)
+        return job
+
+    def heartbeat(self, job_id: int) -> None:
+        """Renew the lease of a job this process is running."""
+        self._conn.execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND owner = ?",
+            (time.time() + self.lease, job_id, JOB_RUNNING, self.owner),
+        )
+
+    def next_due(self) -> Optional[float]:
+        """Seconds until the next queued job is due (0 if one is), None if nothing is queued."""
+        row = self._conn.execute("SELECT MIN(not_before) AS due FROM jobs WHERE status = ?", (JOB_QUEUED,)).fetchone()
+        if row is None or row["due"] is None:
+            return None
+        return max(0.0, row["due"] - time.time())
+
+    def complete(self, job_id: int) -> None:
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+            (JOB_DONE, time.time(), job_id),
+        )
+
+    def fail(self, job_id: int, error: str) -> str:
+        """
+        Record a failure: re-queued (due after retry_delay, doubling per
+        attempt) while attempts remain, else failed. Returns the new status.
+        """
+        row = self._conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        status = JOB_QUEUED if row and row["attempts"] < self.max_attempts else JOB_FAILED
+        now = time.time()
+        not_before = now + self.retry_delay * 2 ** max(0, (row["attempts"] if row else 1) - 1)
+        self._conn.execute(
+            """UPDATE jobs SET status = ?, last_error = ?, owner = NULL, lease_until = NULL, not_before = ?, updated_at = ?
+               WHERE id = ?""",
+            (status, error, not_before, now, job_id),
+        )
+        return status
+
+    def jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        if status:
+            rows = self._conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id", (status,))
+        else:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY id")
+        return [dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+        return {row["status"]: row["n"] for row in rows}
+
+    def close(self) -> None:
+        self._conn.close()
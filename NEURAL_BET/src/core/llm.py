@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
-from langchain_groq import ChatGroq
-from langchain_mistralai import ChatMistralAI
-from langchain_openai import ChatOpenAI
+from typing import Any, Callable, Dict, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -12,8 +10,27 @@ class LLMFactory:
     """
     Factory to create LLM instances based on the requested provider and model.
     Updated Standards 2026: Mistral, Groq & Fireworks (Kimi).
+
+    The LangChain SDKs are imported on first use: they dominate start-up time
+    and the TUI start screen doesn't need them. Clients are cached per
+    (provider, model, temperature) so their HTTP pools are reused across agents
+    and runs (and can be pre-built by the warm-up).
     """
 
+    _clients: Dict[Tuple[str, str, float], Any] = {}
+
+    @classmethod
+    def _cached(cls, key: Tuple[str, str, float], build: Callable[[], Any]):
+        client = cls._clients.get(key)
+        if client is None:
+            client = cls._clients[key] = build()
+        return client
+
+    @classmethod
+    def clear_clients(cls) -> None:
+        """Forget the cached clients (their HTTP pools belong to the event loop that opened them)."""
+        cls._clients.clear()
+
     @staticmethod
     def get_mistral_model(model_name: str = "mistral-small-latest", temperature: float = 0.0):
         """
@@ -23,11 +40,12 @@ class LLMFactory:
         if not api_key:
             raise ValueError("MISTRAL_API_KEY is missing in .env")
             
-        return ChatMistralAI(
+        from langchain_mistralai import ChatMistralAI
+        return LLMFactory._cached(("mistral", model_name, temperature), lambda: ChatMistralAI(
             model=model_name,
             temperature=temperature,
             mistral_api_key=api_key
-        )
+        ))
 
     @staticmethod
     def get_groq_model(model_name: str = "groq/compound", temperature: float = 0.0):
@@ -38,11 +56,12 @@ class LLMFactory:
         if not api_key:
             raise ValueError("GROQ_API_KEY is missing in .env")
             
-        return ChatGroq(
+        from langchain_groq import ChatGroq
+        return LLMFactory._cached(("groq", model_name, temperature), lambda: ChatGroq(
             model_name=model_name,
             temperature=temperature,
             groq_api_key=api_key
-        )
+        ))
     
     @staticmethod
     def get_fireworks_model(model_name: str = "accounts/fireworks/models/kimi-k2p5", temperature: float = 0.6):
@@ -54,12 +73,13 @@ class LLMFactory:
         if not api_key:
             raise ValueError("FIREWORKS_API_KEY is missing in .env")
 
-        return ChatOpenAI(
+        from langchain_openai import ChatOpenAI
+        return LLMFactory._cached(("fireworks", model_name, temperature), lambda: ChatOpenAI(
             model=model_name,
             temperature=temperature,
             api_key=api_key,  # Fireworks API key
             base_url="https://api.fireworks.ai/inference/v1"  # NO /chat/completions!
-        )
+        ))
 
     @staticmethod
     def create(agent_role: str):
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import os
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 
@@ -26,6 +27,8 @@ class MockMarketProvider(MarketDataProvider):
     """
     Simulated market for testing Value Hunter logic.
     """
+    bookmaker = "mock"  # tag of its quotes in the odds history
+
     async def get_odds(self, match_id: str) -> Optional[Dict[str, float]]:
         # Simulation: Market favors Arsenal heavily against Liverpool? 
         return {
@@ -35,3 +38,23 @@ class MockMarketProvider(MarketDataProvider):
             "over_2_5": 1.65,
             "btts_yes": 1.55
         }
+
+
+# Shared provider (built on first use)
+_market_provider: Optional[MarketDataProvider] = None
+
+
+def get_market_provider() -> MarketDataProvider:
+    """
+    Get the shared odds provider: the polling feed client when
+    NEURALBET_ODDS_FEED_URL is set (recording into the odds history), else the mock.
+    """
+    global _market_provider
+    if _market_provider is None:
+        if os.getenv("NEURALBET_ODDS_FEED_URL"):
+            from src.core.odds_store import get_odds_store
+            from src.providers.polling_market_provider import PollingMarketProvider
+            _market_provider = PollingMarketProvider(store=get_odds_store())
+        else:
+            _market_provider = MockMarketProvider()
+    return _market_provider
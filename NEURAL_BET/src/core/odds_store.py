@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+"""
+Historical odds store.
+MarketDataProvider.get_odds returns a single snapshot; every snapshot seen
+is appended here so line movement (opening vs current price) stays visible.
+
+Layout (<data dir>/odds/): one append-only binary file per column, read
+back with np.memmap, plus keys.json dictionary-encoding the strings:
+
+    match.i4  market.i4  bookmaker.i4  timestamp.f8  price.f8
+
+Queries are vectorized masks over the mapped columns, so range scans and
+"latest per market" lookups don't load the history into Python objects.
+A torn append (crash between column writes) is truncated to the shortest
+column on open. One writer process at a time; readers may be many.
+"""
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+ODDS_DIRNAME = "odds"
+KEYS_FILENAME = "keys.json"
+COLUMNS = {
+    "match": np.dtype("<i4"),
+    "market": np.dtype("<i4"),
+    "bookmaker": np.dtype("<i4"),
+    "timestamp": np.dtype("<f8"),
+    "price": np.dtype("<f8"),
+}
+KEY_COLUMNS = ("match", "market", "bookmaker")
+DEFAULT_BOOKMAKER = "default"
+
+# football-data.co.uk CSV columns: bookmaker prefix -> name, column suffix -> market
+FOOTBALL_DATA_BOOKMAKERS = {"B365": "bet365", "PS": "pinnacle", "WH": "williamhill", "Avg": "average", "Max": "max"}
+FOOTBALL_DATA_MARKETS = {"H": "home_win", "D": "draw", "A": "away_win", ">2.5": "over_2_5", "<2.5": "under_2_5"}
+FOOTBALL_DATA_LEAGUES = {"E0": "PL", "E1": "CHAMPIONSHIP", "SP1": "LIGA", "I1": "SERIE_A", "D1": "BUNDESLIGA", "F1": "L1"}
+
+Row = Tuple[str, str, str, float, float]  # match_id, market, bookmaker, timestamp, price
+
+
+def to_timestamp(value: Union[None, float, int, str, datetime]) -> float:
+    """Epoch seconds from a number, a datetime or an ISO string (now if None)."""
+    if value is None:
+        return time.time()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+class OddsStore:
+    """
+    Append-only columnar odds time series.
+
+    Usage:
+        store = OddsStore()
+        store.record("Arsenal_Liverpool", {"home_win": 2.10, "draw": 3.50}, bookmaker="bet365")
+        store.latest("Arsenal_Liverpool")     # {"home_win": 2.10, "draw": 3.50}
+        store.movement("Arsenal_Liverpool")   # opening / current / change per market
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else get_data_dir() / ODDS_DIRNAME
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._keys: Dict[str, List[str]] = {column: [] for column in KEY_COLUMNS}
+        self._codes: Dict[str, Dict[str, int]] = {column: {} for column in KEY_COLUMNS}
+        self._keys_mtime = None
+        self._load_keys()
+        self._repair()
+
+    # --- Files ---
+
+    def _column_path(self, column: str) -> Path:
+        return self.path / f"{column}.{COLUMNS[column].kind}{COLUMNS[column].itemsize}"
+
+    def _load_keys(self) -> None:
+        keys_path = self.path / KEYS_FILENAME
+        try:
+            mtime = keys_path.stat().st_mtime_ns
+            if mtime == self._keys_mtime:
+                return
+            data = json.loads(keys_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        self._keys = {column: list(data.get(column, [])) for column in KEY_COLUMNS}
+        self._codes = {column: {key: i for i, key in enumerate(keys)} for column, keys in self._keys.items()}
+        self._keys_mtime = mtime
+
+    def _save_keys(self) -> None:
+        keys_path = self.path / KEYS_FILENAME
+        tmp = keys_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._keys), encoding="utf-8")
+        os.replace(tmp, keys_path)
+        self._keys_mtime = keys_path.stat().st_mtime_ns
+
+    def _rows_on_disk(self) -> int:
+        sizes = []
+        for column, dtype in COLUMNS.items():
+            try:
+                sizes.append(self._column_path(column).stat().st_size // dtype.itemsize)
+            except OSError:
+                sizes.append(0)
+        return min(sizes)
+
+    def _repair(self) -> None:
+        """Truncate every column to the rows fully written to all of them."""
+        rows = self._rows_on_disk()
+        for column, dtype in COLUMNS.items():
+            column_path = self._column_path(column)
+            if column_path.exists() and column_path.stat().st_size != rows * dtype.itemsize:
+                logger.warning(f"Odds store: truncating torn column {column} to {rows} rows")
+                os.truncate(column_path, rows * dtype.itemsize)
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        """Read-only memory maps of every column (same length)."""
+        self._load_keys()
+        rows = self._rows_on_disk()
+        if rows == 0:
+            return {column: np.empty(0, dtype) for column, dtype in COLUMNS.items()}
+        return {
+            column: np.memmap(self._column_path(column), dtype=dtype, mode="r", shape=(rows,))
+            for column, dtype in COLUMNS.items()
+        }
+
+    def __len__(self) -> int:
+        return self._rows_on_disk()
+
+    # --- Writes ---
+
+    def _encode(self, column: str, key: str) -> int:
+        codes = self._codes[column]
+        if key not in codes:
+            codes[key] = len(self._keys[column])
+            self._keys[column].append(key)
+        return codes[key]
+
+    def append(self, rows: Iterable[Row]) -> int:
+        """Append (match_id, market, bookmaker, timestamp, price) rows; returns the count written."""
+        rows = [row for row in rows if row[4] is not None and float(row[4]) > 1.0]
+        if not rows:
+            return 0
+        with self._lock:
+            self._load_keys()
+            self._repair()
+            known = {column: len(keys) for column, keys in self._keys.items()}
+            data = {
+                "match": np.array([self._encode("match", str(row[0])) for row in rows]),
+                "market": np.array([self._encode("market", str(row[1])) for row in rows]),
+                "bookmaker": np.array([self._encode("bookmaker", str(row[2])) for row in rows]),
+                "timestamp": np.array([to_timestamp(row[3]) for row in rows]),
+                "price": np.array([float(row[4]) for row in rows]),
+            }
+            # Keys first: every code on disk must be resolvable
+            if any(len(keys) != known[column] for column, keys in self._keys.items()):
+                self._save_keys()
+            for column, dtype in COLUMNS.items():
+                with open(self._column_path(column), "ab") as f:
+                    data[column].astype(dtype).tofile(f)
+        return len(rows)
+
+    def record(
+        self,
+        match_id: str,
+        odds: Dict[str, Any],
+        bookmaker: str = DEFAULT_BOOKMAKER,
+        timestamp: Union[None, float, str, datetime] = None,
+    ) -> int:
+        """Append one get_odds snapshot (non-numeric entries are skipped)."""
+        ts = to_timestamp(timestamp)
+        rows = []
+        for market, price in (odds or {}).items():
+            if isinstance(price, (int, float)) and not isinstance(price, bool):
+                rows.append((match_id, market, bookmaker, ts, float(price)))
+        return self.append(rows)
+
+    # --- Reads ---
+
+    def _mask(self, columns: Dict[str, np.ndarray], **filters) -> Optional[np.ndarray]:
+        """Row mask for the key filters and time range (None if a key was never stored)."""
+        mask = np.ones(len(columns["price"]), dtype=bool)
+        for column in KEY_COLUMNS:
+            key = filters.get(column)
+            if key is None:
+                continue
+            code = self._codes[column].get(key)
+            if code is None:
+                return None
+            mask &= columns[column] == code
+        if filters.get("start") is not None:
+            mask &= columns["timestamp"] >= to_timestamp(filters["start"])
+        if filters.get("end") is not None:
+            mask &= columns["timestamp"] <= to_timestamp(filters["end"])
+        return mask
+
+    def scan(
+        self,
+        match_id: Optional[str] = None,
+        market: Optional[str] = None,
+        bookmaker: Optional[str] = None,
+        start: Union[None, float, str, datetime] = None,
+        end: Union[None, float, str, datetime] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Rows matching the filters (start/end inclusive), in time order.
+        Returns column arrays: match_id, market, bookmaker (strings), timestamp, price.
+        """
+        columns = self._columns()
+        mask = self._mask(columns, match=match_id, market=market, bookmaker=bookmaker, start=start, end=end)
+        rows = np.flatnonzero(mask) if mask is not None else np.empty(0, dtype=int)
+        rows = rows[np.argsort(columns["timestamp"][rows], kind="stable")]
+        return {
+            "match_id": np.array(self._keys["match"], dtype=object)[columns["match"][rows]],
+            "market": np.array(self._keys["market"], dtype=object)[columns["market"][rows]],
+            "bookmaker": np.array(self._keys["bookmaker"], dtype=object)[columns["bookmaker"][rows]],
+            "timestamp": np.asarray(columns["timestamp"][rows]),
+            "price": np.asarray(columns["price"][rows]),
+        }
+
+    def _per_market(
+        self,
+        match_id: str,
+        bookmaker: Optional[str],
+        at: Union[None, float, str, datetime],
+        last: bool,
+    ) -> Dict[str, Tuple[float, float]]:
+        """{market: (timestamp, price)} of the first or last quote per market (as of `at`)."""
+        columns = self._columns()
+        mask = self._mask(columns, match=match_id, bookmaker=bookmaker, end=at)
+        if mask is None:
+            return {}
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return {}
+        markets = columns["market"][rows]
+        # Market, then time, then append order (latest write wins a timestamp tie)
+        rows = rows[np.lexsort((rows, columns["timestamp"][rows], markets))]
+        markets = columns["market"][rows]
+        boundary = markets[1:] != markets[:-1]
+        pick = np.r_[boundary, True] if last else np.r_[True, boundary]
+        rows = rows[pick]
+        return {
+            self._keys["market"][code]: (float(ts), float(price))
+            for code, ts, price in zip(columns["market"][rows], columns["timestamp"][rows], columns["price"][rows])
+        }
+
+    def latest(
+        self, match_id: str, bookmaker: Optional[str] = None, at: Union[None, float, str, datetime] = None
+    ) -> Dict[str, float]:
+        """Most recent price per market (any bookmaker unless given), optionally as of `at`."""
+        return {market: price for market, (_, price) in self._per_market(match_id, bookmaker, at, last=True).items()}
+
+    def opening(self, match_id: str, bookmaker: Optional[str] = None) -> Dict[str, float]:
+        """First price recorded per market."""
+        return {market: price for market, (_, price) in self._per_market(match_id, bookmaker, None, last=False).items()}
+
+    def movement(self, match_id: str, bookmaker: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Opening vs current price per market; change is relative (-0.05 = price shortened 5%)."""
+        opening = self.opening(match_id, bookmaker)
+        current = self.latest(match_id, bookmaker)
+        return {
+            market: {
+                "opening": opening[market],
+                "current": current[market],
+                "change": round(current[market] / opening[market] - 1.0, 4),
+            }
+            for market in current
+            if market in opening
+        }
+
+    def match_ids(self) -> List[str]:
+        self._load_keys()
+        return list(self._keys["match"])
+
+    # --- Bulk loading ---
+
+    def load_csv(self, path: Union[str, Path], bookmaker: Optional[str] = None) -> int:
+        """
+        Bulk-load a historical odds CSV; returns the rows appended.
+
+        Two layouts are accepted:
+        - long: match_id, market, bookmaker, timestamp, price (one quote per line);
+        - football-data.co.uk: Div, Date, HomeTeam, AwayTeam, B365H, B365D, ...
+          Match ids follow the fixture calendar (Home_Away_YYYY-MM-DD_LEAGUE).
+        """
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            fields = set(reader.fieldnames or [])
+            if {"match_id", "market", "price"} <= fields:
+                rows = [
+                    (
+                        line["match_id"],
+                        line["market"],
+                        line.get("bookmaker") or bookmaker or DEFAULT_BOOKMAKER,
+                        to_timestamp(line.get("timestamp") or None),
+                        _as_price(line["price"]),
+                    )
+                    for line in reader
+                ]
+            elif {"Date", "HomeTeam", "AwayTeam"} <= fields:
+                rows = _football_data_rows(reader, fields)
+            else:
+                raise ValueError(f"Unrecognised odds CSV layout: {path}")
+        count = self.append(rows)
+        logger.info(f"Odds store: loaded {count} quotes from {path}")
+        return count
+
+
+def _as_price(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def football_data_fixture(line: Dict[str, str]) -> Optional[Tuple[str, datetime]]:
+    """
+    (match_id, kickoff) of a football-data.co.uk row, None if its date is unreadable.
+    Match ids follow the fixture calendar (Home_Away_YYYY-MM-DD_LEAGUE).
+    """
+    day = None
+    for fmt in ("%d/%m/%Y", "%d/%m/%y", "%Y-%m-%d"):
+        try:
+            day = datetime.strptime(line["Date"], fmt)
+            break
+        except (TypeError, ValueError):
+            continue
+    if day is None:
+        return None
+    if line.get("Time"):
+        try:
+            hours, minutes = line["Time"].split(":")[:2]
+            day = day.replace(hour=int(hours), minute=int(minutes))
+        except ValueError:
+            pass
+    league = FOOTBALL_DATA_LEAGUES.get(line.get("Div", ""), line.get("Div") or "PL")
+    match_id = f"{line['HomeTeam']}_{line['AwayTeam']}_{day.date().isoformat()}_{league}".replace(" ", "_")
+    return match_id, day
+
+
+def _football_data_rows(reader: Iterable[Dict[str, str]], fields: Sequence[str]) -> List[Row]:
+    """Quotes of the known bookmaker/market columns of a football-data.co.uk file."""
+    columns = []
+    for prefix, bookmaker in FOOTBALL_DATA_BOOKMAKERS.items():
+        for suffix, market in FOOTBALL_DATA_MARKETS.items():
+            # Pinnacle's over/under columns are "P>2.5" / "P<2.5"
+            name = f"{'P' if prefix == 'PS' and suffix[0] in '<>' else prefix}{suffix}"
+            if name in fields:
+                columns.append((name, bookmaker, market))
+
+    rows: List[Row] = []
+    for line in reader:
+        fixture = football_data_fixture(line)
+        if fixture is None:
+            continue
+        match_id, kickoff = fixture
+        ts = kickoff.timestamp()
+        for name, bookmaker, market in columns:
+            rows.append((match_id, market, bookmaker, ts, _as_price(line.get(name))))
+    return rows
+
+
+# Shared store (opened on first use)
+_odds_store: Optional[OddsStore] = None
+
+
+def get_odds_store() -> Optional[OddsStore]:
+    """Get the shared odds store, or None when disabled (NEURALBET_ODDS_HISTORY=0)."""
+    global _odds_store
+    if os.getenv("NEURALBET_ODDS_HISTORY", "1").lower() in ("0", "false", "no"):
+        return None
+    if _odds_store is None:
+        _odds_store = OddsStore()
+    return _odds_store
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Bulk-load historical odds CSV files into the odds store")
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--bookmaker", help="Bookmaker of long-format rows without one")
+    parser.add_argument("--path", type=Path, help="Store directory (default: <data dir>/odds)")
+    args = parser.parse_args()
+
+    odds_store = OddsStore(args.path)
+    try:
+        total = sum(odds_store.load_csv(file, bookmaker=args.bookmaker) for file in args.files)
+    except (OSError, ValueError) as e:
+        sys.exit(f"❌ {e}")
+    print(f"✅ {total} quotes loaded ({len(odds_store)} in store)")
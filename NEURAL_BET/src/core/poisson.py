@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Poisson / Dixon-Coles score model.
+Turns team xG rates (Understat recent form, FBRef season totals) into a full
+scoreline matrix and 1X2 / over-under / BTTS probabilities. Every function
+works on arrays, so a whole matchday is priced in one NumPy operation; the
+result is given to the agents as a numeric prior (match_data["prior"]).
+
+Model:
+    lambda_home = home_xg * away_xga / league_avg * home_advantage
+    lambda_away = away_xg * home_xga / league_avg / home_advantage
+    P(h, a) = Poisson(h; lambda_home) * Poisson(a; lambda_away) * tau(h, a)
+with the Dixon-Coles tau correcting the 0-0, 1-0, 0-1 and 1-1 cells.
+"""
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+LEAGUE_AVG_GOALS = 1.35  # goals (xG) per team per match, top-5 leagues
+HOME_ADVANTAGE = 1.12
+DC_RHO = -0.08  # Dixon-Coles low-score dependence
+MAX_GOALS = 10  # matrix covers 0..MAX_GOALS goals per team
+FORM_WEIGHT = 0.6  # Understat recent form vs FBRef season average
+
+# ln(k!) for k = 0..MAX_GOALS
+_LOG_FACTORIAL = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, MAX_GOALS + 1)))))
+
+
+def _as_array(values) -> np.ndarray:
+    return np.atleast_1d(np.asarray(values, dtype=float))
+
+
+def expected_goals(
+    home_xg, home_xga, away_xg, away_xga,
+    league_avg: float = LEAGUE_AVG_GOALS,
+    home_advantage: float = HOME_ADVANTAGE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Scoring rates (lambda_home, lambda_away) from per-match xG for/against."""
+    home_xg, home_xga, away_xg, away_xga = map(_as_array, (home_xg, home_xga, away_xg, away_xga))
+    lambda_home = home_xg * away_xga / league_avg * home_advantage
+    lambda_away = away_xg * home_xga / league_avg / home_advantage
+    return np.clip(lambda_home, 0.05, None), np.clip(lambda_away, 0.05, None)
+
+
+def score_matrix(lambda_home, lambda_away, rho: float = DC_RHO, max_goals: int = MAX_GOALS) -> np.ndarray:
+    """
+    Scoreline probabilities, shape (n_matches, max_goals + 1, max_goals + 1):
+    matrix[i, h, a] = P(home scores h, away scores a) for match i.
+    """
+    lambda_home, lambda_away = _as_array(lambda_home), _as_array(lambda_away)
+    goals = np.arange(max_goals + 1)
+    log_factorial = _LOG_FACTORIAL[:max_goals + 1]
+    home = np.exp(goals * np.log(lambda_home)[:, None] - lambda_home[:, None] - log_factorial)
+    away = np.exp(goals * np.log(lambda_away)[:, None] - lambda_away[:, None] - log_factorial)
+    matrix = home[:, :, None] * away[:, None, :]
+
+    # Dixon-Coles correction of the low scores
+    matrix[:, 0, 0] *= 1 - lambda_home * lambda_away * rho
+    matrix[:, 0, 1] *= 1 + lambda_home * rho
+    matrix[:, 1, 0] *= 1 + lambda_away * rho
+    matrix[:, 1, 1] *= 1 - rho
+    np.clip(matrix, 0.0, None, out=matrix)
+    # Renormalise (tau and the truncation at max_goals move a little mass)
+    matrix /= matrix.sum(axis=(1, 2), keepdims=True)
+    return matrix
+
+
+def market_probabilities(matrix: np.ndarray, lines: Iterable[float] = (2.5,)) -> Dict[str, np.ndarray]:
+    """1X2, over/under and BTTS probabilities of score matrices (one value per match)."""
+    goals = np.arange(matrix.shape[1])
+    diff = goals[:, None] - goals[None, :]
+    total = goals[:, None] + goals[None, :]
+    probs = {
+        "home_win": matrix[:, diff > 0].sum(axis=1),
+        "draw": matrix[:, diff == 0].sum(axis=1),
+        "away_win": matrix[:, diff < 0].sum(axis=1),
+        "btts_yes": matrix[:, 1:, 1:].sum(axis=(1, 2)),
+    }
+    for line in lines:
+        over = matrix[:, total > line].sum(axis=1)
+        key = str(line).replace(".", "_")
+        probs[f"over_{key}"] = over
+        probs[f"under_{key}"] = 1.0 - over
+    probs["btts_no"] = 1.0 - probs["btts_yes"]
+    return probs
+
+
+def most_likely_scores(matrix: np.ndarray) -> List[str]:
+    flat = matrix.reshape(matrix.shape[0], -1).argmax(axis=1)
+    home, away = np.divmod(flat, matrix.shape[2])
+    return [f"{h}-{a}" for h, a in zip(home, away)]
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) and number > 0 else None
+
+
+def team_rates(side: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """
+    Per-match (xG for, xG against) of one side of match_data["stats"]:
+    Understat recent form blended with the FBRef season average.
+    """
+    form = side.get("understat_form") if isinstance(side, dict) else None
+    season = side.get("fbref_stats") if isinstance(side, dict) else None
+    rates = []
+    if isinstance(form, dict) and "error" not in form:
+        xg, xga = _number(form.get("avg_xg")), _number(form.get("avg_xga"))
+        if xg and xga:
+            rates.append((FORM_WEIGHT, xg, xga))
+    if isinstance(season, dict) and "error" not in season:
+        played = _number(season.get("matches_played"))
+        xg, xga = _number(season.get("xG")), _number(season.get("xGA"))
+        if played and xg and xga:
+            rates.append((1.0 - FORM_WEIGHT, xg / played, xga / played))
+    if not rates:
+        return None
+    weight = sum(w for w, _, _ in rates)
+    return (
+        sum(w * xg for w, xg, _ in rates) / weight,
+        sum(w * xga for w, _, xga in rates) / weight,
+    )
+
+
+def match_rates(match_data: Dict[str, Any]) -> Optional[Tuple[float, float, float, float]]:
+    """(home_xg, home_xga, away_xg, away_xga) of a NeuralBetProvider match_data, or None."""
+    stats = (match_data or {}).get("stats") or {}
+    home, away = team_rates(stats.get("home") or {}), team_rates(stats.get("away") or {})
+    if home is None or away is None:
+        return None
+    return home[0], home[1], away[0], away[1]
+
+
+def batch_priors(matches: List[Dict[str, Any]], rho: float = DC_RHO) -> List[Optional[Dict[str, Any]]]:
+    """
+    Priors for many match_data dicts in one array operation
+    (None for the matches without usable xG data).
+    """
+    rates = [match_rates(match) for match in matches]
+    usable = [i for i, r in enumerate(rates) if r is not None]
+    priors: List[Optional[Dict[str, Any]]] = [None] * len(matches)
+    if not usable:
+        return priors
+
+    columns = np.array([rates[i] for i in usable]).T
+    lambda_home, lambda_away = expected_goals(*columns)
+    matrix = score_matrix(lambda_home, lambda_away, rho)
+    probs = market_probabilities(matrix)
+    scores = most_likely_scores(matrix)
+    for row, i in enumerate(usable):
+        prior = {
+            "model": "dixon-coles",
+            "lambda_home": round(float(lambda_home[row]), 3),
+            "lambda_away": round(float(lambda_away[row]), 3),
+            "most_likely_score": scores[row],
+        }
+        prior.update({key: round(float(values[row]), 4) for key, values in probs.items()})
+        priors[i] = prior
+    return priors
+
+
+def match_prior(match_data: Dict[str, Any], rho: float = DC_RHO) -> Optional[Dict[str, Any]]:
+    """Prior of a single match (see batch_priors)."""
+    return batch_priors([match_data], rho)[0]
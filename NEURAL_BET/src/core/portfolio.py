@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Simultaneous-bet portfolio (multi-bet Kelly).
+Single-bet Kelly stakes (src/core/value.py) are sized as if each bet were the
+only one; across a matchday they over-stake the bankroll and ignore that
+selections on the same match are correlated. This module sizes all value
+bets of a card together:
+
+    maximise  E[log(1 + R @ s)]
+    s.t.      0 <= s_i <= max_stake
+              sum(s) <= max_exposure,  sum over a match <= max_match_exposure
+
+R holds the per-scenario return of each selection (odds - 1 or -1) over
+sampled joint outcomes: selections of one match are settled on the same
+simulated result, so 1X2 outcomes stay exclusive and correlated markets
+(home win / over 2.5) move together. Scorelines come from the Poisson
+prior, reweighted so each selection still wins at its own probability
+(which may be anchored on the Orchestrator's verdict, not the prior). The objective and its gradient are
+evaluated on the whole scenario matrix at once; the solver is a projected
+ascent along the diagonal Newton direction, with backtracking.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.core.value import KELLY_FRACTION, MAX_STAKE, RESULT_MARKETS, settle_market, stake_units
+
+MAX_EXPOSURE = 0.25  # of bankroll across the card
+MAX_MATCH_EXPOSURE = 0.08  # of bankroll on one match
+N_SCENARIOS = 10_000
+MAX_ITERATIONS = 500
+TOLERANCE = 1e-6  # largest stake move (bankroll fraction) of a converged step
+RAKING_ITERATIONS = 50
+RAKING_TOLERANCE = 1e-4  # largest win-rate gap to the selections' probabilities
+
+
+def _rake(indicators: np.ndarray, probs: np.ndarray) -> np.ndarray:
+    """
+    Scenario weights (summing to 1) under which each column of indicators
+    is true with its probability (iterative proportional fitting).
+    """
+    n = len(indicators)
+    weights = np.full(n, 1.0 / n)
+    for _ in range(RAKING_ITERATIONS):
+        for column, prob in zip(indicators.T, probs):
+            current = weights[column].sum()
+            weights = np.where(column, weights * (prob / current), weights * ((1.0 - prob) / (1.0 - current)))
+        if np.max(np.abs(weights @ indicators - probs)) < RAKING_TOLERANCE:
+            break
+    return weights
+
+
+def simulate_outcomes(selections: Sequence[Dict[str, Any]], n_scenarios: int = N_SCENARIOS, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Joint win indicators, shape (n_scenarios, n_selections).
+
+    Selections carrying "lambda_home"/"lambda_away" are settled on sampled
+    scorelines of their match, resampled with weights that make every
+    selection win at its own "prob". Otherwise (and for markets a scoreline
+    doesn't settle) the 1X2 selections of a match share one uniform draw
+    (exclusive outcomes) and other markets are independent Bernoulli(prob).
+    """
+    rng = np.random.default_rng(seed)
+    wins = np.zeros((n_scenarios, len(selections)), dtype=bool)
+    by_match: Dict[Any, List[int]] = {}
+    for j, selection in enumerate(selections):
+        by_match.setdefault(selection.get("match_id", j), []).append(j)
+
+    for indices in by_match.values():
+        first = selections[indices[0]]
+        if first.get("lambda_home") and first.get("lambda_away"):
+            home = rng.poisson(float(first["lambda_home"]), n_scenarios)
+            away = rng.poisson(float(first["lambda_away"]), n_scenarios)
+            settled = {j: settle_market(selections[j]["market"], home, away) for j in indices}
+            # Reweight the scorelines to the selections' probabilities, then resample
+            raked = [j for j in indices if settled[j] is not None and 0.0 < settled[j].mean() < 1.0]
+            if raked:
+                probs = np.clip([float(selections[j]["prob"]) for j in raked], 1e-6, 1.0 - 1e-6)
+                weights = _rake(np.column_stack([settled[j] for j in raked]), probs)
+                picked = rng.choice(n_scenarios, n_scenarios, p=weights / weights.sum())
+                home, away = home[picked], away[picked]
+            # Scorelines that can't carry a probability fall back to the draws below
+            unsettled = {j for j in indices if j not in raked}
+        else:
+            home = away = None
+            unsettled = set(indices)
+        result_draw = rng.random(n_scenarios)
+        # Cumulative 1X2 bounds from the selections' own probabilities
+        bounds, start = {}, 0.0
+        for market in RESULT_MARKETS:
+            prob = next((float(selections[j]["prob"]) for j in indices if selections[j]["market"] == market), None)
+            if prob is not None:
+                bounds[market] = (start, start + prob)
+                start += prob
+        for j in indices:
+            market = selections[j]["market"]
+            settled = settle_market(market, home, away) if j not in unsettled else None
+            if settled is None:
+                if market in bounds:
+                    low, high = bounds[market]
+                    settled = (result_draw >= low) & (result_draw < high)
+                else:
+                    settled = rng.random(n_scenarios) < float(selections[j]["prob"])
+            wins[:, j] = settled
+    return wins
+
+
+def _capped_shift(values: np.ndarray, upper: np.ndarray, groups: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """
+    clip(values - tau[group], 0, upper) with the smallest tau >= 0 such that
+    every group sums to at most its total; one bisection for all groups at once.
+    """
+    clipped = np.clip(values, 0.0, upper)
+    n_groups = len(totals)
+    over = np.bincount(groups, clipped, n_groups) > totals
+    if not over.any():
+        return clipped
+    low = np.zeros(n_groups)
+    high = np.zeros(n_groups)
+    np.maximum.at(high, groups, values)
+    for _ in range(40):
+        tau = (low + high) / 2
+        exceeded = np.bincount(groups, np.clip(values - tau[groups], 0.0, upper), n_groups) > totals
+        low = np.where(exceeded, tau, low)
+        high = np.where(exceeded, high, tau)
+    return np.clip(values - np.where(over, high, 0.0)[groups], 0.0, upper)
+
+
+def _project(x: np.ndarray, caps: np.ndarray, groups: np.ndarray, max_exposure: float, max_match_exposure: float) -> np.ndarray:
+    """Feasible point near x: box and per-match caps, then the total exposure cap."""
+    n_groups = int(groups.max()) + 1
+    s = _capped_shift(x, caps, groups, np.full(n_groups, max_match_exposure))
+    if s.sum() > max_exposure:
+        # Shrink the total while keeping every per-match sum within its cap
+        s = _capped_shift(s, s, np.zeros(len(s), dtype=int), np.array([max_exposure]))
+    return s
+
+
+def optimise_stakes(
+    odds: np.ndarray,
+    wins: np.ndarray,
+    groups: Optional[np.ndarray] = None,
+    max_stake: float = MAX_STAKE,
+    max_exposure: float = MAX_EXPOSURE,
+    max_match_exposure: float = MAX_MATCH_EXPOSURE,
+    initial: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Growth-optimal stakes (bankroll fractions) for selections with decimal odds and scenario wins."""
+    odds = np.asarray(odds, dtype=float)
+    n = len(odds)
+    if n == 0:
+        return np.zeros(0)
+    # Dense 0..k-1 match indices
+    groups = np.arange(n) if groups is None else np.unique(np.asarray(groups), return_inverse=True)[1]
+    returns = np.where(wins, odds - 1.0, -1.0)  # (n_scenarios, n)
+    caps = np.full(n, max_stake)
+
+    s = _project(np.zeros(n) if initial is None else initial, caps, groups, max_exposure, max_match_exposure)
+    wealth = 1.0 + returns @ s  # per-scenario bankroll multiplier
+    value = float(np.mean(np.log(wealth)))
+    squared = returns ** 2
+    step = 1.0
+    for _ in range(MAX_ITERATIONS):
+        inverse = 1.0 / wealth
+        gradient = returns.T @ inverse / len(returns)
+        # Newton step on each stake alone (diagonal of the Hessian)
+        curvature = squared.T @ (inverse ** 2) / len(returns)
+        direction = gradient / curvature
+        while step > 1e-8:
+            candidate = _project(s + step * direction, caps, groups, max_exposure, max_match_exposure)
+            candidate_wealth = 1.0 + returns @ candidate
+            candidate_value = float(np.mean(np.log(candidate_wealth)))
+            if candidate_value >= value:
+                break
+            step /= 2
+        else:
+            break
+        moved = float(np.abs(candidate - s).max())
+        s, wealth, value = candidate, candidate_wealth, candidate_value
+        step = min(1.0, step * 2)
+        if moved < TOLERANCE:
+            break
+    return s
+
+
+def optimise_card(
+    bets: Sequence[Dict[str, Any]],
+    kelly_fraction: float = KELLY_FRACTION,
+    max_stake: float = MAX_STAKE,
+    max_exposure: float = MAX_EXPOSURE,
+    max_match_exposure: float = MAX_MATCH_EXPOSURE,
+    n_scenarios: int = N_SCENARIOS,
+    seed: Optional[int] = 0,
+) -> Dict[str, Any]:
+    """
+    Size the value bets of a card together (value.scan_card output, optionally
+    with the match's lambda_home / lambda_away).
+
+    Full multi-bet Kelly is solved with the caps scaled by 1 / kelly_fraction,
+    then scaled down by kelly_fraction, so the fractional stakes respect the caps.
+
+    Returns {"bets": [... + "portfolio_stake", "portfolio_units"], "exposure", "expected_growth"}.
+    """
+    bets = [dict(bet) for bet in bets]
+    if not bets:
+        return {"bets": [], "exposure": 0.0, "expected_growth": 0.0}
+
+    wins = simulate_outcomes(bets, n_scenarios, seed)
+    odds = np.array([bet["odds"] for bet in bets], dtype=float)
+    match_ids = [bet.get("match_id") for bet in bets]
+    groups = np.array([match_ids.index(match_id) for match_id in match_ids])
+    full = optimise_stakes(
+        odds, wins, groups,
+        max_stake=max_stake / kelly_fraction,
+        max_exposure=min(0.99, max_exposure / kelly_fraction),
+        max_match_exposure=min(0.99, max_match_exposure / kelly_fraction),
+    )
+    stakes = full * kelly_fraction
+
+    returns = np.where(wins, odds - 1.0, -1.0)
+    for bet, stake in zip(bets, stakes):
+        bet["portfolio_stake"] = round(float(stake), 4)
+        bet["portfolio_units"] = stake_units(stake) if stake >= 1e-4 else 0
+    return {
+        "bets": bets,
+        "exposure": round(float(stakes.sum()), 4),
+        "expected_growth": float(np.mean(np.log1p(returns @ stakes))),
+    }
+
+
+def card_bets(states: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Value bets of analysed matches (AgentState with a ValueHunter "value_scan"),
+    with the Poisson prior's scoring rates attached for joint settlement.
+    """
+    bets = []
+    for state in states:
+        prior = (state.match_data or {}).get("prior") or {}
+        rates = {key: prior[key] for key in ("lambda_home", "lambda_away") if prior.get(key)}
+        for bet in state.analysis_reports.get("value_scan") or []:
+            bets.append({**bet, **rates})
+    return bets
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Speculative prefetch of match data.
+As soon as the dispatcher proposes a match, stats and news are fetched in
+the background; a confirmed analysis then starts with data already in
+memory, a rejected one has its fetches cancelled.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.core.data_provider import MatchDataProvider
+from src.core.news_provider import NewsDataProvider
+from src.core.team_names import parse_match_id
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_TTL = 300  # seconds - older results are refetched live
+
+
+def _teams_from_match_id(match_id: str) -> Tuple[str, str]:
+    """Same "Home_Away[_Date_League]" split as the agents use."""
+    parts = parse_match_id(match_id)
+    if parts is None:
+        return "HomeTeam", "AwayTeam"
+    return parts.home, parts.away
+
+
+class MatchPrefetcher:
+    """
+    Cancellable cache of in-flight/finished fetches, keyed by ("stats", match_id)
+    and ("news", team). A team's news fetch is shared by every candidate it
+    plays in and only cancelled once none of them is left.
+
+    Usage:
+        prefetcher = MatchPrefetcher(NeuralBetProvider(), GoogleNewsProvider())
+        prefetcher.prefetch(match_id)          # candidate proposed
+        miner = DataMinerAgent(provider=prefetcher.match_provider)
+        psych = PsychAgent(news_provider=prefetcher.news_provider)
+        prefetcher.cancel(match_id)            # candidate rejected
+    """
+
+    def __init__(self, provider: MatchDataProvider, news_provider: NewsDataProvider, ttl: int = PREFETCH_TTL):
+        self.provider = provider
+        self.news = news_provider
+        self.ttl = ttl
+        self._tasks: Dict[Tuple[str, str], Tuple[asyncio.Task, float]] = {}
+        self._news_users: Dict[Tuple[str, str], Set[str]] = {}  # news key -> candidate match ids
+        self.match_provider = PrefetchedMatchProvider(self)
+        self.news_provider = PrefetchedNewsProvider(self)
+
+    def _start(self, key: Tuple[str, str], coro) -> None:
+        current = self._tasks.get(key)
+        if current and not current[0].cancelled() and time.time() - current[1] < self.ttl:
+            coro.close()
+            return
+        self._tasks[key] = (asyncio.create_task(coro), time.time())
+
+    def prefetch(self, match_id: str) -> None:
+        """Start fetching stats and both teams' news for a candidate match."""
+        home, away = _teams_from_match_id(match_id)
+        self._start(("stats", match_id), self.provider.get_match_stats(match_id))
+        for team in (home, away):
+            self._start(("news", team), self.news.get_team_news(team))
+            self._news_users.setdefault(("news", team), set()).add(match_id)
+        logger.debug(f"Prefetch started for {match_id}")
+
+    def _keys_for(self, match_id: str) -> List[Tuple[str, str]]:
+        """Keys to drop for a rejected candidate: its stats, and news no other candidate uses."""
+        keys = [("stats", match_id)]
+        for team in _teams_from_match_id(match_id):
+            users = self._news_users.get(("news", team), set())
+            users.discard(match_id)
+            if not users:
+                self._news_users.pop(("news", team), None)
+                keys.append(("news", team))
+        return keys
+
+    def cancel(self, match_id: str) -> None:
+        """Cancel and drop the prefetch of a rejected candidate."""
+        for key in self._keys_for(match_id):
+            entry = self._tasks.pop(key, None)
+            if entry and not entry[0].done():
+                entry[0].cancel()
+        logger.debug(f"Prefetch cancelled for {match_id}")
+
+    def cancel_all(self) -> None:
+        for task, _ in self._tasks.values():
+            if not task.done():
+                task.cancel()
+        self._tasks.clear()
+        self._news_users.clear()
+
+    async def take(self, key: Tuple[str, str]) -> Optional[Any]:
+        """
+        Consume a prefetched result (waiting for it if still in flight).
+        Returns None when absent, stale, failed or an error payload,
+        so callers fall back to a live fetch.
+        """
+        entry = self._tasks.pop(key, None)
+        self._news_users.pop(key, None)
+        if entry is None:
+            return None
+        task, started = entry
+        if time.time() - started > self.ttl:
+            task.cancel()
+            return None
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise  # The caller itself is being cancelled
+            return None
+        except Exception as e:
+            logger.warning(f"Prefetch {key} failed, fetching live: {e}")
+            return None
+        if isinstance(result, dict) and "error" in result:
+            return None
+        if isinstance(result, list) and any(isinstance(item, dict) and "error" in item for item in result):
+            return None
+        return result
+
+
+class PrefetchedMatchProvider(MatchDataProvider):
+    """MatchDataProvider serving prefetched stats first, then the wrapped provider."""
+
+    def __init__(self, prefetcher: MatchPrefetcher):
+        self.prefetcher = prefetcher
+
+    async def get_match_stats(self, match_id: str) -> Optional[Dict[str, Any]]:
+        result = await self.prefetcher.take(("stats", match_id))
+        if result is not None:
+            return result
+        return await self.prefetcher.provider.get_match_stats(match_id)
+
+    async def get_team_form(self, team_id: str, last_n: int = 5) -> Dict[str, Any]:
+        return await self.prefetcher.provider.get_team_form(team_id, last_n)
+
+
+class PrefetchedNewsProvider(NewsDataProvider):
+    """NewsDataProvider serving prefetched headlines first, then the wrapped provider."""
+
+    def __init__(self, prefetcher: MatchPrefetcher):
+        self.prefetcher = prefetcher
+
+    async def get_team_news(self, team_name: str) -> List[Dict[str, Any]]:
+        result = await self.prefetcher.take(("news", team_name))
+        if result is not None:
+            return result
+        return await self.prefetcher.news.get_team_news(team_name)
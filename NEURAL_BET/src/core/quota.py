@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Per-day API quota tracking.
+Counts the requests made to a rate-limited API (NewsAPI's free tier allows
+100 requests per day) in a small SQLite database under the data dir, so the
+count survives restarts and is shared by the TUI, the daemon and batch runs:
+every check-and-count is a single conditional UPDATE, atomic across processes.
+"""
+import logging
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+from src.core.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+QUOTA_FILENAME = "quota.db"
+
+
+class DailyQuota:
+    """
+    Request counter reset every day.
+
+    Usage:
+        quota = DailyQuota("newsapi", limit=100)
+        if quota.try_consume():
+            ...  # make the request
+    """
+
+    def __init__(self, name: str, limit: int, path: Optional[Path] = None):
+        self.name = name
+        self.limit = limit
+        self.path = Path(path) if path else get_data_dir() / QUOTA_FILENAME
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS quotas (
+                name TEXT PRIMARY KEY,
+                day TEXT NOT NULL,
+                used INTEGER NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def _roll(self) -> None:
+        """Start today's count (no-op when another process already did)."""
+        self._conn.execute(
+            """INSERT INTO quotas VALUES (?, ?, 0)
+               ON CONFLICT(name) DO UPDATE SET day = excluded.day, used = 0 WHERE day != excluded.day""",
+            (self.name, date.today().isoformat()),
+        )
+
+    @property
+    def used(self) -> int:
+        row = self._conn.execute("SELECT day, used FROM quotas WHERE name = ?", (self.name,)).fetchone()
+        if row is None or row[0] != date.today().isoformat():
+            return 0
+        return row[1]
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.used)
+
+    def try_consume(self) -> bool:
+        """Count one request; False (nothing counted) when today's quota is spent."""
+        try:
+            with self._conn:
+                self._roll()
+                row = self._conn.execute(
+                    "UPDATE quotas SET used = used + 1 WHERE name = ? AND used < ? RETURNING used",
+                    (self.name, self.limit),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Quota {self.name} not checked, allowing the request: {e}")
+            return True
+        if row is None:
+            return False
+        if row[0] == self.limit:
+            logger.warning(f"Quota {self.name}: daily limit of {self.limit} requests reached")
+        return True
+
+    def exhaust(self) -> None:
+        """Mark today's quota as spent (e.g. the API answered 429)."""
+        try:
+            with self._conn:
+                self._roll()
+                self._conn.execute("UPDATE quotas SET used = MAX(used, ?) WHERE name = ?", (self.limit, self.name))
+        except sqlite3.Error as e:
+            logger.warning(f"Quota {self.name} not saved: {e}")
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Team rating table.
+Long-term team strength, updated one result at a time instead of being
+re-derived from a 5-match window on every analysis:
+
+- Elo: goal-difference weighted (World Football Elo style), with a home
+  advantage in rating points.
+- xG ratings: exponentially weighted xG for/against per team, expressed as
+  attack/defence multipliers of the league average (1.0 = average, a
+  defence below 1.0 concedes less).
+
+Each result is applied once (keyed by match id), so feeding the same
+Understat page twice is a no-op. Elo depends on the order of the results:
+the applied results are kept in a log, and a result older than the last
+applied date (another team's page filling in an earlier match) replays the
+log in date order instead of being applied on top. Lookups are a dict
+access; the table and its log are persisted as JSON in
+<data dir>/ratings.json.
+
+Usage:
+    table = get_rating_table()
+    table.update([{"match_id": "123", "date": "2025-08-16", "home": "Arsenal", "away": "Chelsea",
+                   "home_goals": 2, "away_goals": 1, "home_xg": 1.8, "away_xg": 0.9}])
+    table.match_ratings("Arsenal", "Chelsea")
+"""
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core.config import get_data_dir
+from src.core.team_names import team_key
+
+logger = logging.getLogger(__name__)
+
+RATINGS_FILENAME = "ratings.json"
+RESULT_FIELDS = ("match_id", "date", "home", "away", "home_goals", "away_goals", "home_xg", "away_xg")
+
+ELO_START = 1500.0
+ELO_K = 20.0
+ELO_HOME_ADVANTAGE = 60.0  # rating points
+XG_WEIGHT = 0.1  # weight of the latest match in the xG averages (~10-match memory)
+LEAGUE_XG = 1.35  # starting xG per team per match
+
+
+class RatingTable:
+    """
+    Elo + attack/defence xG ratings per team.
+
+    path: JSON file the table is loaded from and saved to (None = in memory only).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.teams: Dict[str, Dict[str, Any]] = {}
+        self.league_xg = LEAGUE_XG
+        self._seen: set = set()
+        self._log: List[Dict[str, Any]] = []  # applied results, in the order applied
+        self.last_date: str = ""
+        if self.path is not None:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Rating table unreadable, starting over: {e}")
+            return
+        self.teams = data.get("teams", {})
+        self.league_xg = data.get("league_xg", LEAGUE_XG)
+        self._log = data.get("results", [])
+        self._seen = {str(r["match_id"]) for r in self._log}
+        self.last_date = max((str(r.get("date") or "") for r in self._log), default="")
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        tmp = self.path.with_suffix(".tmp")
+        payload = {"teams": self.teams, "league_xg": self.league_xg, "results": self._log}
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def __len__(self) -> int:
+        return len(self.teams)
+
+    # --- Updates ---
+
+    def _team(self, name: str) -> Dict[str, Any]:
+        key = team_key(name)
+        if key not in self.teams:
+            self.teams[key] = {
+                "team": name,
+                "elo": ELO_START,
+                "xg_for": self.league_xg,
+                "xg_against": self.league_xg,
+                "matches": 0,
+                "last_match": None,
+            }
+        return self.teams[key]
+
+    def apply(self, result: Dict[str, Any]) -> bool:
+        """
+        Apply one result on top of the current ratings (see update, which
+        keeps the date order); False if already applied or incomplete.
+        """
+        match_id = str(result.get("match_id", ""))
+        if not match_id or match_id in self._seen:
+            return False
+        try:
+            home_goals, away_goals = int(result["home_goals"]), int(result["away_goals"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        home, away = self._team(result["home"]), self._team(result["away"])
+
+        # Elo, weighted by the goal difference
+        expected = 1.0 / (1.0 + 10 ** ((away["elo"] - home["elo"] - ELO_HOME_ADVANTAGE) / 400.0))
+        score = 1.0 if home_goals > away_goals else 0.5 if home_goals == away_goals else 0.0
+        margin = 1.0 + math.log1p(abs(home_goals - away_goals))
+        shift = ELO_K * margin * (score - expected)
+        home["elo"] += shift
+        away["elo"] -= shift
+
+        # xG averages (goals when the source has no xG)
+        home_xg = result.get("home_xg")
+        away_xg = result.get("away_xg")
+        home_xg = float(home_xg) if home_xg is not None else float(home_goals)
+        away_xg = float(away_xg) if away_xg is not None else float(away_goals)
+        for team, scored, conceded in ((home, home_xg, away_xg), (away, away_xg, home_xg)):
+            team["xg_for"] += XG_WEIGHT * (scored - team["xg_for"])
+            team["xg_against"] += XG_WEIGHT * (conceded - team["xg_against"])
+            team["matches"] += 1
+            team["last_match"] = result.get("date")
+        self.league_xg += XG_WEIGHT / 10 * ((home_xg + away_xg) / 2 - self.league_xg)
+
+        self._seen.add(match_id)
+        self._log.append({key: result.get(key) for key in RESULT_FIELDS})
+        self.last_date = max(self.last_date, str(result.get("date") or ""))
+        return True
+
+    def _replay(self, results: List[Dict[str, Any]]) -> None:
+        """Rebuild the ratings from scratch out of results (any order)."""
+        self.teams, self.league_xg, self._seen, self._log, self.last_date = {}, LEAGUE_XG, set(), [], ""
+        for result in sorted(results, key=lambda r: str(r.get("date") or "")):
+            self.apply(result)
+
+    def update(self, results: Iterable[Dict[str, Any]]) -> int:
+        """
+        Apply new results in date order and save; returns how many were new.
+        A result: match_id, date, home, away, home_goals, away_goals and
+        optionally home_xg/away_xg. A new result dated before the last applied
+        one replays the whole log, so the ratings never depend on the order
+        the pages were read in.
+        """
+        fresh = [r for r in results if str(r.get("match_id", "")) not in self._seen]
+        fresh = sorted(fresh, key=lambda r: str(r.get("date") or ""))
+        if fresh and str(fresh[0].get("date") or "") < self.last_date:
+            before = len(self._log)
+            self._replay(self._log + fresh)
+            applied = len(self._log) - before
+        else:
+            applied = sum(self.apply(r) for r in fresh)
+        if applied:
+            self.save()
+        return applied
+
+    # --- Lookups ---
+
+    def get(self, team: str) -> Optional[Dict[str, Any]]:
+        """Ratings of a team (None if it has no result yet)."""
+        entry = self.teams.get(team_key(team))
+        if entry is None:
+            return None
+        return {
+            "team": entry["team"],
+            "elo": round(entry["elo"], 1),
+            "attack": round(entry["xg_for"] / self.league_xg, 3),
+            "defence": round(entry["xg_against"] / self.league_xg, 3),
+            "xg_for": round(entry["xg_for"], 3),
+            "xg_against": round(entry["xg_against"], 3),
+            "matches": entry["matches"],
+            "last_match": entry["last_match"],
+        }
+
+    def match_ratings(self, home: str, away: str) -> Optional[Dict[str, Any]]:
+        """Both teams' ratings and the Elo expectation of the home side, None if a team is unrated."""
+        home_rating, away_rating = self.get(home), self.get(away)
+        if home_rating is None or away_rating is None:
+            return None
+        elo_diff = home_rating["elo"] + ELO_HOME_ADVANTAGE - away_rating["elo"]
+        return {
+            "home": home_rating,
+            "away": away_rating,
+            "elo_diff": round(elo_diff, 1),
+            "home_expectation": round(1.0 / (1.0 + 10 ** (-elo_diff / 400.0)), 4),
+        }
+
+
+# Shared table (loaded on first use)
+_rating_table: Optional[RatingTable] = None
+
+
+def get_rating_table() -> Optional[RatingTable]:
+    """Get the shared rating table, or None when disabled (NEURALBET_RATINGS=0)."""
+    global _rating_table
+    if os.getenv("NEURALBET_RATINGS", "1").lower() in ("0", "false", "no"):
+        return None
+    if _rating_table is None:
+        _rating_table = RatingTable(get_data_dir() / RATINGS_FILENAME)
+    return _rating_table
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo match simulator.
+Draws scorelines for every fixture of a matchday at once from the scoring
+rates of the Poisson model (src/core/poisson.py) and estimates the derived
+markets: 1X2, over/under lines and BTTS.
+
+Draws are independent Poisson; the Dixon-Coles low-score correction is
+applied as an importance weight on the scoreline histogram, so the
+estimates converge to the same probabilities as the analytic prior.
+Simulations run in chunks bounded by max_chunk_elements (matches x draws
+held in memory at once), with a seeded NumPy Generator for reproducible runs.
+
+Nothing in the analysis path calls it: the agents and the backtest read the
+derived markets from poisson.market_probabilities, which is exact for this
+model. The simulator only cross-checks that closed form (tests/test_simulation.py);
+the Monte Carlo that reaches the bets is the correlated outcome sampling of
+the portfolio optimiser (src/core/portfolio.py).
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.core.poisson import DC_RHO, expected_goals, market_probabilities, match_rates
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMULATIONS = 1_000_000
+DEFAULT_LINES = (0.5, 1.5, 2.5, 3.5, 4.5)
+MAX_CHUNK_ELEMENTS = 4_000_000  # ~32 MB per int64 array
+SIM_MAX_GOALS = 15  # histogram cap (P > 15 goals is negligible for football rates)
+
+
+def _dixon_coles_tau(lam_home: np.ndarray, lam_away: np.ndarray, rho: float, cells: int) -> np.ndarray:
+    """Per-match weight of each scoreline cell (1 outside the four low scores)."""
+    tau = np.ones((len(lam_home), cells, cells))
+    tau[:, 0, 0] = 1 - lam_home * lam_away * rho
+    tau[:, 0, 1] = 1 + lam_home * rho
+    tau[:, 1, 0] = 1 + lam_away * rho
+    tau[:, 1, 1] = 1 - rho
+    return np.clip(tau, 0.0, None)
+
+
+def simulate(
+    lambda_home,
+    lambda_away,
+    n_sims: int = DEFAULT_SIMULATIONS,
+    seed: Optional[int] = None,
+    rho: float = DC_RHO,
+    lines: Iterable[float] = DEFAULT_LINES,
+    max_chunk_elements: int = MAX_CHUNK_ELEMENTS,
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate n_sims scorelines per match.
+
+    Draws are accumulated into a per-match scoreline histogram (goals capped
+    at SIM_MAX_GOALS), weighted by the Dixon-Coles tau, from which the
+    markets are read like from the analytic score matrix.
+
+    Returns arrays (one value per match): home_win, draw, away_win,
+    over_X_5 / under_X_5 for each line, btts_yes, btts_no, avg_goals_home,
+    avg_goals_away, plus "stderr" (largest standard error of the 1X2 estimates).
+    """
+    lam_home = np.atleast_1d(np.asarray(lambda_home, dtype=float))
+    lam_away = np.atleast_1d(np.asarray(lambda_away, dtype=float))
+    n_matches = len(lam_home)
+    cells = SIM_MAX_GOALS + 1
+    rng = np.random.default_rng(seed)
+    chunk = max(1, min(n_sims, max_chunk_elements // max(1, n_matches)))
+    offsets = (np.arange(n_matches) * cells * cells)[:, None]
+
+    counts = np.zeros(n_matches * cells * cells)
+    goals_home = np.zeros(n_matches)
+    goals_away = np.zeros(n_matches)
+    done = 0
+    while done < n_sims:
+        size = min(chunk, n_sims - done)
+        home = rng.poisson(lam_home[:, None], (n_matches, size))
+        away = rng.poisson(lam_away[:, None], (n_matches, size))
+        cell = offsets + np.minimum(home, SIM_MAX_GOALS) * cells + np.minimum(away, SIM_MAX_GOALS)
+        counts += np.bincount(cell.ravel(), minlength=counts.size)
+        goals_home += home.sum(axis=1)
+        goals_away += away.sum(axis=1)
+        done += size
+
+    counts = counts.reshape(n_matches, cells, cells)
+    tau = _dixon_coles_tau(lam_home, lam_away, rho, cells)
+    weighted = counts * tau
+    weight_sum = weighted.sum(axis=(1, 2))
+    probs = market_probabilities(weighted / weight_sum[:, None, None], lines)
+
+    # Goal averages of the weighted draws (tau only differs from 1 on the 0/1-goal cells)
+    goals = np.arange(cells)
+    extra = (tau - 1) * counts
+    probs["avg_goals_home"] = (goals_home + extra.sum(axis=2) @ goals) / weight_sum
+    probs["avg_goals_away"] = (goals_away + extra.sum(axis=1) @ goals) / weight_sum
+
+    # Effective sample size of the weighted draws
+    n_effective = weight_sum ** 2 / (counts * tau ** 2).sum(axis=(1, 2))
+    outcome = np.stack([probs["home_win"], probs["draw"], probs["away_win"]])
+    probs["stderr"] = np.sqrt(outcome * (1 - outcome) / n_effective).max(axis=0)
+    return probs
+
+
+def simulate_matches(
+    matches: Sequence[Dict[str, Any]],
+    n_sims: int = DEFAULT_SIMULATIONS,
+    seed: Optional[int] = None,
+    **kwargs,
+) -> List[Optional[Dict[str, float]]]:
+    """
+    Simulate a list of match_data dicts (NeuralBetProvider.get_match_stats)
+    in one batch. None for the matches without usable xG data.
+    """
+    rates = [match_rates(match) for match in matches]
+    usable = [i for i, r in enumerate(rates) if r is not None]
+    results: List[Optional[Dict[str, float]]] = [None] * len(matches)
+    if not usable:
+        return results
+
+    lambda_home, lambda_away = expected_goals(*np.array([rates[i] for i in usable]).T)
+    probs = simulate(lambda_home, lambda_away, n_sims, seed, **kwargs)
+    for row, i in enumerate(usable):
+        result = {"match_id": matches[i].get("id"), "n_sims": n_sims}
+        result.update({key: round(float(values[row]), 4) for key, values in probs.items()})
+        results[i] = result
+    return results
+
+
+async def simulate_matchday(
+    provider,
+    match_ids: Sequence[str],
+    n_sims: int = DEFAULT_SIMULATIONS,
+    seed: Optional[int] = None,
+    **kwargs,
+) -> Dict[str, Optional[Dict[str, float]]]:
+    """Fetch the stats of every match concurrently, then simulate them in one batch (off the event loop)."""
+    matches = await asyncio.gather(*(provider.get_match_stats(match_id) for match_id in match_ids), return_exceptions=True)
+    matches = [m if isinstance(m, dict) else {"error": str(m)} for m in matches]
+    results = await asyncio.to_thread(simulate_matches, matches, n_sims, seed, **kwargs)
+    missing = [match_id for match_id, result in zip(match_ids, results) if result is None]
+    if missing:
+        logger.warning(f"No xG data to simulate: {', '.join(missing)}")
+    return dict(zip(match_ids, results))
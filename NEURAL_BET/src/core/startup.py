@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Start-up profiling helpers for the `neuralbet` CLI.
+
+`neuralbet --profile-imports` re-runs the TUI under `python -X importtime`,
+with stderr captured to <data dir>/importtime.log. The app appends its
+time-to-interactive (first frame painted) to the same log, and the CLI
+prints a summary of the slowest imports when the app exits.
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+STARTUP_T0_ENV = "NEURALBET_STARTUP_T0"
+TTI_PREFIX = "time-to-interactive:"
+
+
+def report_time_to_interactive() -> None:
+    """Append the time since launch to the profile log (no-op outside --profile-imports)."""
+    t0 = os.getenv(STARTUP_T0_ENV)
+    if not t0:
+        return
+    elapsed_ms = (time.time() - float(t0)) * 1000
+    # Textual captures sys.stderr while running; write to the real fd (the log file)
+    if sys.__stderr__:
+        sys.__stderr__.write(f"{TTI_PREFIX} {elapsed_ms:.0f} ms\n")
+        sys.__stderr__.flush()
+
+
+def parse_importtime(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output into (module, self_us, cumulative_us) rows.
+    Nested imports keep their indentation-free module name.
+    """
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+def summarize_importtime(text: str, top: int = 20) -> str:
+    """Human summary: time-to-interactive, total import time, slowest top-level and self imports."""
+    rows = parse_importtime(text)
+    lines = [line.strip() for line in text.splitlines() if line.startswith(TTI_PREFIX)]
+
+    total_us = sum(self_us for _, self_us, _ in rows)
+    lines.append(f"imports: {len(rows)} modules, {total_us / 1000:.0f} ms total")
+    lines.append(f"\nslowest imports (cumulative):")
+    for name, _, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+        lines.append(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    lines.append(f"\nslowest imports (self):")
+    for name, self_us, _ in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        lines.append(f"  {self_us / 1000:8.1f} ms  {name}")
+    return "\n".join(lines)
+
+
+def profile_startup(project_root: str, log_path: Path, top: int = 20) -> int:
+    """Run the TUI in a child interpreter with import profiling, then print the summary."""
+    env = dict(os.environ, **{STARTUP_T0_ENV: str(time.time())})
+    with open(log_path, "w", encoding="utf-8") as err:
+        code = subprocess.call(
+            [sys.executable, "-X", "importtime", "-c", "from src.cli import main; main()"],
+            cwd=project_root,
+            env=env,
+            stderr=err,
+        )
+    print(summarize_importtime(log_path.read_text(encoding="utf-8"), top))
+    print(f"\nfull log: {log_path}")
+    return code
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Team name normalization and alias resolution.
+Providers spell clubs differently ("Arsenal FC", "AC Milan", "1. FC Köln"),
+so lookups and comparisons go through a single normalized key.
+
+Match ids ("Home_Away_YYYY-MM-DD_LEAGUE", spaces turned into underscores)
+are split by parse_match_id: from the date token, and on the alias index
+where a club name spans several tokens ("Manchester_City_Aston_Villa").
+
+The alias index (src/core/data/team_aliases.json) covers every league of
+FBRefProvider.LEAGUE_MAP and lets the dispatcher resolve clear queries
+such as "Barça vs Real demain" without an LLM call.
+"""
+import json
+import re
+import unicodedata
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.core.date_hints import DATE_WORDS, parse_date_hint
+
+ALIASES_PATH = Path(__file__).resolve().parent / "data" / "team_aliases.json"
+
+# Legal-form / filler tokens that carry no identity
+_FILLER_TOKENS = frozenset({"fc", "afc", "cf", "sc", "ac", "as", "ssc", "club", "the", "calcio"})
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+
+# Words around team names in a query ("analyse le match X contre Y")
+_QUERY_STOPWORDS = frozenset({
+    "analyse", "analyser", "analyze", "analysis", "analyses", "match", "game", "fixture",
+    "le", "la", "les", "l", "du", "de", "des", "d", "un", "une", "entre", "pour", "et",
+    "of", "for", "between", "and", "please", "stp", "svp", "prochain", "next", "a", "au",
+})
+_MATCH_ID_DATE = re.compile(r"\d{4}(?:-\d{2}-\d{2})?")
+_VERSUS = re.compile(r"\s+(?:vs\.?|v\.?|contre|against|face a|x)\s+|\s+[-–]\s+")
+
+FUZZY_MIN_SCORE = 0.55
+FUZZY_MIN_MARGIN = 0.08
+
+
+def normalize_team_name(name: str) -> str:
+    """
+    Build the lookup key of a team name.
+
+    Examples:
+        "Arsenal FC" -> "arsenal"
+        "1. FC Köln" -> "koln"
+        "Brighton & Hove Albion" -> "brighton and hove albion"
+    """
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = text.replace("&", " and ").replace("_", " ").replace("-", " ")
+    text = _NON_ALNUM.sub(" ", text)
+    tokens = [t for t in text.split() if t not in _FILLER_TOKENS and not t.isdigit()]
+    return " ".join(tokens)
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TeamMatch(NamedTuple):
+    """A resolved club: canonical (Understat/FBRef) name, league code, match score."""
+    name: str
+    league: str
+    score: float
+
+
+class MatchIdParts(NamedTuple):
+    home: str
+    away: str
+    date: Optional[str]
+    league: Optional[str]
+
+
+class TeamAliasIndex:
+    """
+    Precomputed alias + character-trigram index of clubs.
+
+    Exact lookups are a dict hit on the normalized alias; fuzzy lookups score
+    candidates sharing trigrams (Dice coefficient) and only accept a clear winner.
+    Aliases shared by several clubs are marked ambiguous and never resolve.
+    """
+
+    def __init__(self, clubs: Dict[str, Dict[str, List[str]]]):
+        self.clubs = clubs
+        # normalized alias -> (canonical, league), or None when ambiguous
+        self._exact: Dict[str, Optional[Tuple[str, str]]] = {}
+        for league, teams in clubs.items():
+            for canonical, aliases in teams.items():
+                for alias in [canonical, *aliases]:
+                    key = normalize_team_name(alias)
+                    if not key:
+                        continue
+                    current = self._exact.get(key, (canonical, league))
+                    self._exact[key] = (canonical, league) if current == (canonical, league) else None
+
+        self._keys: List[str] = [k for k, v in self._exact.items() if v is not None]
+        self._key_sizes: List[int] = []
+        self._grams: Dict[str, List[int]] = {}
+        for idx, key in enumerate(self._keys):
+            grams = _trigrams(key)
+            self._key_sizes.append(len(grams))
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(idx)
+        self.max_span = max((len(k.split()) for k in self._exact), default=1)
+        # Multi-word aliases containing a date word ("sheffield wednesday") are kept out of date parsing
+        dated = sorted(
+            (k for k in self._exact if len(k.split()) > 1 and DATE_WORDS.intersection(k.split())),
+            key=len, reverse=True,
+        )
+        self._dated_aliases = (
+            re.compile(r"\b(?:" + "|".join(r"\s+".join(map(re.escape, k.split())) for k in dated) + r")\b")
+            if dated else None
+        )
+
+    @classmethod
+    def from_file(cls, path: Path = ALIASES_PATH) -> "TeamAliasIndex":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    @property
+    def leagues(self) -> List[str]:
+        return list(self.clubs)
+
+    # --- Single-name resolution ---
+
+    def lookup(self, name: str) -> Optional[TeamMatch]:
+        """Exact alias lookup (O(1)). None if unknown or ambiguous."""
+        hit = self._exact.get(normalize_team_name(name))
+        return TeamMatch(hit[0], hit[1], 1.0) if hit else None
+
+    def is_ambiguous(self, name: str) -> bool:
+        key = normalize_team_name(name)
+        return key in self._exact and self._exact[key] is None
+
+    def resolve(self, name: str, min_score: float = FUZZY_MIN_SCORE) -> Optional[TeamMatch]:
+        """Exact lookup, then trigram fuzzy match ("Arsnal" -> Arsenal)."""
+        key = normalize_team_name(name)
+        if not key or key in self._exact:
+            return self.lookup(name)
+
+        query = _trigrams(key)
+        shared: Dict[int, int] = {}
+        for gram in query:
+            for idx in self._grams.get(gram, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+        if not shared:
+            return None
+
+        # Best score per canonical club
+        best: Dict[Tuple[str, str], float] = {}
+        for idx, count in shared.items():
+            score = 2.0 * count / (len(query) + self._key_sizes[idx])
+            club = self._exact[self._keys[idx]]
+            if score > best.get(club, 0.0):
+                best[club] = score
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        (canonical, league), top = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if top < min_score or top - runner_up < FUZZY_MIN_MARGIN:
+            return None
+        return TeamMatch(canonical, league, round(top, 3))
+
+    def canonical(self, name: str) -> str:
+        """Canonical club name, or the input unchanged if it can't be resolved."""
+        hit = self.resolve(name) if name else None
+        return hit.name if hit else name
+
+    # --- Query parsing ---
+
+    def _scan_spans(self, tokens: List[str]) -> Tuple[List[TeamMatch], bool]:
+        """Greedy longest-span exact alias scan over query tokens."""
+        hits: List[TeamMatch] = []
+        ambiguous = False
+        i = 0
+        while i < len(tokens):
+            for span in range(min(self.max_span, len(tokens) - i), 0, -1):
+                key = " ".join(tokens[i:i + span])
+                if key in self._exact:
+                    hit = self._exact[key]
+                    if hit is None:
+                        ambiguous = True
+                    elif all(h.name != hit[0] for h in hits):
+                        hits.append(TeamMatch(hit[0], hit[1], 1.0))
+                    i += span
+                    break
+            else:
+                i += 1
+        return hits, ambiguous
+
+    def _resolve_side(self, side: str) -> Optional[TeamMatch]:
+        """The single club named by one side of "X vs Y" (exact span, else fuzzy), None if unclear."""
+        words = [t for t in normalize_team_name(side).split() if t not in _QUERY_STOPWORDS]
+        hits, ambiguous = self._scan_spans(words)
+        if ambiguous or len(hits) > 1:
+            return None
+        if hits:
+            return hits[0]
+        # Typos ("Arsnal")
+        return self.resolve(" ".join(words)) if 0 < len(words) <= self.max_span else None
+
+    def parse_query(self, text: str, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Rule-based entity extraction for the dispatcher.
+
+        Returns:
+            {"team1", "team2", "date_hint", "league", "confident"}
+            confident=False means the query should go to the LLM extractor.
+        """
+        date_hint, remainder = parse_date_hint(text, today, protected=self._dated_aliases)
+        sides = [s for s in _VERSUS.split(remainder) if s.strip()]
+
+        # "X vs Y": each side must resolve to one club on its own
+        if len(sides) == 2:
+            side_hits = [self._resolve_side(side) for side in sides]
+            confident = all(side_hits) and side_hits[0].name != side_hits[1].name
+            hits = [hit for hit in side_hits if hit]
+        else:
+            tokens = [t for t in normalize_team_name(remainder).split() if t not in _QUERY_STOPWORDS]
+            hits, ambiguous = self._scan_spans(tokens)
+            confident = 1 <= len(hits) <= 2 and not ambiguous
+        return {
+            "team1": hits[0].name if hits else None,
+            "team2": hits[1].name if len(hits) > 1 else None,
+            "date_hint": date_hint,
+            "league": hits[0].league if hits else None,
+            "confident": confident,
+        }
+
+
+# Shared index (loaded from disk on first use)
+_team_index: Optional[TeamAliasIndex] = None
+
+
+def get_team_index() -> TeamAliasIndex:
+    """Get the shared team alias index."""
+    global _team_index
+    if _team_index is None:
+        _team_index = TeamAliasIndex.from_file()
+    return _team_index
+
+
+def team_key(name: str) -> str:
+    """Normalized key of the canonical club when the alias is known, else of the name itself."""
+    hit = get_team_index().lookup(name) if name else None
+    return normalize_team_name(hit.name if hit else name)
+
+
+def teams_match(a: str, b: str) -> bool:
+    """
+    True if two team names designate the same club.
+    Same canonical club (via aliases), or every token of the shorter
+    normalized name is in the longer one ("Liverpool FC" vs "liverpool").
+    """
+    key_a, key_b = team_key(a), team_key(b)
+    if not key_a or not key_b:
+        return False
+    if key_a == key_b:
+        return True
+    tokens_a, tokens_b = set(key_a.split()), set(key_b.split())
+    return tokens_a <= tokens_b or tokens_b <= tokens_a
+
+
+def parse_match_id(match_id: str) -> Optional[MatchIdParts]:
+    """
+    Split a match id into home, away, date and league (None if it has
+    fewer than two team tokens). The tokens before the date are the two
+    clubs: split where both sides are known aliases, else after the first.
+    """
+    tokens = [token for token in match_id.split("_") if token]
+    date_pos = next((i for i in range(2, len(tokens)) if _MATCH_ID_DATE.fullmatch(tokens[i])), None)
+    teams = tokens[:date_pos] if date_pos is not None else tokens
+    if len(teams) < 2:
+        return None
+    index = get_team_index()
+
+    def known(cut: int) -> int:
+        return (index.lookup(" ".join(teams[:cut])) is not None) + (index.lookup(" ".join(teams[cut:])) is not None)
+
+    cut = max(range(1, len(teams)), key=known)
+    if date_pos is None:
+        date, league = None, None
+    else:
+        date, league = tokens[date_pos], "_".join(tokens[date_pos + 1:]) or None
+    return MatchIdParts(" ".join(teams[:cut]), " ".join(teams[cut:]), date, league)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Expected value and Kelly staking.
+Evaluates every market of every match in a batch with NumPy:
+    1. strip the bookmaker margin from the odds (fair probabilities),
+    2. EV = p_model * odds - 1 and edge = p_model - p_fair,
+    3. fractional Kelly stake = kelly_fraction * EV / (odds - 1), capped.
+
+Markets whose complement isn't quoted (over_2_5 without under_2_5, btts_yes
+without btts_no) are de-margined with the overround of the match's 1X2 book.
+Missing odds/probabilities are NaN and never produce a bet.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+MARKETS = ("home_win", "draw", "away_win", "over_2_5", "btts_yes")
+COMPLEMENTS = {"over_2_5": "under_2_5", "btts_yes": "btts_no"}
+RESULT_MARKETS = ("home_win", "draw", "away_win")
+
+KELLY_FRACTION = 0.25  # quarter Kelly
+MAX_STAKE = 0.05  # of bankroll, per selection
+MIN_EV = 0.0
+STAKE_UNIT = 0.005  # bankroll fraction of one stake unit (ValueHunterOutput.stake_unit)
+
+MARKET_LABELS = {
+    "home_win": "{home} Win",
+    "draw": "Draw",
+    "away_win": "{away} Win",
+    "over_2_5": "Over 2.5 Goals",
+    "btts_yes": "Both Teams To Score",
+}
+
+
+def _matrix(rows: Sequence[Optional[Dict[str, Any]]], keys: Sequence[str]) -> np.ndarray:
+    """(n_rows, n_keys) float array, NaN where a value is missing or invalid."""
+    out = np.full((len(rows), len(keys)), np.nan)
+    for i, row in enumerate(rows):
+        for j, key in enumerate(keys):
+            try:
+                out[i, j] = float((row or {})[key])
+            except (KeyError, TypeError, ValueError):
+                pass
+    return out
+
+
+def fair_probabilities(odds: Sequence[Optional[Dict[str, Any]]], markets: Sequence[str] = MARKETS) -> np.ndarray:
+    """Margin-free probabilities (n_matches, n_markets) from decimal odds dicts."""
+    markets = list(markets)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        implied = 1.0 / _matrix(odds, markets)
+        overround = (1.0 / _matrix(odds, RESULT_MARKETS)).sum(axis=1)  # NaN if a 1X2 price is missing
+        fair = implied / overround[:, None]
+        for market, complement in COMPLEMENTS.items():
+            if market not in markets:
+                continue
+            col = markets.index(market)
+            pair = implied[:, col] + 1.0 / _matrix(odds, [complement])[:, 0]
+            quoted = np.isfinite(pair)
+            fair[quoted, col] = implied[quoted, col] / pair[quoted]
+    return fair
+
+
+def evaluate(
+    odds: Sequence[Optional[Dict[str, Any]]],
+    probabilities: Sequence[Optional[Dict[str, Any]]],
+    markets: Sequence[str] = MARKETS,
+    kelly_fraction: float = KELLY_FRACTION,
+    max_stake: float = MAX_STAKE,
+) -> Dict[str, np.ndarray]:
+    """
+    EV and stakes for every (match, market) pair.
+
+    Args:
+        odds: Per-match decimal odds dicts (MarketDataProvider.get_odds).
+        probabilities: Per-match model probability dicts (same keys).
+
+    Returns (n_matches, n_markets) arrays: odds, prob, fair_prob, edge, ev, stake.
+    """
+    markets = list(markets)
+    prices = _matrix(odds, markets)
+    probs = _matrix(probabilities, markets)
+    prices[prices <= 1.0] = np.nan
+    with np.errstate(invalid="ignore"):
+        ev = probs * prices - 1.0
+        kelly = ev / (prices - 1.0)
+    stake = np.clip(np.nan_to_num(kelly * kelly_fraction, nan=0.0), 0.0, max_stake)
+    fair = fair_probabilities(odds, markets)
+    return {
+        "odds": prices,
+        "prob": probs,
+        "fair_prob": fair,
+        "edge": probs - fair,
+        "ev": ev,
+        "stake": stake,
+    }
+
+
+def scan_card(
+    card: Sequence[Dict[str, Any]],
+    min_ev: float = MIN_EV,
+    markets: Sequence[str] = MARKETS,
+    **kwargs,
+) -> List[Dict[str, Any]]:
+    """
+    Value bets of a whole card, best EV first.
+
+    Args:
+        card: [{"match_id", "odds": {...}, "probs": {...}, "opening": {...} (optional)}, ...]
+        min_ev: Only selections with EV above this are returned.
+
+    With opening prices (OddsStore.opening), bets also carry opening_odds and
+    line_move (current / opening - 1: negative when the price shortened).
+    """
+    markets = list(markets)
+    result = evaluate([m.get("odds") for m in card], [m.get("probs") for m in card], markets, **kwargs)
+    opening = _matrix([m.get("opening") for m in card], markets)
+    with np.errstate(invalid="ignore"):
+        rows, cols = np.nonzero((result["ev"] > min_ev) & (result["stake"] > 0))
+    bets = [
+        {
+            "match_id": card[i].get("match_id"),
+            "market": markets[j],
+            "odds": float(result["odds"][i, j]),
+            "prob": round(float(result["prob"][i, j]), 4),
+            "fair_prob": round(float(result["fair_prob"][i, j]), 4),
+            "edge": round(float(result["edge"][i, j]), 4),
+            "ev": round(float(result["ev"][i, j]), 4),
+            "stake": round(float(result["stake"][i, j]), 4),
+        }
+        for i, j in zip(rows, cols)
+    ]
+    for bet, i, j in zip(bets, rows, cols):
+        if np.isfinite(opening[i, j]) and opening[i, j] > 1.0:
+            bet["opening_odds"] = float(opening[i, j])
+            bet["line_move"] = round(bet["odds"] / bet["opening_odds"] - 1.0, 4)
+    return sorted(bets, key=lambda bet: bet["ev"], reverse=True)
+
+
+def settle_market(market: str, home_goals, away_goals):
+    """
+    Whether a market won given the score (scalars or arrays of simulated
+    scores); None for a market it can't settle.
+    """
+    if market == "home_win":
+        return home_goals > away_goals
+    if market == "draw":
+        return home_goals == away_goals
+    if market == "away_win":
+        return home_goals < away_goals
+    if market == "btts_yes":
+        return (home_goals > 0) & (away_goals > 0)
+    if market == "btts_no":
+        return (home_goals == 0) | (away_goals == 0)
+    if market.startswith(("over_", "under_")):
+        side, _, line = market.partition("_")
+        total = home_goals + away_goals
+        threshold = float(line.replace("_", "."))
+        return total > threshold if side == "over" else total < threshold
+    return None
+
+
+def stake_units(stake: float) -> int:
+    """Bankroll fraction -> 1-10 stake units."""
+    return int(min(10, max(1, round(stake / STAKE_UNIT))))
+
+
+def model_probabilities(prior: Optional[Dict[str, Any]], prediction: Optional[str] = None, confidence: Optional[float] = None) -> Dict[str, float]:
+    """
+    Model probabilities per market: the numeric prior, with the 1X2 block
+    re-anchored on the Orchestrator's verdict when given (predicted outcome =
+    confidence, the other two share the rest in the prior's proportions).
+    """
+    probs = {key: float(prior[key]) for key in MARKETS if prior and prior.get(key) is not None}
+    target = {"HOME": "home_win", "DRAW": "draw", "AWAY": "away_win"}.get(prediction or "")
+    if target is None or confidence is None:
+        return probs
+    others = [key for key in RESULT_MARKETS if key != target]
+    rest = sum(probs.get(key, 0.0) for key in others)
+    probs[target] = float(confidence)
+    for key in others:
+        probs[key] = (1.0 - confidence) * (probs.get(key, 0.0) / rest if rest else 0.5)
+    return probs
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in warm-up of providers and LLM clients.
+Pays the cold costs (HTTP session + TLS handshakes, soccerdata FBref reader
+construction, LLM client construction, first team-page downloads) before the
+first real query, so it runs at steady-state latency.
+
+Enabled with `neuralbet --warmup` / NEURALBET_WARMUP=1. Configuration:
+    NEURALBET_WARMUP_LEAGUES  Leagues whose FBref reader is built (default: PL)
+    NEURALBET_WATCHED_TEAMS   Teams whose Understat form is prefetched (comma-separated)
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENV = "NEURALBET_WARMUP"
+WARMUP_LEAGUES_ENV = "NEURALBET_WARMUP_LEAGUES"
+WATCHED_TEAMS_ENV = "NEURALBET_WATCHED_TEAMS"
+
+# Agent roles whose LLM clients are built (and cached by LLMFactory)
+WARMUP_LLM_ROLES = ("dispatcher", "metrician", "tactician", "psych", "x_factor", "devils_advocate", "orchestrator")
+
+
+def warmup_enabled() -> bool:
+    return os.getenv(WARMUP_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+def _env_list(key: str, default: str = "") -> List[str]:
+    return [item.strip() for item in os.getenv(key, default).split(",") if item.strip()]
+
+
+async def _open_session(get_session: Callable, url: str) -> None:
+    """Create the pooled session and complete one TLS handshake (connection kept alive)."""
+    session = await get_session()
+    async with session.head(url, allow_redirects=True) as response:
+        await response.release()
+
+
+def _build_llm_clients(roles: Iterable[str]) -> None:
+    from src.core.llm import LLMFactory
+    for role in roles:
+        LLMFactory.create(role)
+
+
+async def warm_up(
+    provider,
+    news_provider=None,
+    leagues: Optional[Iterable[str]] = None,
+    watched_teams: Optional[Iterable[str]] = None,
+    llm_roles: Iterable[str] = WARMUP_LLM_ROLES,
+) -> Dict[str, Any]:
+    """
+    Run all warm-up steps concurrently. Never raises: each step reports
+    "ok" or its error, plus the elapsed time.
+
+    Args:
+        provider: NeuralBetProvider (its Understat session and FBRef readers are warmed).
+        news_provider: Optional news provider with a `_get_session()` to pre-open.
+        leagues: League codes for the FBref readers (default: NEURALBET_WARMUP_LEAGUES or PL).
+        watched_teams: Teams to prefetch (default: NEURALBET_WATCHED_TEAMS).
+        llm_roles: Agent roles whose LLM clients are constructed.
+    """
+    leagues = list(leagues) if leagues is not None else _env_list(WARMUP_LEAGUES_ENV, "PL")
+    watched_teams = list(watched_teams) if watched_teams is not None else _env_list(WATCHED_TEAMS_ENV)
+
+    steps: Dict[str, Any] = {
+        "understat_session": _open_session(provider.understat._get_session, provider.understat.base_url),
+    }
+    if news_provider is not None and hasattr(news_provider, "_get_session"):
+        steps["news_session"] = _open_session(news_provider._get_session, news_provider.base_url)
+    for league in leagues:
+        steps[f"fbref_reader:{league}"] = asyncio.to_thread(provider.fbref._get_fbref_instance, league)
+    for team in watched_teams:
+        steps[f"team_form:{team}"] = provider.understat.get_team_form(team)
+    if llm_roles:
+        steps["llm_clients"] = asyncio.to_thread(_build_llm_clients, llm_roles)
+
+    async def timed(name: str, step) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = await step
+            status = result["error"] if isinstance(result, dict) and "error" in result else "ok"
+        except Exception as e:
+            status = f"{type(e).__name__}: {e}"
+        elapsed_ms = round((time.perf_counter() - started) * 1000)
+        if status != "ok":
+            logger.warning(f"Warm-up step {name} failed: {status}")
+        return {"step": name, "status": status, "elapsed_ms": elapsed_ms}
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(timed(name, step) for name, step in steps.items()))
+    report = {
+        "steps": results,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        "failed": [r["step"] for r in results if r["status"] != "ok"],
+    }
+    logger.info(f"Warm-up done in {report['elapsed_ms']} ms ({len(results) - len(report['failed'])}/{len(results)} steps ok)")
+    return report
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+"""
+NEURAL BET: Daemon
+Long-running local HTTP/JSON service. Providers, caches, LLM clients and the
+agent graph are built once and shared by every analysis.
+
+Endpoints (localhost only by default):
+    POST /dispatch            {"query": "Arsenal vs Liverpool demain"} -> DispatcherOutput
+    POST /analyse             {"match_id": "..."} or {"query": "..."}  -> 202 {"job_id", ...}
+                              (+ "refresh": true to re-collect the data; unchanged agents are reused)
+    GET  /status/{job_id}     Job state, progress events, verdict and errors
+    GET  /stream/{job_id}     Server-Sent Events: progress events until the job ends
+    POST /cancel/{job_id}     Cancel a queued or running job
+    GET  /health              Service status (jobs running/queued)
+
+Usage:
+    neuralbet-daemon --port 8790 --warmup
+    curl -X POST localhost:8790/analyse -d '{"query": "Arsenal vs Liverpool"}'
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from src.pipeline import AnalysisPipeline, build_agents
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DAEMON_PORT = 8790
+MAX_KEPT_JOBS = 500  # Finished jobs kept for /status before the oldest are dropped
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+
+def to_jsonable(value: Any) -> Any:
+    """Pydantic reports, dicts and lists -> JSON-compatible values."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class AnalysisJob:
+    """One submitted analysis and its progress."""
+
+    def __init__(self, match_id: str, refresh: bool = False):
+        self.id = uuid.uuid4().hex[:12]
+        self.match_id = match_id
+        self.refresh = refresh
+        self.state = JOB_QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.errors: List[str] = []
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def add_event(self, event: str, stage: str, detail: Optional[str] = None) -> None:
+        self.events.append({"ts": time.time(), "event": event, "stage": stage, "detail": detail})
+        # Wake every current waiter; later waiters get a fresh event
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def set_state(self, state: str) -> None:
+        self.state = state
+        if state == JOB_RUNNING:
+            self.started_at = time.time()
+        elif state in FINISHED_STATES:
+            self.finished_at = time.time()
+        self.add_event(state, "job")
+
+    async def wait_change(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def as_dict(self, with_events: bool = True) -> Dict[str, Any]:
+        payload = {
+            "job_id": self.id,
+            "match_id": self.match_id,
+            "state": self.state,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "errors": self.errors,
+        }
+        if with_events:
+            payload["events"] = self.events
+        return payload
+
+
+class NeuralBetDaemon:
+    """
+    Local analysis service.
+
+    Args:
+        provider / news_provider: Shared data providers (default: NeuralBetProvider + news from env).
+        agents: Prebuilt agent graph (default: built once on first analysis).
+        dispatcher: Prebuilt DispatcherAgent (default: built on first /dispatch).
+        max_runs: Analyses running at once; others wait queued (NEURALBET_MAX_RUNS, default 3).
+        checkpoints: Optional CheckpointStore; a re-submitted analysis resumes from its last completed stage.
+
+    Usage:
+        async with NeuralBetDaemon(port=8790) as daemon:
+            ...
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_DAEMON_PORT,
+        provider=None,
+        news_provider=None,
+        agents: Optional[Dict[str, Any]] = None,
+        dispatcher=None,
+        max_runs: Optional[int] = None,
+        checkpoints=None,
+    ):
+        self.host = host
+        self.port = port
+        self.provider = provider
+        self.news_provider = news_provider
+        self.agents = agents
+        self.dispatcher = dispatcher
+        self.max_runs = max_runs or max(1, int(os.getenv("NEURALBET_MAX_RUNS", "3")))
+        self.checkpoints = checkpoints
+        self.jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._owns_providers = provider is None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def __aenter__(self) -> "NeuralBetDaemon":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    # --- Shared resources (built once) ---
+
+    def _get_providers(self):
+        if self.provider is None:
+            from src.providers.neural_bet_provider import NeuralBetProvider
+            self.provider = NeuralBetProvider()
+        if self.news_provider is None:
+            from src.core.news_provider import MockNewsProvider
+            from src.providers.google_news_provider import GoogleNewsProvider
+            self.news_provider = GoogleNewsProvider() if os.getenv("NEWS_API_KEY") else MockNewsProvider()
+        return self.provider, self.news_provider
+
+    def _get_agents(self) -> Dict[str, Any]:
+        if self.agents is None:
+            self.agents = build_agents(*self._get_providers())
+        return self.agents
+
+    def _get_dispatcher(self):
+        if self.dispatcher is None:
+            from src.agents.dispatcher import DispatcherAgent
+            self.dispatcher = DispatcherAgent()
+        return self.dispatcher
+
+    # --- Lifecycle ---
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/dispatch", self._dispatch)
+        app.router.add_post("/analyse", self._analyse)
+        app.router.add_get("/status/{job_id}", self._status)
+        app.router.add_get("/stream/{job_id}", self._stream)
+        app.router.add_post("/cancel/{job_id}", self._cancel)
+        app.router.add_get("/health", self._health)
+        return app
+
+    async def start(self) -> str:
+        """Start listening and return the base URL."""
+        self._slots = asyncio.Semaphore(self.max_runs)
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self._runner.addresses:
+            self.port = self._runner.addresses[0][1]
+        logger.info(f"NeuralBet daemon listening on {self.base_url}")
+        return self.base_url
+
+    async def stop(self) -> None:
+        for job in self.jobs.values():
+            if job.task and not job.task.done():
+                job.task.cancel()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._owns_providers and self.provider is not None:
+            await self.provider.close()
+
+    # --- Jobs ---
+
+    def submit(self, match_id: str, refresh: bool = False) -> AnalysisJob:
+        """Queue an analysis (an identical match still in flight is reused)."""
+        for job in self.jobs.values():
+            if job.match_id == match_id and job.state not in FINISHED_STATES:
+                return job
+        job = AnalysisJob(match_id, refresh)
+        self.jobs[job.id] = job
+        self._prune()
+        job.task = asyncio.create_task(self._run_job(job))
+        return job
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.state in FINISHED_STATES]
+        for job_id in finished[:max(0, len(self.jobs) - MAX_KEPT_JOBS)]:
+            del self.jobs[job_id]
+
+    async def _run_job(self, job: AnalysisJob) -> None:
+        try:
+            async with self._slots:
+                job.set_state(JOB_RUNNING)
+                pipeline = AnalysisPipeline(
+                    agents=self._get_agents(), on_event=job.add_event, checkpoints=self.checkpoints
+                )
+                state = await pipeline.run(job.match_id, refresh=job.refresh)
+            job.result = to_jsonable(state.analysis_reports)
+            job.errors = list(state.errors)
+            job.set_state(JOB_DONE)
+        except asyncio.CancelledError:
+            job.set_state(JOB_CANCELLED)
+            raise
+        except Exception as e:
+            logger.error(f"Analysis {job.id} ({job.match_id}) failed: {e}")
+            job.errors.append(str(e))
+            job.set_state(JOB_FAILED)
+
+    # --- Handlers ---
+
+    @staticmethod
+    async def _json_body(request: web.Request) -> Dict[str, Any]:
+        try:
+            body = await request.json()
+        except Exception:
+            raise web.HTTPBadRequest(text=json.dumps({"error": "Body must be a JSON object"}), content_type="application/json")
+        if not isinstance(body, dict):
+            raise web.HTTPBadRequest(text=json.dumps({"error": "Body must be a JSON object"}), content_type="application/json")
+        return body
+
+    def _job_or_404(self, request: web.Request) -> AnalysisJob:
+        job = self.jobs.get(request.match_info["job_id"])
+        if job is None:
+            raise web.HTTPNotFound(text=json.dumps({"error": "Unknown job"}), content_type="application/json")
+        return job
+
+    async def _dispatch(self, request: web.Request) -> web.Response:
+        body = await self._json_body(request)
+        query = (body.get("query") or "").strip()
+        if not query:
+            return web.json_response({"error": "Missing 'query'"}, status=400)
+        result = await self._get_dispatcher().run(query)
+        return web.json_response(to_jsonable(result))
+
+    async def _analyse(self, request: web.Request) -> web.Response:
+        body = await self._json_body(request)
+        match_id = body.get("match_id")
+        dispatch = None
+        if not match_id:
+            query = (body.get("query") or "").strip()
+            if not query:
+                return web.json_response({"error": "Provide 'match_id' or 'query'"}, status=400)
+            dispatch = await self._get_dispatcher().run(query)
+            if not dispatch.match_found:
+                return web.json_response({"error": "Match not found", "dispatch": to_jsonable(dispatch)}, status=404)
+            match_id = dispatch.match_id
+
+        job = self.submit(match_id, refresh=bool(body.get("refresh")))
+        payload = {
+            "job_id": job.id,
+            "match_id": job.match_id,
+            "state": job.state,
+            "status_url": f"/status/{job.id}",
+            "stream_url": f"/stream/{job.id}",
+        }
+        if dispatch is not None:
+            payload["dispatch"] = to_jsonable(dispatch)
+        return web.json_response(payload, status=202)
+
+    async def _status(self, request: web.Request) -> web.Response:
+        return web.json_response(self._job_or_404(request).as_dict())
+
+    async def _cancel(self, request: web.Request) -> web.Response:
+        job = self._job_or_404(request)
+        if job.task and not job.task.done():
+            job.task.cancel()
+        return web.json_response({"job_id": job.id, "state": job.state})
+
+    async def _stream(self, request: web.Request) -> web.StreamResponse:
+        """Server-Sent Events: replays past events, then follows the job until it ends."""
+        job = self._job_or_404(request)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        sent = 0
+        while True:
+            while sent < len(job.events):
+                await response.write(f"data: {json.dumps(job.events[sent])}\n\n".encode("utf-8"))
+                sent += 1
+            if job.state in FINISHED_STATES:
+                break
+            await job.wait_change(timeout=15)
+            if sent == len(job.events):
+                await response.write(b": keep-alive\n\n")
+
+        await response.write(f"event: end\ndata: {json.dumps(job.as_dict(with_events=False))}\n\n".encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    async def _health(self, request: web.Request) -> web.Response:
+        states = [job.state for job in self.jobs.values()]
+        return web.json_response({
+            "status": "ok",
+            "running": states.count(JOB_RUNNING),
+            "queued": states.count(JOB_QUEUED),
+            "jobs": len(states),
+            "max_runs": self.max_runs,
+        })
+
+
+async def _serve_forever(daemon: NeuralBetDaemon, warmup: bool = False) -> None:
+    from src.core.fixture_calendar import get_fixture_calendar
+    from src.core.market_provider import get_market_provider
+    from src.providers.polling_market_provider import PollingMarketProvider
+
+    await daemon.start()
+    print(f"NeuralBet daemon ready on {daemon.base_url} (Ctrl+C to stop)")
+    if warmup:
+        from src.core.warmup import warm_up
+        await warm_up(*daemon._get_providers())
+        daemon._get_agents()
+    # Keep the watched teams' next fixtures polled in the background (re-read every poll cycle)
+    market = get_market_provider()
+    if isinstance(market, PollingMarketProvider):
+        market.watch_teams(get_fixture_calendar())
+        await market.start()
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        if isinstance(market, PollingMarketProvider):
+            await market.close()
+        await daemon.stop()
+
+
+def main() -> None:
+    from dotenv import load_dotenv
+    from src.core.checkpoints import get_checkpoint_store
+    from src.core.warmup import warmup_enabled
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="NeuralBet local analysis daemon")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("NEURALBET_DAEMON_PORT", DEFAULT_DAEMON_PORT)))
+    parser.add_argument("--max-runs", type=int, default=None, help="Analyses running at once")
+    parser.add_argument("--warmup", action="store_true", help="Warm up providers, LLM clients and agents at start")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    daemon = NeuralBetDaemon(
+        host=args.host, port=args.port, max_runs=args.max_runs, checkpoints=get_checkpoint_store()
+    )
+    try:
+        asyncio.run(_serve_forever(daemon, warmup=args.warmup or warmup_enabled()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
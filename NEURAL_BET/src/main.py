@@ -2,11 +2,18 @@
 """
 NEURAL BET: Main Pipeline Entry Point
 Refactored with proper resource management and circuit breaker pattern.
+
+Batch mode (durable job queue, checkpointed runs):
+    neuralbet-pipeline --batch MATCH_ID [MATCH_ID ...]   enqueue, then drain the queue
+    neuralbet-pipeline --resume                          drain jobs left by a previous run
+    neuralbet-pipeline --batch ... --refresh             re-collect data; only agents whose inputs changed re-run
 """
+import argparse
 import asyncio
 import logging
 import sys
 import os
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 # Ensure root
@@ -24,6 +31,10 @@ from src.providers.google_news_provider import GoogleNewsProvider
 from src.core.news_provider import MockNewsProvider
 from src.core.config import validate_api_keys
 from src.core.exceptions import ConfigurationError, CriticalAgentError
+from src.core.warmup import warm_up, warmup_enabled
+from src.core.checkpoints import get_checkpoint_store
+from src.core.jobs import JobQueue, JOB_FAILED
+from src.pipeline import AnalysisPipeline
 
 # Load Env
 load_dotenv()
@@ -35,6 +46,40 @@ logging.basicConfig(
 logger = logging.getLogger("main")
 
 
+def validate_config():
+    """Validate API keys at startup - FAIL FAST if missing."""
+    try:
+        config_status = validate_api_keys(raise_on_missing=True)
+        logger.info(f"✅ API Keys validated: {', '.join(config_status['present'])}")
+        if config_status['optional_missing']:
+            logger.warning(f"⚠️ Optional keys missing: {', '.join(config_status['optional_missing'])}")
+    except ConfigurationError as e:
+        logger.error(f"❌ Configuration Error: {e}")
+        raise  # Fail fast - don't silently continue
+
+
+def create_news_provider():
+    if os.getenv("NEWS_API_KEY"):
+        return GoogleNewsProvider()
+    logger.warning("⚠️ NEWS_API_KEY missing. Using Mock News.")
+    return MockNewsProvider()
+
+
+def print_report(state: AgentState):
+    print("\n" + "="*50)
+    print("      NEURAL BET - FINAL REPORT      ")
+    print("="*50)
+    print(f"Match: {state.match_id}")
+    
+    if "orchestrator_final" in state.analysis_reports:
+        print(f"\n--- 🧠 THE ORACLE VERDICT ---\n{state.analysis_reports['orchestrator_final']}")
+    
+    if state.errors:
+        print(f"\n--- ⚠️ WARNINGS ({len(state.errors)}) ---")
+        for err in state.errors:
+            print(f"  • {err}")
+
+
 async def main():
     """
     Main pipeline with:
@@ -45,14 +90,7 @@ async def main():
     logger.info("🚀 NEURAL BET: Running Full Pipeline")
     
     # 1. Validate API keys at startup - FAIL FAST if missing
-    try:
-        config_status = validate_api_keys(raise_on_missing=True)
-        logger.info(f"✅ API Keys validated: {', '.join(config_status['present'])}")
-        if config_status['optional_missing']:
-            logger.warning(f"⚠️ Optional keys missing: {', '.join(config_status['optional_missing'])}")
-    except ConfigurationError as e:
-        logger.error(f"❌ Configuration Error: {e}")
-        raise  # Fail fast - don't silently continue
+    validate_config()
     
     # 2. Initialize State
     initial_state = AgentState(
@@ -64,11 +102,11 @@ async def main():
     async with NeuralBetProvider() as provider:
         
         # Setup news provider
-        if os.getenv("NEWS_API_KEY"):
-            news_provider = GoogleNewsProvider()
-        else:
-            logger.warning("⚠️ NEWS_API_KEY missing. Using Mock News.")
-            news_provider = MockNewsProvider()
+        news_provider = create_news_provider()
+        
+        # Optional warm-up (NEURALBET_WARMUP=1): sessions, FBref readers, LLM clients
+        if warmup_enabled():
+            await warm_up(provider, news_provider)
         
         # Instantiate Agents
         miner = DataMinerAgent(provider=provider)
@@ -111,22 +149,106 @@ async def main():
         state = await orchestrator.execute(state)
         
         # --- FINAL OUTPUT ---
-        print("\n" + "="*50)
-        print("      NEURAL BET - FINAL REPORT      ")
-        print("="*50)
-        
-        if "orchestrator_final" in state.analysis_reports:
-            print(f"\n--- 🧠 THE ORACLE VERDICT ---\n{state.analysis_reports['orchestrator_final']}")
-        
-        if state.errors:
-            print(f"\n--- ⚠️ WARNINGS ({len(state.errors)}) ---")
-            for err in state.errors:
-                print(f"  • {err}")
+        print_report(state)
         
         logger.info("✅ Pipeline completed successfully")
     
     # Session automatically closed by context manager
 
 
+async def drain_queue(queue: JobQueue, pipeline_factory, max_runs: int = 3, refresh: bool = False) -> Dict[str, int]:
+    """
+    Run queued jobs with up to max_runs concurrent analyses until the queue is empty.
+    A degraded or failed run is re-queued (until max_attempts) after a
+    back-off and resumes from its checkpoints, so only the failed agents run
+    again. Running jobs keep their lease renewed so another batch process
+    doesn't recover them. With refresh, each job's first attempt re-collects
+    the match data.
+    """
+    async def heartbeat(job_id: int):
+        while True:
+            await asyncio.sleep(queue.lease / 3)
+            queue.heartbeat(job_id)
+
+    async def worker():
+        while True:
+            job = queue.claim()
+            if job is None:
+                wait = queue.next_due()
+                if wait is None:
+                    return
+                await asyncio.sleep(wait)  # a failed job backing off
+                continue
+            match_id = job["match_id"]
+            logger.info(f"▶️ Job {job['id']} {match_id} (attempt {job['attempts']})")
+            lease = asyncio.create_task(heartbeat(job["id"]))
+            try:
+                state = await pipeline_factory().run(match_id, refresh=refresh and job["attempts"] == 1)
+            except Exception as e:
+                status = queue.fail(job["id"], str(e))
+                logger.error(f"❌ Job {job['id']} {match_id} failed ({status}): {e}")
+                continue
+            finally:
+                lease.cancel()
+            if state.errors:
+                status = queue.fail(job["id"], "; ".join(state.errors))
+                logger.warning(f"⚠️ Job {job['id']} {match_id} degraded ({status}): {len(state.errors)} error(s)")
+                if status == JOB_FAILED:
+                    print_report(state)
+            else:
+                queue.complete(job["id"])
+                print_report(state)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, max_runs))))
+    return queue.counts()
+
+
+async def run_batch(
+    match_ids: List[str], max_runs: int = 3, queue: Optional[JobQueue] = None, refresh: bool = False
+) -> Dict[str, int]:
+    """Enqueue match ids (plus any interrupted jobs) and drain the durable queue."""
+    validate_config()
+    queue = queue or JobQueue()
+    queue.recover()
+    for match_id in match_ids:
+        queue.enqueue(match_id)
+    
+    async with NeuralBetProvider() as provider:
+        news_provider = create_news_provider()
+        if warmup_enabled():
+            await warm_up(provider, news_provider)
+        
+        checkpoints = get_checkpoint_store()
+        counts = await drain_queue(
+            queue,
+            lambda: AnalysisPipeline(provider, news_provider, checkpoints=checkpoints),
+            max_runs,
+            refresh,
+        )
+    logger.info(f"✅ Batch finished: {counts}")
+    return counts
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="neuralbet-pipeline", description="NEURAL BET headless pipeline")
+    parser.add_argument("--batch", nargs="+", metavar="MATCH_ID", help="Enqueue matches and run the job queue")
+    parser.add_argument("--resume", action="store_true", help="Run the jobs left in the queue")
+    parser.add_argument("--refresh", action="store_true", help="Re-collect match data (unchanged agents are reused)")
+    parser.add_argument("--max-runs", type=int, default=int(os.getenv("NEURALBET_MAX_RUNS", "3")))
+    parser.add_argument("--warmup", action="store_true", help="Warm up providers and LLM clients first")
+    return parser.parse_args(argv)
+
+
+async def run(argv: Optional[List[str]] = None):
+    """Dispatch to the single demo run or the batch/job-queue mode."""
+    args = parse_args(argv)
+    if args.warmup:
+        os.environ["NEURALBET_WARMUP"] = "1"
+    if args.batch or args.resume:
+        await run_batch(args.batch or [], args.max_runs, refresh=args.refresh)
+    else:
+        await main()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(run())
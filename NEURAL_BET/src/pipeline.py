@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+NEURAL BET: Analysis Pipeline
+The agent graph shared by the front-ends:
+DataMiner -> (Metrician | Tactician | Psych | X-Factor) -> Devil's Advocate -> Orchestrator.
+
+Progress is reported through an optional on_event(event, stage, detail) callback
+so the TUI (or any other caller) can render it without owning the graph.
+Stages are the graph steps (data_miner, swarm, devils_advocate, orchestrator);
+swarm agents also report individually under their agent key (metrician, ...).
+Cancelling the task running `run()` cancels the in-flight LLM calls.
+
+With a CheckpointStore, the DataMiner state is checkpointed (keyed by
+match_id + input hash) and every other agent's output is stored under a
+fingerprint of its own inputs (BaseAgent.collect_inputs). A re-run resumes
+from the collected data and only re-runs the agents that failed or whose
+inputs changed; `run(match_id, refresh=True)` re-collects the data first.
+Restored agents report EVENT_DONE with the detail CHECKPOINT_DETAIL.
+`completed(match_id)` tells a re-analysis (same day, nothing failed) from a
+resume, so user-initiated runs can pass refresh=completed(match_id).
+"""
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+from src.core.data_provider import MatchDataProvider
+from src.core.news_provider import NewsDataProvider
+
+if TYPE_CHECKING:  # Agents (pydantic, LangChain) load on first run, not at import
+    from src.agents.base import AgentState, BaseAgent
+    from src.core.checkpoints import CheckpointStore
+
+logger = logging.getLogger(__name__)
+
+# Stage names reported to on_event
+STAGE_DATA = "data_miner"
+STAGE_SWARM = "swarm"
+STAGE_DEVIL = "devils_advocate"
+STAGE_ORCHESTRATOR = "orchestrator"
+
+# Events
+EVENT_STARTED = "started"
+EVENT_DONE = "done"
+EVENT_FAILED = "failed"
+
+# Detail of the EVENT_DONE reported for a stage restored from a checkpoint
+CHECKPOINT_DETAIL = "checkpoint"
+
+# Checkpoint row marking a run that finished without errors (never emitted)
+STAGE_COMPLETE = "complete"
+
+SWARM_AGENTS = ("metrician", "tactician", "psych", "xfactor")
+
+EventCallback = Callable[[str, str, Optional[str]], None]
+
+
+def build_agents(provider: MatchDataProvider, news_provider: NewsDataProvider) -> Dict[str, "BaseAgent"]:
+    """Instantiate the agents of the graph (imports deferred: they load the LLM SDKs)."""
+    from src.agents.data_miner import DataMinerAgent
+    from src.agents.metrician import MetricianAgent
+    from src.agents.tactician import TacticianAgent
+    from src.agents.psych import PsychAgent
+    from src.agents.x_factor import XFactorAgent
+    from src.agents.devils_advocate import DevilsAdvocateAgent
+    from src.agents.orchestrator import OrchestratorAgent
+
+    return {
+        "data_miner": DataMinerAgent(provider=provider),
+        "metrician": MetricianAgent(),
+        "tactician": TacticianAgent(),
+        "psych": PsychAgent(news_provider=news_provider),
+        "xfactor": XFactorAgent(),
+        "devils_advocate": DevilsAdvocateAgent(),
+        "orchestrator": OrchestratorAgent(),
+    }
+
+
+class AnalysisPipeline:
+    """
+    One analysis run over the agent graph.
+
+    Usage:
+        pipeline = AnalysisPipeline(provider, news_provider, on_event=print)
+        state = await pipeline.run("Arsenal_Liverpool_2026-02-04_PL")
+    """
+
+    def __init__(
+        self,
+        provider: Optional[MatchDataProvider] = None,
+        news_provider: Optional[NewsDataProvider] = None,
+        on_event: Optional[EventCallback] = None,
+        agents: Optional[Dict[str, "BaseAgent"]] = None,
+        checkpoints: Optional["CheckpointStore"] = None,
+    ):
+        self.agents = agents if agents is not None else build_agents(provider, news_provider)
+        self.on_event = on_event
+        self.checkpoints = checkpoints
+        self._match_id: Optional[str] = None
+        self._input_hash: Optional[str] = None
+        self.reused: set = set()  # stages/agents restored instead of run (last run)
+
+    def _emit(self, event: str, stage: str, detail: Optional[str] = None) -> None:
+        if self.on_event:
+            try:
+                self.on_event(event, stage, detail)
+            except Exception as e:
+                logger.warning(f"Pipeline event handler failed: {e}")
+
+    async def _run_agent(self, key: str, state: "AgentState") -> "AgentState":
+        """Execute one agent, reporting degraded runs (errors appended) as failures."""
+        self._emit(EVENT_STARTED, key)
+        known_errors = len(state.errors)
+        try:
+            result = await self.agents[key].execute(state)
+        except Exception as e:
+            self._emit(EVENT_FAILED, key, str(e))
+            raise
+        if len(result.errors) > known_errors:
+            self._emit(EVENT_FAILED, key, result.errors[-1])
+        else:
+            self._emit(EVENT_DONE, key)
+        return result
+
+    def _restore(self, stage: str) -> Optional["AgentState"]:
+        """Checkpointed state of a stage (reported as done), or None."""
+        if self.checkpoints is None:
+            return None
+        state = self.checkpoints.load(self._match_id, self._input_hash, stage)
+        if state is not None:
+            logger.info(f"Resuming {self._match_id}: {stage} restored from checkpoint")
+            self.reused.add(stage)
+            self._emit(EVENT_DONE, stage, CHECKPOINT_DETAIL)
+        return state
+
+    def _checkpoint(self, stage: str, state: "AgentState", input_hash: Optional[str] = None) -> None:
+        """Store a stage's state, unless it degraded (so a retry re-runs it)."""
+        if self.checkpoints is None or state.errors:
+            return
+        try:
+            self.checkpoints.save(self._match_id, input_hash or self._input_hash, stage, state)
+        except Exception as e:
+            logger.warning(f"Checkpoint {self._match_id}/{stage} not saved: {e}")
+
+    async def _run_incremental(self, key: str, state: "AgentState") -> "AgentState":
+        """
+        Run an agent, or reuse its stored output when its inputs are unchanged.
+        Only the reports the agent wrote are stored, so reusing one agent's
+        output never rolls back another's.
+        """
+        from src.agents.base import AgentState
+        agent = self.agents[key]
+        fingerprint = None
+        if self.checkpoints is not None:
+            try:
+                from src.core.checkpoints import fingerprint_inputs
+                fingerprint = fingerprint_inputs(agent, await agent.collect_inputs(state))
+            except Exception as e:
+                logger.warning(f"Inputs of {key} not fingerprinted, running it: {e}")
+
+        if fingerprint is not None:
+            stored = self.checkpoints.load(self._match_id, fingerprint, key)
+            if stored is not None:
+                logger.info(f"{self._match_id}: {key} inputs unchanged, output reused")
+                self.reused.add(key)
+                self._emit(EVENT_DONE, key, CHECKPOINT_DETAIL)
+                return state.model_copy(update={
+                    "analysis_reports": {**state.analysis_reports, **stored.analysis_reports},
+                    "errors": list(state.errors),
+                })
+
+        before = dict(state.analysis_reports)
+        known_errors = len(state.errors)
+        result = await self._run_agent(key, state)
+        if fingerprint is not None and len(result.errors) == known_errors:
+            written = {k: v for k, v in result.analysis_reports.items() if before.get(k) != v}
+            self._checkpoint(key, AgentState(match_id=self._match_id, analysis_reports=written), fingerprint)
+        return result
+
+    async def _run_isolated(self, key: str, base_state: "AgentState") -> "AgentState":
+        """Run a swarm agent on its own copy of the shared inputs."""
+        from src.agents.base import AgentState
+        isolated_state = AgentState(
+            match_id=base_state.match_id,
+            match_data=base_state.match_data,
+            market_data=base_state.market_data,
+            analysis_reports={},
+            errors=[]
+        )
+        return await self._run_incremental(key, isolated_state)
+
+    async def run(self, match_id: str, refresh: bool = False) -> "AgentState":
+        """
+        Execute the full graph for a match.
+        Raises if the DataMiner fails (circuit breaker); later stages degrade
+        into state.errors instead of stopping the run.
+
+        Args:
+            refresh: Re-collect the match data even if checkpointed (re-analysis
+                     near kickoff); agents whose inputs didn't change are still reused.
+        """
+        from src.agents.base import AgentState
+        self._match_id = match_id
+        self.reused = set()
+        if self.checkpoints is not None:
+            from src.core.checkpoints import compute_input_hash
+            self._input_hash = compute_input_hash(match_id, self.agents)
+
+        # --- STAGE 1: Data Mining (circuit breaker) ---
+        state = None if refresh else self._restore(STAGE_DATA)
+        if state is None:
+            state = await self._run_agent(STAGE_DATA, AgentState(match_id=match_id, analysis_reports={}))
+            self._checkpoint(STAGE_DATA, state)
+
+        # --- STAGE 2: Parallel analysis ---
+        self._emit(EVENT_STARTED, STAGE_SWARM)
+        swarm = [name for name in SWARM_AGENTS if name in self.agents]
+        results = await asyncio.gather(
+            *(self._run_isolated(name, state) for name in swarm),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                state.errors.append(str(result))
+            elif isinstance(result, AgentState):
+                state.analysis_reports.update(result.analysis_reports)
+                state.errors.extend(result.errors)
+        self._emit(EVENT_DONE, STAGE_SWARM)
+
+        # --- STAGE 3 & 4: Devil's Advocate, then Orchestrator ---
+        for stage in (STAGE_DEVIL, STAGE_ORCHESTRATOR):
+            try:
+                state = await self._run_incremental(stage, state)
+            except Exception as e:
+                state.errors.append(str(e))
+
+        if not state.errors:
+            self._checkpoint(STAGE_COMPLETE, AgentState(match_id=match_id))
+        return state
+
+    def completed(self, match_id: str) -> bool:
+        """True when today's run of this match already finished without errors."""
+        if self.checkpoints is None:
+            return False
+        from src.core.checkpoints import compute_input_hash
+        try:
+            return STAGE_COMPLETE in self.checkpoints.stages(match_id, compute_input_hash(match_id, self.agents))
+        except Exception as e:
+            logger.warning(f"Checkpoints of {match_id} unreadable: {e}")
+            return False
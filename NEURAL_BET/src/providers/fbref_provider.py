@@ -4,17 +4,23 @@ FBRef Provider using soccerdata library.
 Handles anti-bot protections automatically via the maintained soccerdata package.
 """
 import asyncio
+import os
 from typing import Dict, Any, Optional
 from src.core.data_provider import MatchDataProvider
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_FBREF_BASE_URL = "https://fbref.com"
+
 
 class FBRefProvider(MatchDataProvider):
     """
     Provider for FBRef stats using soccerdata library.
     soccerdata handles headers, sessions, and rate limiting properly.
+
+    The site root can be redirected (e.g. to the local replay server)
+    with base_url or FBREF_BASE_URL.
     """
     
     LEAGUE_MAP = {
@@ -26,8 +32,9 @@ class FBRefProvider(MatchDataProvider):
         "CHAMPIONSHIP": "ENG-Championship",
     }
     
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None):
         self._fbref_cache: Dict[str, Any] = {}
+        self.base_url = (base_url or os.getenv("FBREF_BASE_URL") or DEFAULT_FBREF_BASE_URL).rstrip("/")
     
     def _get_fbref_instance(self, league: str, season: str = "2024"):
         """
@@ -36,6 +43,11 @@ class FBRefProvider(MatchDataProvider):
         """
         import soccerdata as sd
         
+        if self.base_url != DEFAULT_FBREF_BASE_URL:
+            # soccerdata reads its site root from this module global at request time
+            import soccerdata.fbref as sd_fbref
+            sd_fbref.FBREF_API = self.base_url
+        
         cache_key = f"{league}_{season}"
         if cache_key not in self._fbref_cache:
             league_code = self.LEAGUE_MAP.get(league, self.LEAGUE_MAP["PL"])
@@ -136,6 +148,39 @@ class FBRefProvider(MatchDataProvider):
         
         return await loop.run_in_executor(None, fetch_schedule)
 
+    async def get_league_schedule(self, league: str = "PL") -> Dict[str, Any]:
+        """
+        Get the full season schedule of a league as plain dicts
+        (used to build the local fixture calendar).
+        """
+        loop = asyncio.get_event_loop()
+        
+        def fetch_league_schedule():
+            try:
+                import pandas as pd
+                fb = self._get_fbref_instance(league)
+                
+                schedule = fb.read_schedule()
+                fixtures = []
+                for _, row in schedule.iterrows():
+                    if pd.isna(row.get('date')) or not row.get('home_team') or not row.get('away_team'):
+                        continue
+                    fixtures.append({
+                        "home": str(row['home_team']),
+                        "away": str(row['away_team']),
+                        "date": pd.Timestamp(row['date']).strftime("%Y-%m-%d"),
+                        "time": str(row.get('time') or ""),
+                        "league": league,
+                    })
+                
+                return {"source": "FBRef (soccerdata)", "league": league, "fixtures": fixtures}
+                
+            except Exception as e:
+                logger.error(f"FBRef league schedule fetch failed: {e}")
+                return {"error": f"FBRef Schedule Error: {str(e)}"}
+        
+        return await loop.run_in_executor(None, fetch_league_schedule)
+
     async def get_match_stats(self, match_id: str) -> Optional[Dict[str, Any]]:
         """
         FBRef match stats require match-specific URLs.
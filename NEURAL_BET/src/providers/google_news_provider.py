@@ -1,19 +1,51 @@
 # -*- coding: utf-8 -*-
+from src.core.cache import TTLCache
 from src.core.news_provider import NewsDataProvider
+from src.core.quota import DailyQuota
 from typing import List, Dict, Any, Optional
+import logging
 import os
 import aiohttp
 
+logger = logging.getLogger(__name__)
+
+NEWS_TTL = int(os.getenv("NEURALBET_NEWS_TTL", "1800"))  # seconds
+NEWS_DAILY_QUOTA = int(os.getenv("NEURALBET_NEWS_DAILY_QUOTA", "100"))  # NewsAPI free tier
+
+# Shared by every GoogleNewsProvider: the same club is fetched once per TTL
+_news_cache = TTLCache(default_ttl=NEWS_TTL)
+_news_quota: Optional[DailyQuota] = None
+
+
+def get_news_quota() -> DailyQuota:
+    global _news_quota
+    if _news_quota is None:
+        _news_quota = DailyQuota("newsapi", NEWS_DAILY_QUOTA)
+    return _news_quota
+
+
+def _is_valid(articles: List[Dict[str, Any]]) -> bool:
+    return not any("error" in art for art in articles)
+
+
 class GoogleNewsProvider(NewsDataProvider):
     """
     Real implementation using NewsAPI.
-    Optimized with persistent aiohttp.ClientSession.
+    Optimized with persistent aiohttp.ClientSession, a shared TTL cache
+    (concurrent requests for a team share one call) and a per-day quota.
     """
-    
-    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        cache: Optional[TTLCache] = None,
+        quota: Optional[DailyQuota] = None,
+    ):
         self.api_key = os.getenv("NEWS_API_KEY")
         self.base_url = "https://newsapi.org/v2/everything"
         self._session = session
+        self.cache = cache or _news_cache
+        self.quota = quota or get_news_quota()
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
@@ -23,7 +55,18 @@ class GoogleNewsProvider(NewsDataProvider):
     async def get_team_news(self, team_name: str) -> List[Dict[str, Any]]:
         if not self.api_key:
              return [{"title": "News API Key missing", "source": "System", "sentiment": "neutral"}]
-             
+
+        return await self.cache.get_or_set(
+            f"news:{team_name.strip().lower()}",
+            lambda: self._fetch_team_news(team_name),
+            cache_if=_is_valid,
+        )
+
+    async def _fetch_team_news(self, team_name: str) -> List[Dict[str, Any]]:
+        if not self.quota.try_consume():
+            logger.warning(f"NewsAPI daily quota reached ({self.quota.limit}), skipping news for {team_name}")
+            return [{"error": "NewsAPI daily quota reached"}]
+
         try:
             session = await self._get_session()
             params = {
@@ -34,12 +77,14 @@ class GoogleNewsProvider(NewsDataProvider):
                 "apiKey": self.api_key
             }
             async with session.get(self.base_url, params=params) as response:
+                if response.status == 429:
+                    self.quota.exhaust()
                 if response.status != 200:
                     return [{"error": f"API Error {response.status}"}]
-                    
+
                 data = await response.json()
                 articles = data.get("articles", [])
-                
+
                 results = []
                 for art in articles:
                     results.append({
@@ -48,10 +93,10 @@ class GoogleNewsProvider(NewsDataProvider):
                         "date": art.get("publishedAt")
                     })
                 return results
-                    
+
         except Exception as e:
             return [{"error": str(e)}]
-    
+
     async def close(self):
         if self._session and not self._session.closed:
             await self._session.close()
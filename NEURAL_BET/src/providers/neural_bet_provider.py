@@ -3,6 +3,7 @@ from typing import Dict, Any, Optional
 from src.core.data_provider import MatchDataProvider
 from src.providers.understat_provider import UnderstatProvider
 from src.providers.fbref_provider import FBRefProvider
+from src.core.team_names import parse_match_id, teams_match
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,23 +40,20 @@ class NeuralBetProvider(MatchDataProvider):
 
     async def get_match_stats(self, match_id: str) -> Optional[Dict[str, Any]]:
         # Format: "HomeTeam_AwayTeam_Date_League"
-        # e.g. "Arsenal_Liverpool_2026_PL"
+        # e.g. "Arsenal_Liverpool_2026_PL", "Manchester_City_Aston_Villa_2026-02-04_PL"
         # Defaults to PL if not specified.
         
         try:
-            parts = match_id.split("_")
-            if len(parts) < 2:
+            parts = parse_match_id(match_id)
+            if parts is None:
                 return {"error": "Invalid Match ID format. Use Home_Away[_Date_League]"}
             
-            home_team = parts[0]
-            away_team = parts[1]
-            # Try to grab league from last part if it matches standard codes
-            # This is a basic heuristic for MVP
+            home_team = parts.home
+            away_team = parts.away
+            # League from the last part if it matches standard codes
             league_code = "PL"
-            if len(parts) >= 4:
-                possible_league = parts[3].upper()
-                if possible_league in ["PL", "LIGA", "SERIE_A", "BUNDESLIGA", "L1"]:
-                   league_code = possible_league
+            if parts.league and parts.league.upper() in ["PL", "LIGA", "SERIE_A", "BUNDESLIGA", "L1"]:
+                league_code = parts.league.upper()
             
             # Parallel Fetch
             # 1. Understat Form (Understat usually manages leagues internally or we might need to add league arg there too later)
@@ -69,6 +67,10 @@ class NeuralBetProvider(MatchDataProvider):
             results = await asyncio.gather(home_us_task, away_us_task, home_fb_task, away_fb_task, return_exceptions=True)
             
             home_us, away_us, home_fb, away_fb = results
+
+            # Rolling features of the pages just read (no extra request)
+            home_ft = await self._features_table(home_team, home_us)
+            away_ft = await self._features_table(away_team, away_us)
             
             # Construct the Rich Data Object
             return {
@@ -78,10 +80,12 @@ class NeuralBetProvider(MatchDataProvider):
                 "stats": {
                     "home": {
                         "understat_form": home_us if not isinstance(home_us, Exception) else "Error",
+                        "understat_features": home_ft,
                         "fbref_stats": home_fb if not isinstance(home_fb, Exception) else "Error"
                     },
                     "away": {
                         "understat_form": away_us if not isinstance(away_us, Exception) else "Error",
+                        "understat_features": away_ft,
                         "fbref_stats": away_fb if not isinstance(away_fb, Exception) else "Error"
                     }
                 },
@@ -96,6 +100,16 @@ class NeuralBetProvider(MatchDataProvider):
     async def get_team_form(self, team_id: str, last_n: int = 5) -> Dict[str, Any]:
         return await self.understat.get_team_form(team_id, last_n)
 
+    async def _features_table(self, team_name: str, form: Any) -> Optional[Dict[str, Any]]:
+        """3/5/10/season x all/home/away features of a team whose form was just read, else None."""
+        if not isinstance(form, dict) or "error" in form:
+            return None
+        try:
+            return (await self.understat.get_team_features(team_name)).table()
+        except Exception as e:
+            logger.warning(f"Understat features unavailable for {team_name}: {e}")
+            return None
+
     async def find_next_match(self, team_name: str, opponent_name: Optional[str] = None, date_hint: Optional[str] = None) -> Dict[str, Any]:
         """
         Dispatcher V3 (Real Verification):
@@ -120,9 +134,7 @@ class NeuralBetProvider(MatchDataProvider):
             
             is_opponent_match = True
             if opponent_name:
-                t1 = opponent_name.lower().replace("fc", "").strip()
-                t2 = scraped_opponent.lower().replace("fc", "").strip()
-                is_opponent_match = (t1 in t2) or (t2 in t1)
+                is_opponent_match = teams_match(opponent_name, scraped_opponent)
             
             if is_opponent_match:
                 return {
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Polling odds provider.
+A background task polls the odds feed for every watched fixture in bulk
+(one request per batch of match ids) and keeps the latest prices in memory,
+so get_odds answers without a network call. Only prices that changed since
+the previous poll are appended to the odds history (src/core/odds_store.py).
+
+A fixture asked for before it is watched is fetched once, then watched.
+Each poll cycle drops the fixtures whose match day has passed (or, for ids
+without a date, that nobody asked for in WATCH_IDLE_TTL) and re-reads the
+watched teams' next fixtures from the fixture calendar.
+The feed URL comes from NEURALBET_ODDS_FEED_URL; the local stand-in is
+src/replay/odds_feed_server.py.
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+import aiohttp
+
+from src.core.market_provider import MarketDataProvider
+from src.core.odds_store import OddsStore
+from src.core.team_names import parse_match_id
+from src.core.warmup import WATCHED_TEAMS_ENV
+
+logger = logging.getLogger(__name__)
+
+ODDS_FEED_URL_ENV = "NEURALBET_ODDS_FEED_URL"
+POLL_INTERVAL_ENV = "NEURALBET_ODDS_POLL_INTERVAL"
+DEFAULT_POLL_INTERVAL = 60.0  # seconds
+BATCH_SIZE = 100  # match ids per feed request
+FEED_TIMEOUT = aiohttp.ClientTimeout(total=15)
+WATCH_IDLE_TTL = 24 * 3600  # seconds an undated fixture stays watched after its last request
+
+
+class PollingMarketProvider(MarketDataProvider):
+    """
+    MarketDataProvider served from memory, refreshed by a polling loop.
+
+    Usage:
+        async with PollingMarketProvider(watch=["Arsenal_Liverpool"]) as market:
+            odds = await market.get_odds("Arsenal_Liverpool")
+    """
+
+    bookmaker = "feed"
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        interval: Optional[float] = None,
+        watch: Iterable[str] = (),
+        session: Optional[aiohttp.ClientSession] = None,
+        store: Optional[OddsStore] = None,
+        batch_size: int = BATCH_SIZE,
+    ):
+        self.base_url = (base_url or os.getenv(ODDS_FEED_URL_ENV) or "").rstrip("/")
+        self.interval = interval if interval is not None else float(os.getenv(POLL_INTERVAL_ENV, DEFAULT_POLL_INTERVAL))
+        self.batch_size = batch_size
+        self.store = store
+        self._session = session
+        self._owns_session = session is None
+        self._watched: Dict[str, float] = dict.fromkeys(watch, time.time())  # match id -> last watched/asked
+        self._calendar = None  # set by watch_teams, re-read every poll cycle
+        self._teams: Optional[List[str]] = None
+        self._odds: Dict[str, Dict[str, float]] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"polls": 0, "requests": 0, "errors": 0, "changed_prices": 0, "misses": 0}
+
+    async def __aenter__(self) -> "PollingMarketProvider":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if not self._session or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=FEED_TIMEOUT)
+            self._owns_session = True
+        return self._session
+
+    async def start(self) -> None:
+        """Start the polling loop (first poll runs immediately)."""
+        if not self.base_url:
+            logger.warning(f"{ODDS_FEED_URL_ENV} not set - odds polling disabled")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop())
+
+    async def close(self) -> None:
+        """Stop polling and close the session if we own it. Safe to call multiple times."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._owns_session and self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    # --- Watch list ---
+
+    def watch(self, match_ids: Iterable[str]) -> None:
+        now = time.time()
+        for match_id in match_ids:
+            self._watched[match_id] = now
+
+    def unwatch(self, match_ids: Iterable[str]) -> None:
+        for match_id in match_ids:
+            self._watched.pop(match_id, None)
+            self._odds.pop(match_id, None)
+            self._updated_at.pop(match_id, None)
+
+    def watch_teams(self, calendar, teams: Optional[Iterable[str]] = None, today: Optional[str] = None) -> List[str]:
+        """
+        Watch the next fixture of each team (default: NEURALBET_WATCHED_TEAMS)
+        from the fixture calendar; the poll loop repeats it every cycle, so
+        the next matchday is picked up once the current one is played.
+        """
+        if teams is None:
+            teams = [team.strip() for team in os.getenv(WATCHED_TEAMS_ENV, "").split(",") if team.strip()]
+        self._calendar, self._teams = calendar, list(teams)
+        match_ids = []
+        for team in teams:
+            fixture = calendar.find(team, today=today)
+            if fixture:
+                match_ids.append(fixture["match_id"])
+        self.watch(match_ids)
+        return match_ids
+
+    @property
+    def watched(self) -> List[str]:
+        return list(self._watched)
+
+    def prune(self, now: Optional[float] = None) -> List[str]:
+        """Unwatch the fixtures already played (or idle, when undated); returns them."""
+        now = now if now is not None else time.time()
+        today = date.fromtimestamp(now).isoformat()
+        expired = []
+        for match_id, watched_at in self._watched.items():
+            parts = parse_match_id(match_id)
+            match_day = parts.date if parts and parts.date and len(parts.date) == 10 else None
+            if (match_day and match_day < today) or (not match_day and now - watched_at > WATCH_IDLE_TTL):
+                expired.append(match_id)
+        self.unwatch(expired)
+        if expired:
+            logger.info(f"Odds polling: {len(expired)} past or idle fixture(s) unwatched")
+        return expired
+
+    def refresh_watch(self, now: Optional[float] = None) -> None:
+        """Drop the expired fixtures, then re-read the watched teams' next fixtures."""
+        now = now if now is not None else time.time()
+        self.prune(now)
+        if self._calendar is not None:
+            self.watch_teams(self._calendar, self._teams, today=date.fromtimestamp(now).isoformat())
+
+    # --- Polling ---
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                self.refresh_watch()
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Odds poll failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _fetch(self, match_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        """One bulk feed request; {} on HTTP/network errors."""
+        session = await self._get_session()
+        self.stats["requests"] += 1
+        try:
+            async with session.get(f"{self.base_url}/odds", params={"match_ids": ",".join(match_ids)}) as response:
+                if response.status != 200:
+                    self.stats["errors"] += 1
+                    logger.warning(f"Odds feed returned HTTP {response.status}")
+                    return {}
+                payload = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Odds feed unreachable: {e}")
+            return {}
+        return payload.get("odds") or {}
+
+    async def poll_once(self, match_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Fetch the watched fixtures (or match_ids) in batches, concurrently.
+        Returns the number of prices that changed (new prices included).
+        """
+        match_ids = list(match_ids) if match_ids is not None else self.watched
+        if not match_ids or not self.base_url:
+            return 0
+        self.stats["polls"] += 1
+        batches = [match_ids[i:i + self.batch_size] for i in range(0, len(match_ids), self.batch_size)]
+        results = await asyncio.gather(*(self._fetch(batch) for batch in batches))
+        now = time.time()
+        changed = 0
+        for snapshot in results:
+            for match_id, odds in snapshot.items():
+                changed += self._apply(match_id, odds, now)
+        self.stats["changed_prices"] += changed
+        return changed
+
+    def _apply(self, match_id: str, odds: Dict[str, Any], timestamp: float) -> int:
+        """Merge a snapshot into memory; record only the changed prices."""
+        current = self._odds.setdefault(match_id, {})
+        delta = {
+            market: float(price)
+            for market, price in (odds or {}).items()
+            if isinstance(price, (int, float)) and current.get(market) != float(price)
+        }
+        self._updated_at[match_id] = timestamp
+        if not delta:
+            return 0
+        current.update(delta)
+        if self.store is not None:
+            self.store.record(match_id, delta, bookmaker=self.bookmaker, timestamp=timestamp)
+        return len(delta)
+
+    # --- MarketDataProvider ---
+
+    async def get_odds(self, match_id: str) -> Optional[Dict[str, float]]:
+        """Latest polled prices; an unknown fixture is fetched once and watched from then on."""
+        if match_id not in self._odds:
+            self.stats["misses"] += 1
+            self.watch([match_id])
+            await self.poll_once([match_id])
+        elif match_id in self._watched:
+            self._watched[match_id] = time.time()  # still asked for: not idle
+        odds = self._odds.get(match_id)
+        return dict(odds) if odds else None
+
+    def updated_at(self, match_id: str) -> Optional[float]:
+        """Time of the last poll that returned this fixture."""
+        return self._updated_at.get(match_id)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental extractor for the JSON datasets embedded in Understat pages.
+
+Understat ships its data as `var datesData = JSON.parse('<hex-escaped JSON>')`
+script statements. The extractor scans raw response chunks with plain byte
+searches (no regex over the full HTML), so callers can stop reading the
+response as soon as the datasets they need have been seen.
+"""
+import codecs
+import json
+from typing import Any, Dict, Iterable, Optional
+
+_PARSE_MARKER = b"JSON.parse('"
+_VAR_KEYWORD = b"var "
+# Bytes kept between chunks so a marker split across two chunks is still found
+_CARRY_BYTES = 96
+
+DATES_DATA = "datesData"
+PLAYERS_DATA = "playersData"
+STATISTICS_DATA = "statisticsData"
+TEAM_PAGE_DATASETS = (DATES_DATA, STATISTICS_DATA, PLAYERS_DATA)
+
+
+def decode_blob(raw: bytes) -> Any:
+    """Decode one embedded dataset (escape sequences + JSON) in a single pass."""
+    return json.loads(codecs.escape_decode(raw)[0].decode("utf-8"))
+
+
+class UnderstatPageExtractor:
+    """
+    Feed response chunks in order; raw dataset bytes are collected as they
+    are found. Every dataset met before the stop point is kept, not only
+    the wanted ones.
+
+    Usage:
+        extractor = UnderstatPageExtractor(wanted=["datesData"])
+        async for chunk in response.content.iter_chunked(16384):
+            if extractor.feed(chunk):
+                break
+        page = UnderstatTeamPage("Arsenal", 2025, extractor.raw)
+    """
+
+    def __init__(self, wanted: Iterable[str] = (DATES_DATA,)):
+        self.wanted = frozenset(wanted)
+        self.raw: Dict[str, bytes] = {}
+        self._buffer = bytearray()
+
+    @property
+    def done(self) -> bool:
+        """True once every wanted dataset has been extracted."""
+        return self.wanted.issubset(self.raw)
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume a chunk. Returns True when reading can stop."""
+        self._buffer += chunk
+        pos = 0
+        while True:
+            start = self._buffer.find(_PARSE_MARKER, pos)
+            if start == -1:
+                # Keep a small tail in case the next marker straddles chunks
+                keep_from = max(pos, len(self._buffer) - _CARRY_BYTES)
+                break
+
+            body_start = start + len(_PARSE_MARKER)
+            # Quotes inside the payload are always escaped (\x27), so the
+            # first raw quote closes the string.
+            body_end = self._buffer.find(b"'", body_start)
+            if body_end == -1:
+                # Incomplete block: keep its declaration for the next chunk
+                keep_from = max(pos, start - _CARRY_BYTES)
+                break
+
+            name = self._variable_name(start)
+            if name:
+                self.raw[name] = bytes(self._buffer[body_start:body_end])
+            pos = body_end + 1
+
+        del self._buffer[:keep_from]
+        return self.done
+
+    def _variable_name(self, marker_pos: int) -> Optional[str]:
+        """Name of the `var <name> =` statement preceding a JSON.parse marker."""
+        var_pos = self._buffer.rfind(_VAR_KEYWORD, max(0, marker_pos - _CARRY_BYTES), marker_pos)
+        if var_pos == -1:
+            return None
+        declaration = bytes(self._buffer[var_pos + len(_VAR_KEYWORD):marker_pos])
+        name = declaration.split(b"=", 1)[0].strip()
+        return name.decode("ascii", errors="ignore") or None
+
+
+class UnderstatTeamPage:
+    """
+    Datasets extracted from one team/season page, decoded lazily.
+    Kept by UnderstatProvider so later calls reuse them instead of
+    downloading the page again.
+    """
+
+    def __init__(self, team: str, season: int, raw: Optional[Dict[str, bytes]] = None):
+        self.team = team
+        self.season = season
+        self.raw: Dict[str, bytes] = dict(raw or {})
+        self._decoded: Dict[str, Any] = {}
+
+    def has(self, names: Iterable[str]) -> bool:
+        return all(name in self.raw for name in names)
+
+    def merge(self, raw: Dict[str, bytes]) -> None:
+        for name, blob in raw.items():
+            self.raw[name] = blob
+            self._decoded.pop(name, None)
+
+    def dataset(self, name: str) -> Optional[Any]:
+        """Decoded dataset (memoized), or None if it was not extracted."""
+        if name not in self._decoded:
+            raw = self.raw.get(name)
+            if raw is None:
+                return None
+            self._decoded[name] = decode_blob(raw)
+        return self._decoded[name]
+
+    @property
+    def dates(self) -> list:
+        return self.dataset(DATES_DATA) or []
+
+    @property
+    def players(self) -> list:
+        return self.dataset(PLAYERS_DATA) or []
+
+    @property
+    def statistics(self) -> dict:
+        return self.dataset(STATISTICS_DATA) or {}
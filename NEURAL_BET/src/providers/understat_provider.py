@@ -1,13 +1,29 @@
 # -*- coding: utf-8 -*-
 import asyncio
+import os
 import aiohttp
 from understat import Understat
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from src.core.data_provider import MatchDataProvider
+from src.core.exceptions import DataProviderError
+from src.core.features import TeamFeatures
+from src.core.ratings import RatingTable, get_rating_table
+from src.providers.understat_extractor import (
+    DATES_DATA,
+    PLAYERS_DATA,
+    STATISTICS_DATA,
+    UnderstatPageExtractor,
+    UnderstatTeamPage,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_UNDERSTAT_BASE_URL = "https://understat.com"
+TEAM_PAGE_TTL = 300  # seconds
+FORM_SEASON = 2024  # season read by get_team_form
+STREAM_CHUNK_SIZE = 16 * 1024
+
 
 class UnderstatProvider(MatchDataProvider):
     """
@@ -17,12 +33,27 @@ class UnderstatProvider(MatchDataProvider):
     Usage:
         async with UnderstatProvider() as provider:
             data = await provider.get_team_form("Arsenal")
+
+    The site root can be redirected (e.g. to the local replay server in
+    src/replay/understat_server.py) with base_url or UNDERSTAT_BASE_URL.
+
+    Results read from team pages feed the team rating table (src/core/ratings.py)
+    and the team's rolling features (src/core/features.py).
     """
     
-    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        base_url: Optional[str] = None,
+        ratings: Optional[RatingTable] = None,
+    ):
         self._session = session
         self._owns_session = session is None  # Track if we created the session
         self.understat = None
+        self.base_url = (base_url or os.getenv("UNDERSTAT_BASE_URL") or DEFAULT_UNDERSTAT_BASE_URL).rstrip("/")
+        # (team, season) -> (UnderstatTeamPage, expiry)
+        self._pages: Dict[Tuple[str, int], Tuple[UnderstatTeamPage, float]] = {}
+        self.ratings = ratings if ratings is not None else get_rating_table()
 
     async def __aenter__(self) -> "UnderstatProvider":
         """Async context manager entry."""
@@ -61,6 +92,98 @@ class UnderstatProvider(MatchDataProvider):
     async def get_match_stats(self, match_id: str) -> Optional[Dict[str, Any]]:
         return None 
 
+    def _team_url(self, team_name: str, season: int) -> str:
+        return f"{self.base_url}/team/{team_name.replace(' ', '_')}/{season}"
+
+    async def get_team_page(
+        self, team_name: str, season: int, datasets: Iterable[str] = (DATES_DATA,)
+    ) -> UnderstatTeamPage:
+        """
+        Return the embedded datasets of a team page, downloading it only if
+        the requested datasets are not already held (5 min TTL).
+
+        The response is streamed and reading stops as soon as the requested
+        datasets are found. Raises DataProviderError on HTTP errors (403/429...).
+        """
+        import time
+
+        key = (team_name, season)
+        datasets = tuple(datasets)
+        entry = self._pages.get(key)
+        if entry and entry[1] > time.time():
+            page = entry[0]
+            if page.has(datasets):
+                return page
+        else:
+            page = UnderstatTeamPage(team_name, season)
+
+        session = await self._get_session()
+        extractor = UnderstatPageExtractor(wanted=datasets)
+        async with session.get(self._team_url(team_name, season)) as response:
+            if response.status != 200:
+                raise DataProviderError(
+                    f"Understat returned HTTP {response.status} for {team_name} ({season})",
+                    provider="understat",
+                    code=f"HTTP_{response.status}",
+                    details={"team": team_name, "season": season, "status": response.status},
+                )
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                if extractor.feed(chunk):
+                    break
+
+        page.merge(extractor.raw)
+        self._pages[key] = (page, time.time() + TEAM_PAGE_TTL)
+        if DATES_DATA in extractor.raw:
+            await self._ingest(team_name, season, page)
+        return page
+
+    async def get_team_dates(self, team_name: str, season: int) -> List[Dict[str, Any]]:
+        """Return the raw datesData list (results AND fixtures) of a team page."""
+        page = await self.get_team_page(team_name, season)
+        return page.dates
+
+    @staticmethod
+    def _results(dates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Played datesData entries as rating-table results."""
+        results = []
+        for game in dates:
+            if not game.get("isResult"):
+                continue
+            try:
+                results.append({
+                    "match_id": f"understat:{game['id']}",
+                    "date": game.get("datetime"),
+                    "home": game["h"]["title"],
+                    "away": game["a"]["title"],
+                    "home_goals": int(game["goals"]["h"]),
+                    "away_goals": int(game["goals"]["a"]),
+                    "home_xg": float(game["xG"]["h"]),
+                    "away_xg": float(game["xG"]["a"]),
+                })
+            except (KeyError, TypeError, ValueError):
+                continue
+        return results
+
+    async def get_team_players(self, team_name: str, season: int) -> List[Dict[str, Any]]:
+        """Return the playersData list of a team page (reuses a held page when possible)."""
+        page = await self.get_team_page(team_name, season, (PLAYERS_DATA,))
+        return page.players
+
+    async def get_team_statistics(self, team_name: str, season: int) -> Dict[str, Any]:
+        """Return the statisticsData dict of a team page (reuses a held page when possible)."""
+        page = await self.get_team_page(team_name, season, (STATISTICS_DATA,))
+        return page.statistics
+
+    @staticmethod
+    def _xg_pair(game: Dict[str, Any]) -> Tuple[float, float]:
+        """(xG for, xG against) of a team-page entry, seen from the page's team."""
+        xg = game["xG"]
+        if isinstance(xg, dict):
+            side = game.get("side", "h")
+            other = "a" if side == "h" else "h"
+            return float(xg[side]), float(xg[other])
+        return float(xg), float(game["xGA"])
+
     @property
     def _cached_get_team_form(self):
         """Lazy import to avoid circular imports."""
@@ -68,53 +191,65 @@ class UnderstatProvider(MatchDataProvider):
         return cached
 
     async def get_team_form(self, team_name: str, last_n: int = 5) -> Dict[str, Any]:
-        """Get team form with caching (5 min TTL)."""
-        # Check cache first via wrapper
+        """Get team form (any last_n is read from the team's rolling features)."""
         return await self._get_team_form_impl(team_name, last_n)
     
     async def _get_team_form_impl(self, team_name: str, last_n: int = 5) -> Dict[str, Any]:
         """Internal implementation of get_team_form."""
-        from src.core.cache import get_cache
-        
-        cache = get_cache()
-        cache_key = cache._make_key("understat_team_form", team_name, last_n)
-        
-        # Try cache
-        cached_result = await cache.get(cache_key)
-        if cached_result is not None:
-            return cached_result
-        
-        await self._get_session()
-        
         try:
-            data = await self.understat.get_team_results(team_name, 2024)
-            
-            if not data:
-                return {"error": f"No data for {team_name}"}
-
-            recent_games = data[-last_n:]
-            
-            total_xg = sum(float(g['xG']) for g in recent_games)
-            total_xga = sum(float(g['xGA']) for g in recent_games)
-            
-            result = {
-                "source": "Understat",
-                "team": team_name,
-                "matches_analyzed": len(recent_games),
-                "total_xg": round(total_xg, 2),
-                "total_xga": round(total_xga, 2),
-                "avg_xg": round(total_xg / len(recent_games), 2),
-                "avg_xga": round(total_xga / len(recent_games), 2),
-                "last_match_result": recent_games[-1]['result']
-            }
-            
-            # Cache successful result (5 min TTL)
-            await cache.set(cache_key, result, ttl=300)
-            return result
-            
+            features = await self.get_team_features(team_name, FORM_SEASON)
+            return features.form(last_n)
         except Exception as e:
             return {"error": str(e)}
 
+    async def get_team_features(self, team_name: str, season: int = FORM_SEASON) -> TeamFeatures:
+        """
+        Rolling xG / xGA / points / goal-difference features of a team
+        (computed when its page is ingested, 5 min TTL).
+        """
+        from src.core.cache import get_cache
+
+        cache = get_cache()
+        features = await cache.get(cache._make_key("understat_team_features", team_name, season))
+        if features is None:
+            page = await self.get_team_page(team_name, season)
+            features = await cache.get(cache._make_key("understat_team_features", team_name, season))
+            if features is None:  # page held from an earlier read, features expired
+                features = await self._ingest(team_name, season, page)
+        return features
+
+    async def _ingest(self, team_name: str, season: int, page: UnderstatTeamPage) -> TeamFeatures:
+        """Derive the rolling features and feed the rating table from a freshly read datesData."""
+        from src.core.cache import get_cache
+
+        played = [g for g in page.dates if g.get("isResult")]
+        features = TeamFeatures(team_name, [self._feature_row(g) for g in played])
+        cache = get_cache()
+        await cache.set(cache._make_key("understat_team_features", team_name, season), features, ttl=TEAM_PAGE_TTL)
+        if self.ratings is not None:
+            self.ratings.update(self._results(played))
+        return features
+
+    @classmethod
+    def _feature_row(cls, game: Dict[str, Any]) -> Dict[str, Any]:
+        """TeamFeatures row of a played team-page entry, seen from the page's team."""
+        xg, xga = cls._xg_pair(game)
+        side = game.get("side", "h")
+        goals = game.get("goals")
+        if isinstance(goals, dict):
+            scored, conceded = goals[side], goals["a" if side == "h" else "h"]
+        else:
+            scored, conceded = game.get("scored", 0), game.get("missed", 0)
+        return {
+            "date": game.get("datetime"),
+            "home": side == "h",
+            "xg": xg,
+            "xga": xga,
+            "goals": int(scored),
+            "goals_against": int(conceded),
+            "result": game.get("result"),
+        }
+
     async def get_next_fixture(self, team_name: str) -> Optional[Dict[str, Any]]:
         """
         Scrapes Understat team page to find the next scheduled match.
@@ -128,52 +263,28 @@ class UnderstatProvider(MatchDataProvider):
                 "id": "12345"
             }
         """
-        await self._get_session()
-        import re
-        import json
-        from datetime import datetime
-        
-        url = f"https://understat.com/team/{team_name.replace(' ', '_')}/2024" # 2024 covers 2024/2025 season usually? Or check year.
         # Understat year logic: 2024 starts Aug 2024. 2025 starts Aug 2025.
-        # Assuming current season is 2025 (user context says 2026-02-02).
-        # We might need to check multiple years if end of season.
-        # For now, let's try 2025 based on date.
-        
         # User date is Feb 2026 -> Season 2025/2026 -> Understat "2025".
         season_year = 2025 
-        url = f"https://understat.com/team/{team_name.replace(' ', '_')}/{season_year}"
         
         try:
-            async with self._session.get(url) as response:
-                if response.status != 200:
-                    return None
-                
-                html = await response.text()
-                
-                # Regex to find datesData
-                # var datesData = JSON.parse('...');
-                match = re.search(r"var datesData\s*=\s*JSON\.parse\('([^']+)'\)", html)
-                if match:
-                    json_str = match.group(1).encode('utf-8').decode('unicode_escape')
-                    fixtures = json.loads(json_str)
-                    
-                    # Filter for unplayed matches (isResult = False)
-                    upcoming = [f for f in fixtures if f.get('isResult') is False]
-                    
-                    if upcoming:
-                        # Sort by date just in case
-                        upcoming.sort(key=lambda x: x['datetime'])
-                        
-                        next_match = upcoming[0]
-                        opponent_name = next_match['a']['title'] if next_match['h']['title'] == team_name else next_match['h']['title']
-                        
-                        return {
-                            "date": next_match['datetime'].split(' ')[0], # YYYY-MM-DD
-                            "opponent": opponent_name,
-                            "home_away": next_match['side'],
-                            "id": next_match['id'],
-                            "competition": "PL" # Default to PL as Understat is PL centric in this scraping or we'd need to parse league from page
-                        }
+            fixtures = await self.get_team_dates(team_name, season_year)
+            # Earliest unplayed match (isResult = False) in a single pass
+            next_match = min(
+                (f for f in fixtures if f.get('isResult') is False),
+                key=lambda x: x['datetime'],
+                default=None,
+            )
+            if next_match:
+                opponent_name = next_match['a']['title'] if next_match['h']['title'] == team_name else next_match['h']['title']
+            
+                return {
+                    "date": next_match['datetime'].split(' ')[0], # YYYY-MM-DD
+                    "opponent": opponent_name,
+                    "home_away": next_match['side'],
+                    "id": next_match['id'],
+                    "competition": "PL" # Default to PL as Understat is PL centric in this scraping or we'd need to parse league from page
+                }
         except Exception as e:
             print(f"Understat Scrape Error: {e}")
             return None
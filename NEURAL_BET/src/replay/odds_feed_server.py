@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Local odds feed stand-in.
+Serves bulk odds snapshots the way a bookmaker/aggregator feed would, so
+PollingMarketProvider can be run and tested offline. Prices of unknown
+fixtures are derived from the match id (stable across runs) and drift
+between polls as a random walk.
+
+Usage:
+    python -m src.replay.odds_feed_server --port 8766 --change-rate 0.2
+
+    NEURALBET_ODDS_FEED_URL=http://127.0.0.1:8766 neuralbet
+
+API:
+    GET /odds?match_ids=A_B,C_D  ->  {"timestamp": ..., "odds": {"A_B": {"home_win": 2.1, ...}, ...}}
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from typing import Dict, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+FEED_MARKETS = ("home_win", "draw", "away_win", "over_2_5", "under_2_5", "btts_yes", "btts_no")
+FEED_MARGIN = 1.05  # bookmaker overround of the generated books
+MAX_MATCH_IDS = 200  # per request
+
+
+def generate_odds(match_id: str, margin: float = FEED_MARGIN) -> Dict[str, float]:
+    """Plausible book for a fixture, derived deterministically from its id."""
+    rng = random.Random(hashlib.sha256(match_id.encode()).hexdigest())
+    home = rng.uniform(0.25, 0.6)
+    draw = rng.uniform(0.2, 0.3)
+    away = max(0.05, 1.0 - home - draw)
+    over = rng.uniform(0.4, 0.65)
+    btts = rng.uniform(0.4, 0.65)
+    probs = {
+        "home_win": home, "draw": draw, "away_win": away,
+        "over_2_5": over, "under_2_5": 1.0 - over,
+        "btts_yes": btts, "btts_no": 1.0 - btts,
+    }
+    return {market: round(1.0 / (p * margin), 2) for market, p in probs.items()}
+
+
+class OddsFeedServer:
+    """
+    Minimal aiohttp odds feed.
+
+    Price movement:
+        change_rate: Probability that a given price moves between two polls.
+        step: Relative size of a move (0.03 = up to 3%).
+
+    Failure injection (like UnderstatReplayServer): latency, error_rate, error_status.
+
+    Usage:
+        async with OddsFeedServer(change_rate=0.1, seed=1) as feed:
+            provider = PollingMarketProvider(base_url=feed.base_url)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        change_rate: float = 0.0,
+        step: float = 0.03,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.change_rate = change_rate
+        self.step = step
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self._books: Dict[str, Dict[str, float]] = {}
+        self.stats: Dict[str, int] = {"requests": 0, "served": 0, "injected_errors": 0, "prices_moved": 0}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def __aenter__(self) -> "OddsFeedServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/odds", self._odds)
+        return app
+
+    async def start(self) -> str:
+        """Start listening and return the base URL."""
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self._runner.addresses:
+            self.port = self._runner.addresses[0][1]
+        logger.info(f"Odds feed listening on {self.base_url}")
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # --- Books ---
+
+    def set_odds(self, match_id: str, odds: Dict[str, float]) -> None:
+        """Pin the current prices of a fixture (tests, scripted line moves)."""
+        self._books.setdefault(match_id, generate_odds(match_id)).update(odds)
+
+    def book(self, match_id: str) -> Dict[str, float]:
+        """Current prices of a fixture, moved by the random walk since the last call."""
+        if match_id not in self._books:
+            self._books[match_id] = generate_odds(match_id)
+            return dict(self._books[match_id])
+        book = self._books[match_id]
+        if self.change_rate:
+            for market, price in book.items():
+                if self._rng.random() < self.change_rate:
+                    moved = price * (1.0 + self._rng.uniform(-self.step, self.step))
+                    book[market] = round(max(1.01, moved), 2)
+                    self.stats["prices_moved"] += 1
+        return dict(book)
+
+    # --- Handlers ---
+
+    async def _odds(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            return web.Response(status=self.error_status, text=f"Injected {self.error_status}")
+
+        match_ids = [m for m in request.query.get("match_ids", "").split(",") if m]
+        if len(match_ids) > MAX_MATCH_IDS:
+            return web.Response(status=400, text=f"At most {MAX_MATCH_IDS} match ids per request")
+        self.stats["served"] += 1
+        return web.json_response({"timestamp": time.time(), "odds": {m: self.book(m) for m in match_ids}})
+
+
+async def _serve_forever(server: OddsFeedServer) -> None:
+    await server.start()
+    print(f"Odds feed ready on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local odds feed stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--change-rate", type=float, default=0.1, help="Probability a price moves between polls")
+    parser.add_argument("--step", type=float, default=0.03, help="Max relative size of a move")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed latency per response (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected error")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = OddsFeedServer(
+        host=args.host,
+        port=args.port,
+        change_rate=args.change_rate,
+        step=args.step,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(_serve_forever(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Local Understat/FBRef replay server.
+Serves recorded team pages offline so providers can be benchmarked
+(rate limiting, pooling, caching) without hitting the real sites.
+
+Usage:
+    python -m src.replay.understat_server --port 8765 --latency 0.2 --error-rate 0.1 --error-status 429
+
+    UNDERSTAT_BASE_URL=http://127.0.0.1:8765 FBREF_BASE_URL=http://127.0.0.1:8765 neuralbet
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_DIR = Path(__file__).resolve().parent / "recordings"
+
+# Embedded datasets found on an Understat team page, in page order
+UNDERSTAT_DATASETS = ("datesData", "statisticsData", "playersData")
+
+# Characters Understat leaves unescaped inside JSON.parse('...') strings
+_SAFE_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .-_")
+
+
+def encode_understat_blob(data: Any) -> str:
+    """Encode a dataset the way Understat embeds it (hex-escaped JSON string)."""
+    raw = json.dumps(data, ensure_ascii=True, separators=(",", ":"))
+    return "".join(ch if ch in _SAFE_CHARS else f"\\x{ord(ch):02X}" for ch in raw)
+
+
+def render_team_page(recording: Dict[str, Any]) -> str:
+    """Render a recorded team season as an Understat-like HTML page."""
+    scripts = "\n".join(
+        f"<script>\n\tvar {name}\t= JSON.parse('{encode_understat_blob(recording.get(name, []))}');\n</script>"
+        for name in UNDERSTAT_DATASETS
+    )
+    return (
+        "<!DOCTYPE html>\n<html>\n<head><title>"
+        f"{recording.get('team', '')} xG | Understat</title></head>\n<body>\n"
+        f"<div class=\"page-wrapper\">{recording.get('team', '')} {recording.get('season', '')}</div>\n"
+        f"{scripts}\n</body>\n</html>\n"
+    )
+
+
+class UnderstatReplayServer:
+    """
+    Minimal aiohttp server replaying recorded Understat (and FBRef) responses.
+
+    Failure injection:
+        latency/jitter: Seconds added to every response.
+        error_rate: Probability of answering with error_status (403 or 429).
+        max_rps: Simple per-second request budget; excess requests get a 429.
+
+    Usage:
+        async with UnderstatReplayServer(latency=0.05) as server:
+            provider = UnderstatProvider(base_url=server.base_url)
+    """
+
+    def __init__(
+        self,
+        recordings_dir: Optional[Path] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        max_rps: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        self.recordings_dir = Path(recordings_dir) if recordings_dir else RECORDINGS_DIR
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_rps = max_rps
+        self._rng = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self._window_start = 0.0
+        self._window_count = 0
+        self._recordings: Dict[str, Dict[str, Any]] = {}
+        self.stats: Dict[str, int] = {"requests": 0, "served": 0, "injected_errors": 0, "rate_limited": 0, "not_found": 0}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def __aenter__(self) -> "UnderstatReplayServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._failure_middleware])
+        app.router.add_get("/team/{team}/{season}", self._team_page)
+        app.router.add_get("/team/{team}/{season}/{dataset}.json", self._team_dataset)
+        app.router.add_get("/{tail:.*}", self._fbref_page)
+        return app
+
+    async def start(self) -> str:
+        """Start listening and return the base URL."""
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Resolve the real port when an ephemeral one (0) was requested
+        if self._runner.addresses:
+            self.port = self._runner.addresses[0][1]
+        logger.info(f"Understat replay server listening on {self.base_url}")
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # --- Recordings ---
+
+    def _load_recording(self, team: str, season: str) -> Optional[Dict[str, Any]]:
+        key = f"{team}_{season}"
+        if key not in self._recordings:
+            path = self.recordings_dir / "understat" / f"{key}.json"
+            if not path.exists():
+                return None
+            self._recordings[key] = json.loads(path.read_text(encoding="utf-8"))
+        return self._recordings[key]
+
+    # --- Middleware ---
+
+    @web.middleware
+    async def _failure_middleware(self, request: web.Request, handler):
+        self.stats["requests"] += 1
+
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.max_rps:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            if self._window_count > self.max_rps:
+                self.stats["rate_limited"] += 1
+                return web.Response(status=429, text="Too Many Requests", headers={"Retry-After": "1"})
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            headers = {"Retry-After": "1"} if self.error_status == 429 else {}
+            return web.Response(status=self.error_status, text=f"Injected {self.error_status}", headers=headers)
+
+        response = await handler(request)
+        if response.status == 404:
+            self.stats["not_found"] += 1
+        else:
+            self.stats["served"] += 1
+        return response
+
+    # --- Handlers ---
+
+    async def _team_page(self, request: web.Request) -> web.Response:
+        recording = self._load_recording(request.match_info["team"], request.match_info["season"])
+        if recording is None:
+            return web.Response(status=404, text="Team not recorded")
+        return web.Response(text=render_team_page(recording), content_type="text/html")
+
+    async def _team_dataset(self, request: web.Request) -> web.Response:
+        recording = self._load_recording(request.match_info["team"], request.match_info["season"])
+        dataset = request.match_info["dataset"]
+        if recording is None:
+            return web.Response(status=404, text="Team not recorded")
+        if dataset == "results":
+            return web.json_response([r for r in recording.get("datesData", []) if r.get("isResult")])
+        if dataset not in UNDERSTAT_DATASETS:
+            return web.Response(status=404, text=f"Unknown dataset '{dataset}'")
+        return web.json_response(recording.get(dataset, []))
+
+    async def _fbref_page(self, request: web.Request) -> web.Response:
+        """Serve recorded FBRef HTML stored under recordings/fbref/<path>.html."""
+        tail = request.match_info["tail"].strip("/")
+        fbref_dir = (self.recordings_dir / "fbref").resolve()
+        path = (fbref_dir / f"{tail}.html").resolve()
+        if fbref_dir not in path.parents or not path.exists():
+            return web.Response(status=404, text="Page not recorded")
+        return web.Response(text=path.read_text(encoding="utf-8"), content_type="text/html")
+
+
+async def _serve_forever(server: UnderstatReplayServer) -> None:
+    await server.start()
+    print(f"Replay server ready on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Understat/FBRef replay server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--recordings", type=Path, default=None, help="Recordings directory")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed latency per response (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected error")
+    parser.add_argument("--error-status", type=int, default=429, choices=(403, 429))
+    parser.add_argument("--max-rps", type=float, default=None, help="Requests per second before 429")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = UnderstatReplayServer(
+        recordings_dir=args.recordings,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        max_rps=args.max_rps,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(_serve_forever(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
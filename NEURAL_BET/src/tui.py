@@ -17,24 +17,52 @@ root_dir = Path(__file__).resolve().parent.parent
 if str(root_dir) not in sys.path:
     sys.path.append(str(root_dir))
 
-from src.ui.widgets.dashboard_widgets import AgentSidebar, LogPanel
+from src.ui.widgets.dashboard_widgets import AgentSidebar, LogPanel, MatchRunPanel
+from src.ui.widgets.transcript import TranscriptLog
 
 # Imports des Agents et Providers
-from src.agents.base import AgentState
-from src.agents.data_miner import DataMinerAgent
-from src.agents.metrician import MetricianAgent
-from src.agents.tactician import TacticianAgent
-from src.agents.devils_advocate import DevilsAdvocateAgent
-from src.agents.orchestrator import OrchestratorAgent
-from src.agents.psych import PsychAgent
-from src.agents.x_factor import XFactorAgent
-# REMOVED: MarketAgent and ValueHunterAgent (deprecated)
-from src.providers.neural_bet_provider import NeuralBetProvider
-from src.providers.google_news_provider import GoogleNewsProvider
+from src.pipeline import (
+    AnalysisPipeline, CHECKPOINT_DETAIL, EVENT_STARTED, EVENT_DONE, EVENT_FAILED,
+    STAGE_DATA, STAGE_SWARM, STAGE_DEVIL, STAGE_ORCHESTRATOR,
+)
+# Providers/agents (aiohttp, soccerdata, LangChain) are imported on first use
+# or by the background warm-up, so the start screen paints with Textual only
 from src.core.news_provider import MockNewsProvider
 from src.core.exceptions import CriticalAgentError
+from src.core.prefetch import MatchPrefetcher
+from src.core.startup import report_time_to_interactive
+from src.core.warmup import warmup_enabled
 from datetime import datetime
 
+# Matchday command: "/batch Arsenal vs Chelsea; Real vs Barça" (or /journee)
+BATCH_COMMANDS = ("/batch", "/journee", "/journée")
+MAX_RUN_PANELS = 8  # Finished panels beyond this are removed from the grid
+
+# Heavy modules imported in a background thread once the start screen is painted
+WARM_IMPORTS = (
+    "src.providers.neural_bet_provider",
+    "src.providers.google_news_provider",
+    "src.agents.dispatcher",
+    "src.agents.data_miner",
+    "src.agents.metrician",
+    "src.agents.tactician",
+    "src.agents.psych",
+    "src.agents.x_factor",
+    "src.agents.devils_advocate",
+    "src.agents.orchestrator",
+    "langchain_mistralai",
+    "langchain_groq",
+    "langchain_openai",
+)
+
+# Agent label shown under the input while a pipeline stage runs
+STAGE_LABELS = {
+    STAGE_DATA: "Data Miner",
+    STAGE_SWARM: "The Swarm",
+    STAGE_DEVIL: "Devil's Advocate",
+    STAGE_ORCHESTRATOR: "Orchestrator",
+}
+
 class NeuralBetApp(App):
     CSS_PATH = "ui/styles.tcss"
     
@@ -42,6 +70,7 @@ class NeuralBetApp(App):
         ("ctrl+q", "quit", "Quit"),
         ("ctrl+d", "toggle_dark", "Dark/Light"),
         ("ctrl+p", "palette", "Palette"),
+        ("escape", "cancel_run", "Cancel analysis"),
     ]
     
     LOGO = r"""
@@ -77,11 +106,13 @@ class NeuralBetApp(App):
                 with Horizontal(id="header_row"):
                     yield Static("# En attente...", id="header_title")  # Titre dynamique
                     yield Static("NeuralBet  [dim]v1.0.0[/]", id="header_brand")  # Brand fixe
+
+                # Grille des analyses (une colonne par match, statut par agent)
+                yield Horizontal(id="runs_grid")
                 
                 # Zone de chat (pleine largeur, sans sidebar)
                 with Vertical(id="chat_area"):
-                    from textual.widgets import RichLog
-                    yield RichLog(id="chat_messages", wrap=True, highlight=True, markup=True)
+                    yield TranscriptLog(id="chat_messages", wrap=True, highlight=True, markup=True)
                     
                     # Zone d'input avec hint "assist"
                     with Container(id="input_wrapper"):
@@ -91,11 +122,55 @@ class NeuralBetApp(App):
                             yield Label("[#3a8fd9]Assist[/]", id="agent_label")
                 
                 # Footer avec vrais raccourcis
-                yield Static("[bold]ctrl+q[/] quit  [bold]ctrl+d[/] theme  [dim]ctrl+p[/] palette", id="footer_bar")
+                yield Static("[bold]ctrl+q[/] quit  [bold]ctrl+d[/] theme  [bold]esc[/] stop  [dim]ctrl+p[/] palette", id="footer_bar")
 
     def on_mount(self) -> None:
         self.query_one("#startup_input").focus()
         self._pending_match = None  # Store pending match for confirmation
+        self._prefetcher = None  # Created on first dispatch (needs the running loop)
+        # Analysis runs: match_id -> worker, at most NEURALBET_MAX_RUNS at once (others queue)
+        self._runs = {}
+        self._max_runs = max(1, int(os.getenv("NEURALBET_MAX_RUNS", "3")))
+        self._run_slots = asyncio.Semaphore(self._max_runs)
+        self._run_counter = 0
+        self.call_after_refresh(self._after_first_frame)
+
+    def _after_first_frame(self) -> None:
+        report_time_to_interactive()
+        self.run_worker(self._warm_imports, thread=True, group="warmup", exit_on_error=False)
+        if warmup_enabled():
+            self.run_worker(self._warm_up_providers(), group="warmup", exit_on_error=False)
+
+    async def _warm_up_providers(self) -> None:
+        """Opt-in (--warmup): open connections, build FBref readers and LLM clients before the first query."""
+        from src.core.warmup import warm_up
+        prefetcher = self._get_prefetcher()
+        await warm_up(prefetcher.provider, prefetcher.news)
+
+    def _warm_imports(self) -> None:
+        """Load agents, providers and LLM SDKs off the UI thread (the first query finds them ready)."""
+        import importlib
+        for module in WARM_IMPORTS:
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                self.log.warning(f"Warm-up import failed for {module}: {e}")
+
+    def _get_prefetcher(self) -> MatchPrefetcher:
+        """Shared prefetcher: stats/news of a proposed match are fetched while the user confirms."""
+        if self._prefetcher is None:
+            from src.providers.neural_bet_provider import NeuralBetProvider
+            from src.providers.google_news_provider import GoogleNewsProvider
+            news_provider = GoogleNewsProvider() if os.getenv("NEWS_API_KEY") else MockNewsProvider()
+            self._prefetcher = MatchPrefetcher(NeuralBetProvider(), news_provider)
+        return self._prefetcher
+
+    def _prefetch_enabled(self) -> bool:
+        return os.getenv("NEURALBET_PREFETCH", "1").lower() not in ("0", "false", "no")
+
+    def on_unmount(self) -> None:
+        if self._prefetcher:
+            self._prefetcher.cancel_all()
     
     def _update_agent_label(self, agent_name: str) -> None:
         """Update the agent label in the input area."""
@@ -152,36 +227,24 @@ class NeuralBetApp(App):
         ts = datetime.now().strftime("%H:%M:%S")
         chat.write(f"[dim]{ts}[/]  {msg}")
     
-    async def _generate_title(self, user_query: str) -> str:
-        """Generate a short match title using Groq LLM (ultra fast)."""
-        from src.core.llm import LLMFactory
-        
-        try:
-            llm = LLMFactory.get_groq_model("llama-3.1-8b-instant", temperature=0.0)
-            
-            prompt = f"""Extract the match title from this query. Return ONLY the match name in format "Team1 vs Team2".
-No explanation, no extra text, just the match name.
-
-Query: {user_query}
-Match:"""
-            
-            response = await llm.ainvoke(prompt)
-            title = response.content.strip()
-            
-            # Clean up common issues
-            title = title.replace('"', '').replace("'", "")
-            if len(title) > 50:  # Fallback if too long
-                title = title[:50] + "..."
-            
-            return title
-        except Exception as e:
-            # Fallback: extract from query directly
-            return user_query[:40] if len(user_query) > 40 else user_query
-    
     def _update_header(self, match_name: str) -> None:
         """Update header title with match name."""
         self.query_one("#header_title").update(f"# {match_name}")
 
+    def _update_header_from_dispatch(self, dispatch_result, command: str) -> None:
+        """Header title from the dispatcher entities (no extra LLM call)."""
+        if dispatch_result.home and dispatch_result.away:
+            self._update_header(f"{dispatch_result.home} vs {dispatch_result.away}")
+        elif dispatch_result.home:
+            self._update_header(dispatch_result.home)
+        else:
+            self._update_header(command[:40] + "..." if len(command) > 40 else command)
+
+    def _start_dispatch(self, command: str) -> None:
+        """Run the dispatcher as a worker so the input handler returns immediately.
+        A newer query supersedes a dispatch still in flight."""
+        self.run_worker(self._process_command(command), group="dispatch", exclusive=True)
+
     async def on_input_submitted(self, event: Input.Submitted) -> None:
         # Handle startup input
         if event.input.id == "startup_input":
@@ -195,15 +258,11 @@ Match:"""
             # Display user message
             self._user_msg(command)
             
-            # Generate dynamic title for header (non-blocking)
-            title = await self._generate_title(command)
-            self._update_header(title)
-            
             # Focus chat input for next messages
             self.query_one("#chat_input").focus()
             
-            # Process the command
-            await self._process_command(command)
+            # Process the command (header title follows from the dispatch)
+            self._start_dispatch(command)
         
         # Handle chat input (continued conversation)
         elif event.input.id == "chat_input":
@@ -218,16 +277,21 @@ Match:"""
                 await self._handle_confirmation(user_input)
             else:
                 # New query in conversation
-                await self._process_command(user_input)
+                self._start_dispatch(user_input)
     
     async def _process_command(self, command: str) -> None:
         """Process a user command (analyze request)."""
         from src.agents.dispatcher import DispatcherAgent
+
+        if command.strip().lower().startswith(BATCH_COMMANDS):
+            await self._process_batch(command)
+            return
         
         dispatcher = DispatcherAgent()
         
         try:
             dispatch_result = await dispatcher.run(command)
+            self._update_header_from_dispatch(dispatch_result, command)
             
             if not dispatch_result.match_found:
                 self._bot_msg(f"Je n'ai pas trouvé ce match. {dispatch_result.reasoning}")
@@ -236,6 +300,8 @@ Match:"""
             
             # Store pending match and ask for confirmation
             self._pending_match = dispatch_result
+            if self._prefetch_enabled():
+                self._get_prefetcher().prefetch(dispatch_result.match_id)
             
             # Format date nicely
             date_str = dispatch_result.date if dispatch_result.date else "date inconnue"
@@ -243,12 +309,39 @@ Match:"""
             # Conversational response
             self._bot_msg(
                 f"salut est-ce bien le match [bold]{dispatch_result.home} vs {dispatch_result.away}[/] - "
-                f"{dispatch_result.league or 'League'} pour le {date_str} que vous voulez analyser ?"
+                f"{dispatch_result.competition or 'League'} pour le {date_str} que vous voulez analyser ?"
             )
             
         except Exception as e:
             self._bot_msg(f"Désolé, une erreur s'est produite : {e}")
     
+    async def _process_batch(self, command: str) -> None:
+        """Dispatch every query of a matchday command and queue all the matches found (no confirmation)."""
+        from src.agents.dispatcher import DispatcherAgent
+
+        body = command.strip().split(maxsplit=1)
+        queries = [q.strip() for q in (body[1] if len(body) > 1 else "").replace("\n", ";").split(";") if q.strip()]
+        if not queries:
+            self._bot_msg("Usage : [bold]/batch Arsenal vs Chelsea; Real Madrid vs Barça[/]")
+            return
+
+        self._update_header(f"Journée · {len(queries)} matchs")
+        self._bot_msg(f"🔎 Recherche de {len(queries)} matchs...")
+        results = await asyncio.gather(
+            *(DispatcherAgent().run(query) for query in queries),
+            return_exceptions=True
+        )
+
+        found = 0
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception) or not result.match_found:
+                reason = result if isinstance(result, Exception) else result.reasoning
+                self._bot_msg(f"❌ [bold]{query}[/] : {reason}")
+                continue
+            found += 1
+            self._start_pipeline(result)
+        self._bot_msg(f"🚀 {found}/{len(queries)} analyses lancées ({self._max_runs} en parallèle max).")
+
     async def _handle_confirmation(self, user_input: str) -> None:
         """Handle user confirmation of pending match."""
         lower = user_input.lower().strip()
@@ -260,18 +353,81 @@ Match:"""
             self._update_header(f"{match.home} vs {match.away}")
             self._bot_msg(f"Parfait ! Je lance l'analyse de [bold]{match.home} vs {match.away}[/]...")
             
-            # Launch pipeline
-            asyncio.create_task(self.run_real_pipeline(match.match_id))
+            # Launch pipeline (managed worker, cancellable with esc)
+            self._start_pipeline(match)
             
         elif lower in ("non", "no", "n", "pas ça", "autre"):
-            self._pending_match = None
+            self._cancel_prefetch()
             self._bot_msg("D'accord, quel match souhaitez-vous analyser ?")
         else:
             # Treat as new query
-            self._pending_match = None
-            await self._process_command(user_input)
+            self._cancel_prefetch()
+            self._start_dispatch(user_input)
 
-    async def run_real_pipeline(self, match_id):
+    def _cancel_prefetch(self) -> None:
+        """Drop the pending match and cancel its speculative fetches."""
+        if self._pending_match and self._prefetcher:
+            self._prefetcher.cancel(self._pending_match.match_id)
+        self._pending_match = None
+
+    def _start_pipeline(self, match) -> None:
+        """Queue an analysis as a managed worker (deduplicated per match)."""
+        running = self._runs.get(match.match_id)
+        if running and not running.is_finished:
+            self._bot_msg(f"L'analyse de [bold]{match.home} vs {match.away}[/] est déjà en cours.")
+            return
+        worker = self.run_worker(
+            self._run_managed(match.match_id, f"{match.home} vs {match.away}"),
+            name=match.match_id,
+            group="pipeline",
+            exit_on_error=False,
+        )
+        self._runs[match.match_id] = worker
+
+    async def _add_run_panel(self, label: str) -> MatchRunPanel:
+        """Mount a status panel for a new run, dropping the oldest finished ones."""
+        grid = self.query_one("#runs_grid")
+        grid.add_class("visible")
+        finished = [panel for panel in grid.query(MatchRunPanel) if panel.finished]
+        excess = len(grid.children) + 1 - MAX_RUN_PANELS
+        for panel in finished[:max(0, excess)]:
+            await panel.remove()
+
+        self._run_counter += 1
+        panel = MatchRunPanel(label, id=f"run-{self._run_counter}")
+        await grid.mount(panel)
+        return panel
+
+    async def _run_managed(self, match_id: str, label: str) -> None:
+        """Wait for a free run slot, then run the pipeline. Cancellation stops it wherever it is."""
+        panel = await self._add_run_panel(label)
+        try:
+            if self._run_slots.locked():
+                self._bot_msg(f"⏳ Analyse de [bold]{label}[/] en file d'attente...")
+            async with self._run_slots:
+                panel.add_class("running")
+                panel.set_state("[#FF8C00]En cours[/]")
+                await self.run_real_pipeline(match_id, label, panel)
+        except asyncio.CancelledError:
+            panel.set_state("[dim]🛑 Annulée[/]", finished=True)
+            self._bot_msg(f"🛑 Analyse de [bold]{label}[/] annulée.")
+            self._update_agent_label("Assist")
+            raise
+        finally:
+            panel.remove_class("running")
+            if not panel.finished:
+                panel.set_state("[#E53935]✘ Interrompue[/]", finished=True)
+            self._runs.pop(match_id, None)
+
+    def action_cancel_run(self) -> None:
+        """Cancel the most recently launched analysis still active (running or queued)."""
+        active = [w for w in self._runs.values() if not w.is_finished]
+        if not active:
+            self._bot_msg("Aucune analyse en cours.")
+            return
+        active[-1].cancel()
+
+    async def run_real_pipeline(self, match_id, label: str = "", panel: MatchRunPanel = None):
         """Exécute le pipeline complet avec graphe asynchrone."""
         
         # 1. Verification des clés API
@@ -280,113 +436,73 @@ Match:"""
             self._bot_msg("⚠️ [bold red]Clés API manquantes[/] - Vérifiez votre fichier .env")
             return
 
+        # Several runs share the chat: tag their messages
+        def say(text: str) -> None:
+            self._bot_msg(f"[dim]{label}[/] · {text}" if label and self._max_runs > 1 else text)
+
+        def on_event(event: str, stage: str, detail) -> None:
+            if panel:
+                panel.on_agent_event(event, stage, detail)
+            if stage not in STAGE_LABELS:
+                return  # Per-agent swarm events: only shown in the panel
+            if event == EVENT_STARTED:
+                if stage == STAGE_DATA:
+                    say("🔍 Je collecte les données du match...")
+                elif stage == STAGE_SWARM:
+                    say("🧠 Analyse en cours par nos experts...")
+                elif stage == STAGE_ORCHESTRATOR:
+                    say("📊 Synthèse du verdict en cours...")
+                self._update_agent_label(STAGE_LABELS[stage])
+            elif event == EVENT_DONE and stage == STAGE_DATA:
+                say("✅ Données collectées" + (" (reprise du point de sauvegarde)" if detail == CHECKPOINT_DETAIL else ""))
+            elif event == EVENT_FAILED:
+                if stage == STAGE_DATA:
+                    say(f"❌ Erreur de collecte: {detail}")
+                else:
+                    say(f"⚠️ {STAGE_LABELS[stage]}: {detail}")
+
         # 2. Instantiation
         try:
-            if os.getenv("NEWS_API_KEY"):
-                news_provider = GoogleNewsProvider()
-            else:
-                news_provider = MockNewsProvider()
-
-            # Initial State
-            state = AgentState(
-                match_id=match_id,
-                analysis_reports={}
+            # Prefetch-aware providers: data fetched during confirmation is reused
+            prefetcher = self._get_prefetcher()
+            from src.core.checkpoints import get_checkpoint_store
+            pipeline = AnalysisPipeline(
+                prefetcher.match_provider, prefetcher.news_provider,
+                on_event=on_event, checkpoints=get_checkpoint_store(),
             )
-
-            # --- Instanciation des Agents ---
-            real_provider = NeuralBetProvider() 
-            miner = DataMinerAgent(provider=real_provider)
-            metrician = MetricianAgent()
-            tactician = TacticianAgent()
-            psych = PsychAgent(news_provider=news_provider)
-            xfactor = XFactorAgent()
-            devil = DevilsAdvocateAgent()
-            orchestrator = OrchestratorAgent()
-            
         except Exception as e:
-            self._bot_msg(f"Erreur d'initialisation: {e}")
+            say(f"Erreur d'initialisation: {e}")
             return
 
-        # 3. Execution Loop
-        self._bot_msg("🔍 Je collecte les données du match...")
-        
-        # --- ÉTAPE 1 : Data Mining ---
+        # 3. Execution
         try:
-            self._update_agent_label("Data Miner")
-            state = await miner.execute(state)
-            self._bot_msg("✅ Données collectées")
-        except Exception as e:
-            self._bot_msg(f"❌ Erreur de collecte: {e}")
+            # Resume an interrupted or failed run; a finished one is re-analysed on fresh data
+            state = await pipeline.run(match_id, refresh=pipeline.completed(match_id))
+        except Exception:
+            if panel:
+                panel.set_state("[#E53935]✘ Collecte impossible[/]", finished=True)
             self._update_agent_label("Assist")
             return
 
-        # --- ÉTAPE 2 : Analyse Parallèle ---
-        self._bot_msg("🧠 Analyse en cours par nos experts...")
-        self._update_agent_label("The Swarm")
-        
-        try:
-            from copy import deepcopy
-            
-            async def run_agent_safe(agent, base_state: AgentState, report_key: str):
-                isolated_state = AgentState(
-                    match_id=base_state.match_id,
-                    match_data=base_state.match_data,
-                    market_data=base_state.market_data,
-                    analysis_reports={},
-                    errors=[]
-                )
-                result_state = await agent.execute(isolated_state)
-                return result_state
-            
-            results = await asyncio.gather(
-                run_agent_safe(metrician, state, "metrician_report"),
-                run_agent_safe(tactician, state, "tactician_report"),
-                run_agent_safe(psych, state, "psych_report"),
-                run_agent_safe(xfactor, state, "xfactor_report"),
-                return_exceptions=True
-            )
-            
-            for result in results:
-                if isinstance(result, Exception):
-                    state.errors.append(str(result))
-                elif isinstance(result, AgentState):
-                    state.analysis_reports.update(result.analysis_reports)
-                    state.errors.extend(result.errors)
-                    
-        except Exception as e:
-            self._bot_msg(f"⚠️ Erreur durant l'analyse parallèle: {e}")
-
-        # --- ÉTAPE 3 : Devil's Advocate ---
-        try:
-            self._update_agent_label("Devil's Advocate")
-            state = await devil.execute(state)
-        except Exception as e:
-            self._bot_msg(f"⚠️ Devil's Advocate: {e}")
-
-        # --- ÉTAPE 4 : Orchestrator ---
-        try:
-            self._bot_msg("📊 Synthèse du verdict en cours...")
-            self._update_agent_label("Orchestrator")
-            state = await orchestrator.execute(state)
-        except Exception as e:
-            self._bot_msg(f"⚠️ Orchestrator: {e}")
-
         # --- Affichage Final ---
         if "orchestrator_final" in state.analysis_reports:
             orch_out = state.analysis_reports['orchestrator_final']
             try:
-                self._bot_msg(f"\\n[bold]═══ VERDICT NEURAL BET ═══[/]")
-                self._bot_msg(f"🏆 [bold]Prédiction:[/] {orch_out.winner_prediction}")
-                self._bot_msg(f"📊 [bold]Confiance:[/] {orch_out.confidence_score * 100:.1f}%")
-                self._bot_msg(f"🔑 [bold]Facteur décisif:[/] {orch_out.decisive_factor}")
-                self._bot_msg(f"📜 [bold]Raisonnement:[/] {orch_out.logic_summary}")
+                if panel:
+                    panel.set_state(f"[#4CAF50]✔ {orch_out.winner_prediction}[/] ({orch_out.confidence_score * 100:.0f}%)", finished=True)
+                say(f"\\n[bold]═══ VERDICT NEURAL BET ═══[/]")
+                say(f"🏆 [bold]Prédiction:[/] {orch_out.winner_prediction}")
+                say(f"📊 [bold]Confiance:[/] {orch_out.confidence_score * 100:.1f}%")
+                say(f"🔑 [bold]Facteur décisif:[/] {orch_out.decisive_factor}")
+                say(f"📜 [bold]Raisonnement:[/] {orch_out.logic_summary}")
             except:
-                self._bot_msg(str(orch_out))
+                say(str(orch_out))
         
-        self._bot_msg("\\n✨ [bold green]Analyse terminée ![/] Une autre question ?")
+        if panel and not panel.finished:
+            panel.set_state("[#4CAF50]✔ Terminée[/]", finished=True)
+        say("\\n✨ [bold green]Analyse terminée ![/] Une autre question ?")
         self._update_agent_label("Assist")
 
-
 if __name__ == "__main__":
     app = NeuralBetApp()
     app.run()
@@ -3,6 +3,7 @@ from textual.widgets import Static, RichLog, Label
 from textual.containers import Container, Vertical
 from textual.app import ComposeResult
 from datetime import datetime
+import time
 
 class ActivityIndicator(Static):
     """Petit indicateur animé (⠋⠙⠹...)."""
@@ -30,23 +31,43 @@ class AgentStatusItem(Static):
     def __init__(self, label: str, id: str):
         super().__init__(id=id)
         self.label_text = label
+        self.started_at = None
+        self.timer = None
 
     def compose(self) -> ComposeResult:
         yield Label(self.label_text, classes="agent-name")
         yield ActivityIndicator(id=f"{self.id}-spinner")
         yield Label("", id=f"{self.id}-icon") # Pour le check vert à la fin
 
+    def _elapsed(self) -> str:
+        return f"{time.monotonic() - self.started_at:.1f}s" if self.started_at else ""
+
+    def _tick(self):
+        self.query_one(f"#{self.id}-icon").update(f"[dim]{self._elapsed()}[/]")
+
     def set_active(self):
         self.add_class("active")
-        self.remove_class("done")
+        self.remove_class("done", "failed")
+        self.started_at = time.monotonic()
         self.query_one(ActivityIndicator).start()
-        self.query_one(f"#{self.id}-icon").update("")
+        self._tick()
+        if not self.timer:
+            self.timer = self.set_interval(0.5, self._tick)
 
-    def set_done(self):
+    def _finish(self, css_class: str, icon: str):
         self.remove_class("active")
-        self.add_class("done")
+        self.add_class(css_class)
         self.query_one(ActivityIndicator).stop()
-        self.query_one(f"#{self.id}-icon").update("[bold]✔[/]")
+        if self.timer:
+            self.timer.stop()
+            self.timer = None
+        self.query_one(f"#{self.id}-icon").update(f"[bold]{icon}[/] {self._elapsed()}".strip())
+
+    def set_done(self):
+        self._finish("done", "✔")
+
+    def set_failed(self):
+        self._finish("failed", "✘")
 
 class AgentSidebar(Container):
     """Le contenu de la colonne de gauche (largeur 25)."""
@@ -67,6 +88,51 @@ class AgentSidebar(Container):
         yield Label("\n[STATISTIQUES]", classes="sidebar-title")
         yield Static("[dim]Graphique de confiance\nen attente de données...[/]", classes="graph-placeholder")
 
+class MatchRunPanel(Vertical):
+    """Statut en direct d'une analyse: une ligne par agent du pipeline."""
+
+    AGENTS = (
+        ("data_miner", "Data Miner"),
+        ("metrician", "Metrician"),
+        ("tactician", "Tactician"),
+        ("psych", "Psych Agent"),
+        ("xfactor", "X-Factor"),
+        ("devils_advocate", "Devil's Advocate"),
+        ("orchestrator", "Orchestrator"),
+    )
+
+    def __init__(self, title: str, id: str):
+        super().__init__(id=id)
+        self.title_text = title
+        self.finished = False
+
+    def compose(self) -> ComposeResult:
+        yield Label(f"[bold]{self.title_text}[/]", classes="run-title")
+        yield Label("[dim]En file d'attente[/]", id=f"{self.id}-state", classes="run-state")
+        for key, label in self.AGENTS:
+            yield AgentStatusItem(label, id=f"{self.id}-{key}")
+
+    def set_state(self, text: str, finished: bool = False):
+        self.query_one(f"#{self.id}-state").update(text)
+        if finished:
+            self.finished = True
+            for item in self.query(AgentStatusItem):
+                if item.has_class("active"):
+                    item.set_failed()
+
+    def on_agent_event(self, event: str, agent: str, detail: str = None):
+        """Applique un événement du pipeline (started / done / failed) à la ligne de l'agent."""
+        items = self.query(f"#{self.id}-{agent}")
+        if not items:
+            return  # Étape sans ligne dédiée (ex: "swarm")
+        item = items.first()
+        if event == "started":
+            item.set_active()
+        elif event == "done":
+            item.set_done()
+        elif event == "failed":
+            item.set_failed()
+
 class LogPanel(Static):
     """Le panneau principal de droite pour les logs."""
     def compose(self) -> ComposeResult:
@@ -0,0 +1,104 @@
+# src/ui/widgets/transcript.py
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from rich.text import Text
+from textual.widgets import RichLog
+
+DEFAULT_TRANSCRIPT_LINES = 2000
+TRIM_RATIO = 0.75  # Après éviction, on redescend à 75% du plafond (évictions groupées)
+
+
+class TranscriptLog(RichLog):
+    """
+    Journal de chat borné.
+
+    RichLog ne rend déjà que les lignes visibles; ce widget plafonne en plus
+    le nombre de lignes gardées en mémoire. Quand le plafond est dépassé, les
+    messages les plus anciens (entiers, jamais coupés) sont retirés par lot et
+    archivés en JSONL dans <data_dir>/transcripts/. Seule l'API publique de
+    RichLog est utilisée (write, clear, lines), pas ses attributs internes.
+    """
+
+    def __init__(self, *args, max_transcript_lines: Optional[int] = None, archive_path: Optional[Path] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_transcript_lines = max_transcript_lines or int(
+            os.getenv("NEURALBET_TRANSCRIPT_LINES", DEFAULT_TRANSCRIPT_LINES)
+        )
+        self._archive_path = archive_path
+        self._messages: deque = deque()  # (nombre de lignes, enregistrement) par message affiché
+        self.archived_count = 0
+
+    @property
+    def archive_path(self) -> Path:
+        if self._archive_path is None:
+            from src.core.config import get_data_dir
+            folder = get_data_dir() / "transcripts"
+            folder.mkdir(exist_ok=True)
+            self._archive_path = folder / f"session-{datetime.now():%Y%m%d-%H%M%S}.jsonl"
+        return self._archive_path
+
+    def write(self, content, *args, **kwargs):
+        before = len(self.lines)
+        super().write(content, *args, **kwargs)
+        added = len(self.lines) - before
+        if not added:
+            # Rendu différé: RichLog rejouera write() quand la taille sera connue
+            return self
+
+        record = {"ts": time.time(), "text": self._plain(content)}
+        self._messages.append((added, record, (content, args, kwargs)))
+        if len(self.lines) > self.max_transcript_lines:
+            self._evict()
+        return self
+
+    @staticmethod
+    def _plain(content) -> str:
+        if isinstance(content, Text):
+            return content.plain.strip()
+        try:
+            return Text.from_markup(str(content)).plain.strip()
+        except Exception:
+            return str(content).strip()
+
+    def _evict(self) -> None:
+        """
+        Retire les plus anciens messages entiers et les archive sur disque.
+        API publique uniquement: le journal est vidé (clear) puis les messages
+        gardés sont réécrits; l'éviction étant groupée, ce coût reste amorti.
+        """
+        excess = len(self.lines) - int(self.max_transcript_lines * TRIM_RATIO)
+        dropped, records = 0, []
+        while self._messages and dropped < excess:
+            count, record, _ = self._messages.popleft()
+            dropped += count
+            records.append(record)
+        if not dropped:
+            return
+
+        scroll_y = self.scroll_y
+        kept = list(self._messages)
+        self._messages.clear()
+        self.clear()
+        for _, record, (content, args, kwargs) in kept:
+            before = len(self.lines)
+            super().write(content, *args, **kwargs)
+            self._messages.append((len(self.lines) - before, record, (content, args, kwargs)))
+        if not self.auto_scroll:
+            # Sans défilement auto, garde le lecteur sur le même message
+            self.scroll_to(y=max(0, scroll_y - dropped), animate=False, immediate=True)
+        self._archive(records)
+
+    def _archive(self, records: list) -> None:
+        try:
+            with self.archive_path.open("a", encoding="utf-8") as handle:
+                for record in records:
+                    handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.archived_count += len(records)
+        except OSError as e:
+            self.log.warning(f"Transcript archive failed: {e}")
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Shared test fixtures.
+Every test runs against a throwaway data directory, so the stores opened
+through the get_x() singletons (ratings, calibration, odds history,
+checkpoints, fixture calendar, news quota) never write into ~/.neuralbet.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.core import calibration, checkpoints, fixture_calendar, market_provider, odds_store, ratings
+from src.core.config import DATA_DIR_ENV
+from src.providers import google_news_provider
+
+# (module, attribute) of every shared instance backed by the data directory
+SINGLETONS = [
+    (ratings, "_rating_table"),
+    (calibration, "_calibration_store"),
+    (odds_store, "_odds_store"),
+    (checkpoints, "_checkpoint_store"),
+    (fixture_calendar, "_fixture_calendar"),
+    (market_provider, "_market_provider"),
+    (google_news_provider, "_news_quota"),
+]
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_dir(tmp_path, monkeypatch):
+    """Point NEURALBET_DATA_DIR at tmp_path and start from fresh singletons."""
+    monkeypatch.setenv(DATA_DIR_ENV, str(tmp_path / "data"))
+    for module, name in SINGLETONS:
+        monkeypatch.setattr(module, name, None)
+    yield tmp_path / "data"
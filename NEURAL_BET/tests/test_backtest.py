@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the backtest runner: as-of snapshots, stand-in LLMs, metrics and
+process-pool sharding, on a synthetic season.
+"""
+import asyncio
+import csv
+import logging
+import math
+import pytest
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.backtest import SeasonSnapshots, _init_worker, _run_shard, compute_metrics, load_fixtures, run_backtest, stub_response
+from src.core.llm import LLMFactory
+from src.core.odds_store import OddsStore
+from src.core.portfolio import MAX_EXPOSURE
+from src.core.schemas import OrchestratorOutput
+
+
+@pytest.fixture(scope="module")
+def season(tmp_path_factory):
+    """Double round robin of 8 teams (56 matches) with results and 1X2 prices."""
+    rng = np.random.default_rng(0)
+    teams = ["Alpha", "Bravo", "Charlie", "Delta", "Echo", "Foxtrot", "Golf", "Hotel"]
+    strength = np.linspace(-0.4, 0.4, 8)
+    pairs = [(h, a) for h in range(8) for a in range(8) if h != a]
+    rng.shuffle(pairs)
+    rows = []
+    for k, (h, a) in enumerate(pairs):
+        day = date(2024, 8, 10) + timedelta(days=k // 4)
+        lam_home, lam_away = math.exp(0.3 + strength[h] - strength[a]), math.exp(0.1 + strength[a] - strength[h])
+        p_home = 0.45 + 0.25 * (strength[h] - strength[a])
+        odds = [round(1 / (p * 1.05), 2) for p in (p_home, 0.27, 0.73 - p_home)]
+        rows.append(["E0", day.strftime("%d/%m/%Y"), teams[h], teams[a], rng.poisson(lam_home), rng.poisson(lam_away), *odds])
+
+    folder = tmp_path_factory.mktemp("season")
+    path = folder / "E0.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Div", "Date", "HomeTeam", "AwayTeam", "FTHG", "FTAG", "B365H", "B365D", "B365A"])
+        writer.writerows(rows)
+    OddsStore(folder / "odds").load_csv(path)
+    return {"fixtures": load_fixtures([path]), "odds": folder / "odds", "folder": folder}
+
+
+def test_snapshots_only_see_earlier_matches(season):
+    fixtures = season["fixtures"]
+    snapshots = SeasonSnapshots(fixtures)
+
+    first = snapshots.match_data(fixtures[0]["match_id"])
+    assert "error" in first["stats"]["home"]["understat_form"]
+
+    last = fixtures[-1]
+    team = last["home"]
+    before = [f for f in fixtures if f["kickoff"] < last["kickoff"] and team in (f["home"], f["away"])]
+    goals_for = [f["home_xg"] if f["home"] == team else f["away_xg"] for f in before]
+    stats = snapshots.match_data(last["match_id"])["stats"]["home"]
+    assert stats["fbref_stats"]["matches_played"] == len(before)
+    assert stats["fbref_stats"]["xG"] == pytest.approx(sum(goals_for))
+    assert stats["understat_form"]["avg_xg"] == pytest.approx(np.mean(goals_for[-5:]), abs=1e-3)
+
+    assert first["ratings"] is None
+    ratings = snapshots.match_data(last["match_id"])["ratings"]
+    assert ratings["home"]["matches"] == len(before)
+
+
+def test_metrics_by_hand():
+    results = [
+        {"outcome": "HOME", "probs": [0.5, 0.3, 0.2], "bets": [{"stake": 0.02, "won": True, "profit": 0.02}]},
+        {"outcome": "AWAY", "probs": [0.6, 0.3, 0.1], "bets": [{"stake": 0.02, "won": False, "profit": -0.02}]},
+        {"outcome": "DRAW", "probs": None, "bets": []},
+    ]
+
+    metrics = compute_metrics(results)
+
+    assert metrics["predicted"] == 2 and metrics["skipped"] == 1
+    assert metrics["hit_rate"] == 0.5
+    assert metrics["brier"] == pytest.approx(((0.25 + 0.09 + 0.04) + (0.36 + 0.09 + 0.81)) / 2, abs=1e-4)
+    assert metrics["log_loss"] == pytest.approx(-(math.log(0.5) + math.log(0.1)) / 2, abs=1e-4)
+    assert metrics["roi"] == 0.0 and metrics["bets"] == 2
+
+
+def test_stub_answers_follow_the_prior():
+    verdict = OrchestratorOutput.model_validate_json(
+        stub_response("orchestrator", {"home_win": 0.2, "draw": 0.3, "away_win": 0.5})
+    )
+    assert verdict.winner_prediction == "AWAY"
+    assert verdict.confidence_score == 0.5
+
+
+def test_replay_in_process(season, isolated_data_dir):
+    create = LLMFactory.create
+    report = run_backtest(season["fixtures"], season["odds"], workers=1)
+    metrics = report["metrics"]
+
+    assert LLMFactory.create == create  # patch removed after the run
+    assert metrics["matches"] == 56
+    assert 0 < metrics["predicted"] < 56  # opening rounds lack history
+    assert 0 < metrics["brier"] < 1.0 and metrics["log_loss"] > 0
+    assert "market_brier" in metrics
+    assert metrics["bets"] > 0 and metrics["roi"] is not None
+    assert 0 < metrics["portfolio_staked"] and metrics["portfolio_roi"] is not None
+    assert metrics["portfolio_max_exposure"] <= MAX_EXPOSURE + 1e-3  # per-matchday card cap
+    assert report["llm"]["stub"] > 0 and report["llm"]["live"] == 0
+    assert not (isolated_data_dir / "calibration").exists()  # raw confidences, store never opened
+
+
+def test_process_pool_matches_in_process(season):
+    single = run_backtest(season["fixtures"], season["odds"], workers=1)
+    sharded = run_backtest(season["fixtures"], season["odds"], workers=2)
+
+    assert sharded["metrics"] == single["metrics"]
+    assert [r["match_id"] for r in sharded["results"]] == [r["match_id"] for r in single["results"]]
+
+
+def test_live_answers_are_cached_then_replayed(season, monkeypatch):
+    from langchain_core.runnables import RunnableLambda
+
+    def fake_model(role):
+        away = stub_response(role, {"home_win": 0.1, "draw": 0.1, "away_win": 0.8})
+        return RunnableLambda(lambda prompt: away)
+
+    cache = season["folder"] / "llm.db"
+    fixtures = season["fixtures"][-8:]  # last round only (history from the others)
+    all_fixtures = season["fixtures"][:-8] + fixtures
+
+    monkeypatch.setattr(LLMFactory, "create", staticmethod(fake_model))
+    live = run_backtest(all_fixtures, workers=1, llm_mode="live", cache_path=cache, start=fixtures[0]["kickoff"])
+    assert live["llm"]["live"] > 0
+
+    def no_model(role):
+        raise AssertionError("cached mode must not build a model")
+
+    monkeypatch.setattr(LLMFactory, "create", staticmethod(no_model))
+    cached = run_backtest(all_fixtures, workers=1, llm_mode="cached", cache_path=cache, start=fixtures[0]["kickoff"])
+
+    assert cached["llm"]["live"] == 0 and cached["llm"]["stub"] == 0
+    assert cached["llm"]["cache"] == live["llm"]["live"]
+    assert {r["prediction"] for r in cached["results"] if r["prediction"]} == {"AWAY"}
+
+
+def test_live_clients_survive_several_shards_per_worker(season, monkeypatch):
+    class LoopBoundModel:
+        """Fake SDK client whose HTTP pool is tied to the first event loop it runs in."""
+
+        def __init__(self, role):
+            self.role, self.loop = role, None
+
+        async def ainvoke(self, prompt):
+            loop = asyncio.get_running_loop()
+            self.loop = self.loop or loop
+            if self.loop is not loop:
+                raise RuntimeError("Event loop is closed")
+            return stub_response(self.role, {"home_win": 0.5, "draw": 0.3, "away_win": 0.2})
+
+    def cached_model(role):
+        return LLMFactory._cached(("fake", role, 0.0), lambda: LoopBoundModel(role))
+
+    monkeypatch.setattr(LLMFactory, "create", staticmethod(cached_model))
+    fixtures = season["fixtures"]
+    try:
+        _init_worker(fixtures, None, None, "live", season["folder"] / "shards.db")
+        shards = [_run_shard(list(range(40, 48)), 4), _run_shard(list(range(48, 56)), 4)]
+    finally:
+        logging.disable(logging.NOTSET)
+        LLMFactory.clear_clients()
+
+    results = [result for shard in shards for result in shard["results"]]
+    assert not [r for r in results if r.get("skipped", "").startswith("pipeline failed")]
+    assert all(shard["llm"]["live"] > 0 for shard in shards)
+
+
+def test_unknown_llm_mode():
+    with pytest.raises(ValueError):
+        run_backtest([], llm_mode="oracle")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
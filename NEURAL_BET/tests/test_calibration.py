@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the confidence calibration (isotonic / Platt fits, verdict log,
+periodic refit) and its use by the ValueHunterAgent.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.base import AgentState
+from src.core.calibration import (
+    MIN_SAMPLES, CalibrationStore, Calibrator, fit_isotonic, results_from_csv,
+)
+from src.core.odds_store import OddsStore
+from src.core.schemas import OrchestratorOutput
+
+
+def overconfident(n: int, seed: int = 0):
+    """Verdicts whose true hit rate is 0.3 + 0.4 * (confidence - 0.4)."""
+    rng = np.random.default_rng(seed)
+    confidences = rng.uniform(0.4, 0.9, n)
+    hits = rng.random(n) < 0.3 + 0.4 * (confidences - 0.4)
+    return confidences, hits
+
+
+def test_isotonic_pools_violators():
+    counts = np.zeros(101, dtype=int)
+    hits = np.zeros(101, dtype=int)
+    counts[[40, 50, 60]] = 10
+    hits[[40, 50, 60]] = [6, 4, 8]  # 0.6 then 0.4: pooled to 0.5
+
+    table = fit_isotonic(counts, hits)
+
+    assert table[40] == pytest.approx(0.5) and table[50] == pytest.approx(0.5)
+    assert table[60] == pytest.approx(0.8)
+    assert table[55] == pytest.approx(0.65)  # interpolated
+    assert np.all(np.diff(table) >= 0)
+
+
+@pytest.mark.parametrize("method", ["platt", "isotonic"])
+def test_fit_recovers_the_hit_rate(method):
+    confidences, hits = overconfident(5000)
+    calibrator = Calibrator(method)
+    calibrator.observe(confidences, hits)
+
+    summary = calibrator.fit()
+
+    assert summary["method"] == method
+    assert summary["brier_calibrated"] < summary["brier_raw"]
+    assert calibrator.apply(0.8) == pytest.approx(0.46, abs=0.05)
+    assert calibrator.apply(0.5) == pytest.approx(0.34, abs=0.05)
+
+
+def test_identity_until_enough_verdicts():
+    calibrator = Calibrator()
+    calibrator.observe([0.7] * (MIN_SAMPLES - 1), [False] * (MIN_SAMPLES - 1))
+
+    assert calibrator.fit()["method"] == "identity"
+    assert calibrator.apply(0.7) == 0.7
+
+
+def test_store_logs_resolves_and_refits(tmp_path):
+    store = CalibrationStore(tmp_path, refit_every=20)
+    confidences, hits = overconfident(60, seed=1)
+    for i, (confidence, hit) in enumerate(zip(confidences, hits)):
+        store.record(f"match_{i}", "HOME", confidence)
+    store.record("match_0", "AWAY", 0.9)  # re-analysis replaces the verdict
+
+    settled = store.resolve_many((f"match_{i}", "HOME" if hit else "DRAW") for i, hit in enumerate(hits))
+
+    assert len(settled) == 60 and settled["match_0"] is not bool(hits[0])
+    assert store.resolve("match_1", "HOME") is None  # already settled
+    assert store.calibrator.fitted["method"] == "platt"
+    assert store.pending == 0 and store.unresolved() == {}
+
+    reopened = CalibrationStore(tmp_path)
+    assert reopened.calibrator.samples == 60
+    assert reopened.calibrate(0.8) == store.calibrate(0.8) != 0.8
+
+
+def test_results_csv_resolves_calendar_match_ids(tmp_path):
+    path = tmp_path / "E0.csv"
+    path.write_text(
+        "Div,Date,HomeTeam,AwayTeam,FTHG,FTAG\nE0,04/02/2026,Arsenal,Man City,2,2\n", encoding="utf-8"
+    )
+    assert results_from_csv(path) == {"Arsenal_Man_City_2026-02-04_PL": "DRAW"}
+
+
+@pytest.mark.asyncio
+async def test_value_hunter_uses_calibrated_confidence(tmp_path):
+    from src.agents.value_hunter import ValueHunterAgent
+
+    calibration = CalibrationStore(tmp_path / "calibration")
+    confidences, hits = overconfident(1000, seed=2)
+    calibration.observe(confidences, hits)
+    calibration.refit()
+
+    match_id = "Arsenal_Liverpool_2026-02-04_PL"
+    verdict = OrchestratorOutput(
+        confidence_score=0.8, winner_prediction="HOME", logic_summary="...", decisive_factor="..."
+    )
+    state = AgentState(
+        match_id=match_id,
+        match_data={"prior": {"home_win": 0.5, "draw": 0.25, "away_win": 0.25}},
+        market_data={"home_win": 2.00, "draw": 3.50, "away_win": 3.60},
+        analysis_reports={"orchestrator_final": verdict},
+    )
+
+    agent = ValueHunterAgent(store=OddsStore(tmp_path / "odds"), calibration=calibration)
+    state = await agent.execute(state)
+
+    calibrated = state.analysis_reports["calibrated_confidence"]
+    assert calibrated < 0.6
+    # 0.8 at 2.00 looks like +60% EV; the calibrated probability is not a value bet
+    assert all(bet["market"] != "home_win" for bet in state.analysis_reports["value_scan"])
+    assert calibration.unresolved() == {match_id: ("HOME", 0.8)}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for pipeline checkpoints (resume from the last completed stage)
+and the durable job queue driving batch runs.
+"""
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.base import AgentState, BaseAgent
+from src.core.checkpoints import CheckpointStore, compute_input_hash, decode_value, encode_value
+from src.core.jobs import JobQueue, JOB_DONE, JOB_FAILED, JOB_QUEUED
+from src.core.schemas import TacticianOutput
+from src.pipeline import AnalysisPipeline, CHECKPOINT_DETAIL
+
+MATCH_ID = "Arsenal_Liverpool_2026-02-04_PL"
+
+
+class CountingAgent(BaseAgent):
+    """Fake agent counting its (LLM) calls; fails while `fail` is set."""
+
+    def __init__(self, name, critical=False, fail=False, input_reports=()):
+        super().__init__(name=name, role="Test")
+        self.is_critical = critical
+        self.fail = fail
+        self.input_reports = input_reports
+        self.calls = 0
+        self.data = {"home": "Arsenal"}
+        self.news = ["Arsenal win again"]
+
+    async def collect_inputs(self, state: AgentState):
+        if self.name == "psych":  # reads news, not match_data
+            return {"news": list(self.news)}
+        return await super().collect_inputs(state)
+
+    async def process(self, state: AgentState) -> AgentState:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        if self.name == "data_miner":
+            state.match_data = dict(self.data)
+        if self.name == "tactician":
+            state.analysis_reports["tactician"] = TacticianOutput(
+                tactical_advantage="HOME", key_battle="Saka vs Robertson", verdict_summary="Arsenal"
+            )
+        else:
+            state.analysis_reports[f"{self.name}_report"] = self.name
+        return state
+
+
+def make_agents(**overrides):
+    agents = {name: CountingAgent(name) for name in (
+        "metrician", "tactician", "psych", "xfactor", "devils_advocate", "orchestrator"
+    )}
+    agents["data_miner"] = CountingAgent("data_miner", critical=True)
+    agents["devils_advocate"] = CountingAgent("devils_advocate", input_reports=("metrician_report", "tactician"))
+    agents["orchestrator"] = CountingAgent(
+        "orchestrator", input_reports=("metrician_report", "tactician", "devils_advocate_report")
+    )
+    agents.update(overrides)
+    return agents
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CheckpointStore(tmp_path / "checkpoints.db")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", retry_delay=0.05)
+    yield queue
+    queue.close()
+
+
+def test_encoding_keeps_report_models():
+    reports = {"tactician": TacticianOutput(tactical_advantage="AWAY", key_battle="x", verdict_summary="y")}
+
+    decoded = decode_value(encode_value(reports))
+
+    assert isinstance(decoded["tactician"], TacticianOutput)
+    assert decoded == reports
+
+
+def test_input_hash_depends_on_match_and_agents():
+    agents = make_agents()
+    assert compute_input_hash(MATCH_ID, agents) == compute_input_hash(MATCH_ID, make_agents())
+    assert compute_input_hash(MATCH_ID, agents) != compute_input_hash("Chelsea_Spurs_2026-02-04_PL", agents)
+
+
+def test_store_round_trip(store):
+    state = AgentState(match_id=MATCH_ID, match_data={"home": "Arsenal"}, analysis_reports={"a": 1})
+    store.save(MATCH_ID, "h1", "data_miner", state)
+
+    restored = store.load(MATCH_ID, "h1", "data_miner")
+
+    assert restored.match_data == {"home": "Arsenal"}
+    assert store.load(MATCH_ID, "other-hash", "data_miner") is None
+
+
+@pytest.mark.asyncio
+async def test_retry_only_reruns_failed_agents(store):
+    agents = make_agents(psych=CountingAgent("psych", fail=True))
+    state = await AnalysisPipeline(agents=agents, checkpoints=store).run(MATCH_ID)
+    assert any("psych" in err for err in state.errors)
+
+    # Psych recovers: only it runs again (Devil/Orchestrator don't read its report)
+    agents["psych"].fail = False
+    events = []
+    state = await AnalysisPipeline(
+        agents=agents, checkpoints=store, on_event=lambda e, s, d: events.append((e, s, d))
+    ).run(MATCH_ID)
+
+    assert not state.errors
+    assert agents["data_miner"].calls == 1
+    assert agents["metrician"].calls == 1
+    assert agents["psych"].calls == 2
+    assert agents["orchestrator"].calls == 1
+    assert ("done", "data_miner", CHECKPOINT_DETAIL) in events
+    assert isinstance(state.analysis_reports["tactician"], TacticianOutput)
+
+
+@pytest.mark.asyncio
+async def test_completed_run_is_fully_restored(store):
+    agents = make_agents()
+    await AnalysisPipeline(agents=agents, checkpoints=store).run(MATCH_ID)
+
+    state = await AnalysisPipeline(agents=agents, checkpoints=store).run(MATCH_ID)
+
+    assert all(agent.calls == 1 for agent in agents.values())
+    assert "orchestrator_report" in state.analysis_reports
+
+
+@pytest.mark.asyncio
+async def test_completed_marks_only_clean_runs(store):
+    agents = make_agents(psych=CountingAgent("psych", fail=True))
+    pipeline = AnalysisPipeline(agents=agents, checkpoints=store)
+    assert not pipeline.completed(MATCH_ID)
+
+    await pipeline.run(MATCH_ID)
+    assert not pipeline.completed(MATCH_ID)  # psych failed: the next run resumes
+
+    agents["psych"].fail = False
+    await pipeline.run(MATCH_ID, refresh=pipeline.completed(MATCH_ID))
+    assert agents["data_miner"].calls == 1
+    assert pipeline.completed(MATCH_ID)  # finished: a re-analysis refreshes the data
+    assert not AnalysisPipeline(agents=agents).completed(MATCH_ID)  # no checkpoints
+
+
+@pytest.mark.asyncio
+async def test_news_update_only_reruns_psych(store):
+    agents = make_agents()
+    await AnalysisPipeline(agents=agents, checkpoints=store).run(MATCH_ID)
+
+    agents["psych"].news.append("Saka injured in training")
+    pipeline = AnalysisPipeline(agents=agents, checkpoints=store)
+    await pipeline.run(MATCH_ID, refresh=True)
+
+    assert agents["data_miner"].calls == 2
+    assert agents["psych"].calls == 2
+    assert {"metrician", "tactician", "xfactor", "devils_advocate", "orchestrator"} <= pipeline.reused
+    assert all(agents[name].calls == 1 for name in ("metrician", "tactician", "devils_advocate", "orchestrator"))
+
+
+@pytest.mark.asyncio
+async def test_stats_update_reruns_agents_reading_them(store):
+    agents = make_agents()
+    await AnalysisPipeline(agents=agents, checkpoints=store).run(MATCH_ID)
+
+    agents["data_miner"].data = {"home": "Arsenal", "xg": 2.1}
+    pipeline = AnalysisPipeline(agents=agents, checkpoints=store)
+    state = await pipeline.run(MATCH_ID, refresh=True)
+
+    assert pipeline.reused == {"psych"}
+    assert agents["metrician"].calls == 2
+    assert agents["orchestrator"].calls == 2
+    assert "psych_report" in state.analysis_reports
+
+
+def test_queue_claims_in_order_and_dedupes(queue):
+    first = queue.enqueue("A")
+    assert queue.enqueue("A") == first
+    queue.enqueue("B")
+
+    assert queue.claim()["match_id"] == "A"
+    assert queue.claim()["match_id"] == "B"
+    assert queue.claim() is None
+
+
+def test_queue_recovers_interrupted_jobs_and_retries(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", max_attempts=3, lease=0.05)
+    job_id = queue.enqueue("A")
+    queue.claim()
+
+    # A second batch process leaves the job alone while its lease is renewed
+    other = JobQueue(tmp_path / "jobs.db", max_attempts=3, retry_delay=0.0)
+    queue.heartbeat(job_id)
+    assert other.recover() == 0 and other.claim() is None
+    queue.close()
+
+    # Process killed while running: the job is recovered once its lease expires
+    # (the interrupted attempt counts towards max_attempts)
+    time.sleep(0.06)
+    queue = other
+    assert queue.recover() == 1
+    assert queue.fail(queue.claim()["id"], "boom") == JOB_QUEUED
+    assert queue.fail(queue.claim()["id"], "boom") == JOB_FAILED
+    assert queue.jobs(JOB_FAILED)[0]["id"] == job_id
+    queue.close()
+
+
+def test_failed_job_backs_off(queue):
+    queue.enqueue("A")
+    assert queue.fail(queue.claim()["id"], "429") == JOB_QUEUED
+
+    assert queue.claim() is None  # not due yet
+    assert 0 < queue.next_due() <= 0.05
+    time.sleep(0.06)
+    assert queue.claim()["attempts"] == 2
+    assert queue.next_due() is None
+
+
+@pytest.mark.asyncio
+async def test_drain_queue_resumes_failed_jobs(queue, store):
+    from src.main import drain_queue
+
+    agents = make_agents(xfactor=CountingAgent("xfactor", fail=True))
+
+    def factory():
+        pipeline = AnalysisPipeline(agents=agents, checkpoints=store)
+        agents["xfactor"].fail = agents["xfactor"].calls == 0  # fails on the first attempt only
+        return pipeline
+
+    queue.enqueue(MATCH_ID)
+    counts = await drain_queue(queue, factory, max_runs=2)
+
+    assert counts == {JOB_DONE: 1}
+    assert agents["xfactor"].calls == 2
+    assert agents["data_miner"].calls == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the local analysis daemon (HTTP/JSON API + SSE progress stream).
+Agents and dispatcher are fakes: no LLM or network access.
+"""
+import asyncio
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+import aiohttp
+
+from src.agents.base import AgentState, BaseAgent
+from src.core.schemas import DispatcherOutput
+from src.daemon import NeuralBetDaemon
+
+MATCH_ID = "Arsenal_Liverpool_2026-02-04_PL"
+
+
+class FakeAgent(BaseAgent):
+    is_critical = False
+
+    def __init__(self, name, delay=0.01):
+        super().__init__(name=name, role="Test")
+        self.delay = delay
+
+    async def process(self, state: AgentState) -> AgentState:
+        await asyncio.sleep(self.delay)
+        state.analysis_reports[f"{self.name}_report"] = {"agent": self.name}
+        return state
+
+
+class FakeDispatcher:
+    async def run(self, query):
+        if "Atlantis" in query:
+            return DispatcherOutput(match_found=False, reasoning="Unknown team")
+        return DispatcherOutput(
+            match_found=True, match_id=MATCH_ID, home="Arsenal", away="Liverpool",
+            date="2026-02-04", competition="PL", reasoning="Validated via Fixture Calendar (Local)"
+        )
+
+
+def make_daemon(delay=0.01):
+    agents = {name: FakeAgent(name, delay) for name in (
+        "data_miner", "metrician", "tactician", "psych", "xfactor", "devils_advocate", "orchestrator"
+    )}
+    return NeuralBetDaemon(port=0, provider=object(), news_provider=object(), agents=agents, dispatcher=FakeDispatcher())
+
+
+@pytest.mark.asyncio
+async def test_analyse_by_query_then_stream_and_status():
+    async with make_daemon() as daemon:
+        async with aiohttp.ClientSession(daemon.base_url) as http:
+            async with http.post("/analyse", json={"query": "Arsenal vs Liverpool"}) as resp:
+                assert resp.status == 202
+                job = await resp.json()
+            assert job["match_id"] == MATCH_ID
+
+            events = []
+            async with http.get(job["stream_url"]) as resp:
+                async for raw in resp.content:
+                    line = raw.decode().strip()
+                    if line.startswith("data: "):
+                        events.append(json.loads(line[6:]))
+            assert events[-1]["state"] == "done"  # Final "end" event carries the job summary
+            assert any(e.get("stage") == "orchestrator" and e.get("event") == "done" for e in events)
+
+            async with http.get(job["status_url"]) as resp:
+                status = await resp.json()
+            assert status["state"] == "done"
+            assert status["result"]["orchestrator_report"] == {"agent": "orchestrator"}
+
+
+@pytest.mark.asyncio
+async def test_duplicate_submissions_share_a_job_and_errors_are_json():
+    async with make_daemon(delay=0.2) as daemon:
+        async with aiohttp.ClientSession(daemon.base_url) as http:
+            first = await (await http.post("/analyse", json={"match_id": MATCH_ID})).json()
+            second = await (await http.post("/analyse", json={"match_id": MATCH_ID})).json()
+            assert first["job_id"] == second["job_id"]
+
+            resp = await http.post("/analyse", json={"query": "Atlantis vs Liverpool"})
+            assert resp.status == 404
+            assert (await resp.json())["dispatch"]["match_found"] is False
+
+            assert (await http.post("/dispatch", data="not json")).status == 400
+            assert (await http.get("/status/unknown")).status == 404
+
+            await http.post(f"/cancel/{first['job_id']}")
+            await asyncio.sleep(0.05)
+            status = await (await http.get(first["status_url"])).json()
+            assert status["state"] == "cancelled"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the rolling team features (prefix sums over 3/5/10/season windows,
+home/away splits) and the UnderstatProvider reading its form from them.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.core.cache import get_cache
+from src.core.features import SPLITS, WINDOWS, TeamFeatures
+from src.core.ratings import RatingTable
+from src.providers.understat_provider import UnderstatProvider
+from src.replay.understat_server import UnderstatReplayServer
+
+
+def random_rows(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "date": f"2024-{8 + i // 28:02d}-{1 + i % 28:02d}",
+            "home": bool(rng.random() < 0.5),
+            "xg": float(rng.uniform(0, 3)),
+            "xga": float(rng.uniform(0, 3)),
+            "goals": int(rng.poisson(1.4)),
+            "goals_against": int(rng.poisson(1.2)),
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("split", SPLITS)
+def test_windows_match_a_plain_sum(split):
+    rows = random_rows(30)
+    features = TeamFeatures("Arsenal", list(reversed(rows)))  # sorted by date on build
+    subset = [r for r in rows if split == "all" or r["home"] == (split == "home")]
+
+    for last_n in (*WINDOWS, None):
+        recent = subset if last_n is None else subset[-last_n:]
+        points = sum(3 if r["goals"] > r["goals_against"] else r["goals"] == r["goals_against"] for r in recent)
+        window = features.window(last_n, split)
+
+        assert window["matches"] == len(recent)
+        assert window["xg"] == round(sum(r["xg"] for r in recent), 2)
+        assert window["avg_xga"] == round(sum(r["xga"] for r in recent) / len(recent), 2)
+        assert window["goal_diff"] == sum(r["goals"] - r["goals_against"] for r in recent)
+        assert window["points"] == points
+
+
+def test_short_history_and_table():
+    features = TeamFeatures("Arsenal", random_rows(4))
+
+    assert features.window(10)["matches"] == 4
+    table = features.table()
+    assert set(table) == set(SPLITS)
+    assert set(table["home"]) == {"last_3", "last_5", "last_10", "season"}
+    assert table["home"]["season"]["matches"] + table["away"]["season"]["matches"] == 4
+    assert TeamFeatures("Atlantis", []).form(5) == {"error": "No data for Atlantis"}
+
+
+@pytest.mark.asyncio
+async def test_every_window_from_one_page_read(tmp_path):
+    await get_cache().clear()
+    async with UnderstatReplayServer() as server:
+        async with UnderstatProvider(base_url=server.base_url, ratings=RatingTable(tmp_path / "ratings.json")) as provider:
+            forms = {n: await provider.get_team_form("Arsenal", last_n=n) for n in (1, 3, 5, 10, 38)}
+            dates = await provider.get_team_dates("Arsenal", 2024)
+            features = await provider.get_team_features("Arsenal")
+
+    assert server.stats["served"] == 1
+    played = [g for g in dates if g["isResult"]]
+    recent = played[-5:]
+    assert forms[5]["total_xg"] == round(sum(float(g["xG"][g["side"]]) for g in recent), 2)
+    assert forms[5]["last_match_result"] == played[-1]["result"]
+    assert forms[38]["matches_analyzed"] == len(played)
+    assert features.window(None, "home")["matches"] == sum(g["side"] == "h" for g in played)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
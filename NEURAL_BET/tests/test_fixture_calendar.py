@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the local fixture calendar and team name normalization.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.core.fixture_calendar import CALENDAR_RETRY_DELAY, FixtureCalendar
+from src.core.prefetch import _teams_from_match_id
+from src.core.team_names import normalize_team_name, parse_match_id, teams_match
+
+
+FIXTURES = [
+    {"home": "Arsenal", "away": "Liverpool", "date": "2026-02-04", "time": "20:00", "league": "PL"},
+    {"home": "Chelsea", "away": "Arsenal", "date": "2026-02-10", "time": "17:30", "league": "PL"},
+    {"home": "Liverpool", "away": "Manchester City", "date": "2026-02-11", "time": "20:00", "league": "PL"},
+    {"home": "1. FC Köln", "away": "Bayern Munich", "date": "2026-02-07", "time": "15:30", "league": "BUNDESLIGA"},
+]
+
+
+class FakeFBRef:
+    LEAGUE_MAP = {"PL": "ENG-Premier League", "BUNDESLIGA": "GER-Bundesliga"}
+
+    async def get_league_schedule(self, league):
+        if league == "BUNDESLIGA":
+            return {"error": "FBRef Schedule Error: 403"}
+        return {"fixtures": [f for f in FIXTURES if f["league"] == league]}
+
+
+def test_normalize_team_name():
+    assert normalize_team_name("Arsenal FC") == "arsenal"
+    assert normalize_team_name("1. FC Köln") == "koln"
+    assert normalize_team_name("Brighton & Hove Albion") == "brighton and hove albion"
+    assert teams_match("Liverpool FC", "liverpool")
+    assert not teams_match("Chelsea", "Arsenal")
+
+
+def test_find_next_fixture_and_opponent():
+    calendar = FixtureCalendar(path=Path("/nonexistent/fixtures.json"))
+    calendar.replace(FIXTURES)
+
+    hit = calendar.find("arsenal", today="2026-02-05")
+    assert hit["home"] == "Chelsea" and hit["date"] == "2026-02-10"
+
+    hit = calendar.find("Liverpool", "Arsenal", today="2026-02-01")
+    assert hit["match_id"] == "Arsenal_Liverpool_2026-02-04_PL"
+
+    assert calendar.find("Arsenal", "Tottenham", today="2026-02-01") is None
+    assert calendar.find("Cologne FC", today="2026-02-01")["home"] == "1. FC Köln"  # via aliases
+    assert calendar.find("Atlantis FC", today="2026-02-01") is None
+
+
+def test_find_with_date_hint():
+    calendar = FixtureCalendar(path=Path("/nonexistent/fixtures.json"))
+    calendar.replace(FIXTURES)
+
+    assert calendar.find("Köln", date_hint="2026-02-07")["league"] == "BUNDESLIGA"
+    assert calendar.find("Arsenal", date_hint="2026-02-05") is None
+    assert len(calendar.on_date("2026-02-04")) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_persists_and_keeps_failed_leagues(tmp_path):
+    calendar = FixtureCalendar(path=tmp_path / "fixtures.json")
+    calendar.replace(FIXTURES, updated_at=0.0)
+    assert calendar.is_stale
+
+    count = await calendar.refresh(FakeFBRef())
+    assert count == len(FIXTURES)  # Bundesliga kept from the previous calendar
+    assert not calendar.is_stale
+
+    reloaded = FixtureCalendar(path=tmp_path / "fixtures.json")
+    assert reloaded.load()
+    assert reloaded.find("Bayern Munich", today="2026-02-01")["home"] == "1. FC Köln"
+
+
+class DownFBRef(FakeFBRef):
+    calls = 0
+
+    async def get_league_schedule(self, league):
+        self.calls += 1
+        return {"error": "FBRef Schedule Error: 429"}
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_backs_off(tmp_path):
+    calendar = FixtureCalendar(path=tmp_path / "fixtures.json")
+    fbref = DownFBRef()
+
+    await calendar.ensure_fresh(fbref)
+    assert fbref.calls == 2 and calendar.failures == 1
+    assert calendar.ensure_fresh(fbref).done()  # backing off: no new scrape
+    assert fbref.calls == 2
+    assert calendar.is_stale and not (tmp_path / "fixtures.json").exists()
+
+    calendar.attempted_at -= CALENDAR_RETRY_DELAY
+    await calendar.ensure_fresh(fbref)
+    assert fbref.calls == 4 and calendar.failures == 2
+    calendar.attempted_at -= CALENDAR_RETRY_DELAY
+    assert not calendar.retry_due  # the delay doubled
+
+    await calendar.refresh(FakeFBRef())
+    assert calendar.failures == 0 and not calendar.is_stale
+
+
+@pytest.mark.parametrize("home, away, league", [
+    ("Manchester City", "Aston Villa", "PL"),
+    ("AC Milan", "Inter", "SERIE_A"),
+    ("Arsenal", "Sheffield Wednesday", "CHAMPSHIP"),
+])
+def test_match_ids_split_back_into_teams(home, away, league):
+    calendar = FixtureCalendar(path=Path("/nonexistent/fixtures.json"))
+    calendar.replace([{"home": home, "away": away, "date": "2026-02-04", "time": "20:00", "league": league}])
+    match_id = calendar.find(home, today="2026-02-01")["match_id"]
+
+    assert parse_match_id(match_id) == (home, away, "2026-02-04", league)
+    assert _teams_from_match_id(match_id) == (home, away)
+    assert parse_match_id("Arsenal_Liverpool") == ("Arsenal", "Liverpool", None, None)
+    assert parse_match_id("Arsenal") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
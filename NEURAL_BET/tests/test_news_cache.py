@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the shared NewsAPI cache (TTL + single-flight), the daily quota
+and the concurrent home/away news fetch of the PsychAgent.
+"""
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+import sys
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.core.cache import TTLCache
+from src.core.quota import DailyQuota
+from src.providers.google_news_provider import GoogleNewsProvider
+
+
+class FakeNewsAPI:
+    """NewsAPI /everything stand-in answering with scripted statuses."""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.requests = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append(request.query["q"])
+        await asyncio.sleep(0.05)
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return web.json_response({"status": "error"}, status=status)
+        return web.json_response({"articles": [
+            {"title": f"{request.query['q']} headline", "source": {"name": "BBC"}, "publishedAt": "2026-02-03"}
+        ]})
+
+
+@pytest_asyncio.fixture
+async def news_api():
+    api = FakeNewsAPI()
+    app = web.Application()
+    app.router.add_get("/v2/everything", api.handle)
+    server = TestServer(app)
+    await server.start_server()
+    api.url = str(server.make_url("/v2/everything"))
+    yield api
+    await server.close()
+
+
+def make_provider(news_api, tmp_path, monkeypatch, limit=100):
+    monkeypatch.setenv("NEWS_API_KEY", "test-key")
+    provider = GoogleNewsProvider(cache=TTLCache(default_ttl=60), quota=DailyQuota("newsapi", limit, tmp_path / "quota.db"))
+    provider.base_url = news_api.url
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_call(news_api, tmp_path, monkeypatch):
+    provider = make_provider(news_api, tmp_path, monkeypatch)
+
+    results = await asyncio.gather(*(provider.get_team_news("Arsenal") for _ in range(5)))
+    again = await provider.get_team_news("arsenal ")
+    await provider.close()
+
+    assert news_api.requests == ["Arsenal football"]
+    assert all(result == results[0] for result in results)
+    assert again[0]["title"] == "Arsenal football headline"
+    assert provider.quota.used == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(news_api, tmp_path, monkeypatch):
+    news_api.statuses = [500]
+    provider = make_provider(news_api, tmp_path, monkeypatch)
+
+    first = await provider.get_team_news("Arsenal")
+    second = await provider.get_team_news("Arsenal")
+    await provider.close()
+
+    assert first == [{"error": "API Error 500"}]
+    assert "error" not in second[0]
+    assert len(news_api.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_daily_quota_stops_requests(news_api, tmp_path, monkeypatch):
+    provider = make_provider(news_api, tmp_path, monkeypatch, limit=1)
+
+    await provider.get_team_news("Arsenal")
+    skipped = await provider.get_team_news("Liverpool")
+    await provider.close()
+
+    assert skipped == [{"error": "NewsAPI daily quota reached"}]
+    assert news_api.requests == ["Arsenal football"]
+    # Persisted: a new process sees the spent quota
+    assert DailyQuota("newsapi", 1, tmp_path / "quota.db").remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_answer_exhausts_quota(news_api, tmp_path, monkeypatch):
+    news_api.statuses = [429]
+    provider = make_provider(news_api, tmp_path, monkeypatch)
+
+    await provider.get_team_news("Arsenal")
+    await provider.close()
+
+    assert provider.quota.remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_psych_fetches_both_teams_concurrently(monkeypatch):
+    from src.agents.psych import PsychAgent
+    from src.core.llm import LLMFactory
+
+    monkeypatch.setattr(LLMFactory, "create", lambda *args, **kwargs: None)
+
+    class SlowNews:
+        async def get_team_news(self, team_name):
+            await asyncio.sleep(0.1)
+            return [{"title": team_name}]
+
+    agent = PsychAgent(news_provider=SlowNews())
+    started = time.perf_counter()
+    home_news, away_news = await agent._fetch_news("Arsenal_Liverpool_2026-02-04_PL")
+
+    assert time.perf_counter() - started < 0.18
+    assert home_news == [{"title": "Arsenal"}] and away_news == [{"title": "Liverpool"}]
+
+
+def test_quota_is_shared_between_processes(tmp_path):
+    # Two instances on one file stand for the TUI and the daemon
+    tui, daemon = DailyQuota("newsapi", 3, tmp_path / "quota.db"), DailyQuota("newsapi", 3, tmp_path / "quota.db")
+
+    granted = [quota.try_consume() for quota in (tui, daemon, tui, daemon, tui)]
+
+    assert granted == [True, True, True, False, False]
+    assert tui.used == daemon.used == 3
+    daemon.exhaust()
+    assert DailyQuota("other", 3, tmp_path / "quota.db").remaining == 3  # counted per API
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the append-only columnar odds history.
+"""
+import time
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.base import AgentState
+from src.agents.market import MarketAgent
+from src.core.llm import LLMFactory
+from src.core.market_provider import MarketDataProvider
+from src.core.odds_store import OddsStore
+
+MATCH = "Arsenal_Liverpool_2026-02-04_PL"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = OddsStore(tmp_path / "odds")
+    store.record(MATCH, {"home_win": 2.30, "draw": 3.40}, bookmaker="bet365", timestamp=100)
+    store.record(MATCH, {"home_win": 2.10, "draw": 3.50}, bookmaker="bet365", timestamp=200)
+    store.record(MATCH, {"home_win": 2.15}, bookmaker="pinnacle", timestamp=150)
+    store.record("Lyon_Nice_2026-02-04_L1", {"home_win": 1.80}, bookmaker="bet365", timestamp=120)
+    return store
+
+
+def test_latest_opening_and_movement(store):
+    assert store.latest(MATCH) == {"home_win": 2.10, "draw": 3.50}
+    assert store.latest(MATCH, bookmaker="pinnacle") == {"home_win": 2.15}
+    assert store.latest(MATCH, at=160) == {"home_win": 2.15, "draw": 3.40}
+    assert store.opening(MATCH) == {"home_win": 2.30, "draw": 3.40}
+    assert store.movement(MATCH)["home_win"]["change"] == pytest.approx(2.10 / 2.30 - 1, abs=1e-4)
+    assert store.latest("Unknown_Match") == {}
+
+
+def test_range_scan_is_time_ordered(store):
+    rows = store.scan(match_id=MATCH, market="home_win", start=120, end=200)
+
+    assert list(rows["price"]) == [2.15, 2.10]
+    assert list(rows["bookmaker"]) == ["pinnacle", "bet365"]
+    assert len(store.scan(bookmaker="bet365")["price"]) == 5
+
+
+def test_reopened_store_reads_history_and_repairs_torn_append(store, tmp_path):
+    # Simulate a crash after writing only the first column of a new row
+    with open(store._column_path("match"), "ab") as f:
+        np.array([0], dtype="<i4").tofile(f)
+
+    reopened = OddsStore(tmp_path / "odds")
+
+    assert len(reopened) == 6
+    assert reopened.latest(MATCH) == {"home_win": 2.10, "draw": 3.50}
+    reopened.record(MATCH, {"away_win": 3.30}, timestamp=300)
+    assert reopened.latest(MATCH)["away_win"] == 3.30
+
+
+def test_bulk_load_football_data_csv(tmp_path):
+    csv_path = tmp_path / "E0.csv"
+    csv_path.write_text(
+        "Div,Date,Time,HomeTeam,AwayTeam,B365H,B365D,B365A,B365>2.5,P>2.5,AvgH\n"
+        "E0,16/08/2025,20:00,Liverpool,Bournemouth,1.30,6.00,9.50,1.40,1.42,1.31\n"
+        "E0,17/08/2025,14:00,Man United,Arsenal,3.60,3.60,2.05,,1.85,3.55\n",
+        encoding="utf-8",
+    )
+    store = OddsStore(tmp_path / "odds")
+
+    assert store.load_csv(csv_path) == 11  # 6 + 5 (one missing price skipped)
+    assert store.latest("Liverpool_Bournemouth_2025-08-16_PL", bookmaker="bet365")["over_2_5"] == 1.40
+    assert store.latest("Man_United_Arsenal_2025-08-17_PL", bookmaker="pinnacle") == {"over_2_5": 1.85}
+
+
+def test_bulk_load_long_csv_and_range_scan_speed(tmp_path):
+    csv_path = tmp_path / "history.csv"
+    lines = ["match_id,market,bookmaker,timestamp,price"]
+    lines += [f"M{i % 500},home_win,bet365,{i},{1.5 + (i % 7) / 10}" for i in range(20_000)]
+    csv_path.write_text("\n".join(lines), encoding="utf-8")
+    store = OddsStore(tmp_path / "odds")
+
+    assert store.load_csv(csv_path) == 20_000
+    started = time.perf_counter()
+    rows = store.scan(match_id="M42", start=5_000, end=15_000)
+    latest = store.latest("M42")
+
+    assert time.perf_counter() - started < 0.5
+    assert len(rows["price"]) == 20
+    assert latest == {"home_win": 1.5 + (19_542 % 7) / 10}
+
+
+def test_unknown_csv_layout_is_rejected(tmp_path):
+    csv_path = tmp_path / "other.csv"
+    csv_path.write_text("a,b\n1,2\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        OddsStore(tmp_path / "odds").load_csv(csv_path)
+
+
+class SilentMarket(MarketDataProvider):
+    async def get_odds(self, match_id):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_agents_read_current_and_opening_prices(store, monkeypatch):
+    monkeypatch.setattr(LLMFactory, "create", lambda *a, **k: None)
+    from src.agents.value_hunter import ValueHunterAgent
+
+    state = AgentState(
+        match_id=MATCH,
+        match_data={"prior": {"home_win": 0.55, "draw": 0.25, "away_win": 0.20}},
+        analysis_reports={},
+    )
+    state = await MarketAgent(SilentMarket(), store=store).execute(state)
+
+    assert state.market_data == {"home_win": 2.10, "draw": 3.50}
+    assert state.analysis_reports["market_movement"]["home_win"]["opening"] == 2.30
+
+    state.market_data = None  # the hunter reads the store itself
+    state = await ValueHunterAgent(store=store).execute(state)
+    best = state.analysis_reports["value_scan"][0]
+    assert best["market"] == "home_win"
+    assert best["opening_odds"] == 2.30
+    assert best["line_move"] < 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
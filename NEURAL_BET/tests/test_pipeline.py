@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the shared analysis pipeline (agent graph + progress events).
+"""
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.base import AgentState, BaseAgent
+from src.core.exceptions import CriticalAgentError
+from src.pipeline import AnalysisPipeline
+
+MATCH_ID = "Arsenal_Liverpool_2026-02-04_PL"
+
+
+class FakeAgent(BaseAgent):
+    def __init__(self, name, critical=False, fail=False, delay=0.0):
+        super().__init__(name=name, role="Test")
+        self.is_critical = critical
+        self.fail = fail
+        self.delay = delay
+
+    async def process(self, state: AgentState) -> AgentState:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        if self.name == "data_miner":
+            state.match_data = {"home": "Arsenal"}
+        state.analysis_reports[f"{self.name}_report"] = self.name
+        return state
+
+
+def make_agents(**overrides):
+    agents = {name: FakeAgent(name) for name in (
+        "metrician", "tactician", "psych", "xfactor", "devils_advocate", "orchestrator"
+    )}
+    agents["data_miner"] = FakeAgent("data_miner", critical=True)
+    agents.update(overrides)
+    return agents
+
+
+@pytest.mark.asyncio
+async def test_full_run_reports_stages_and_merges_reports():
+    events = []
+    pipeline = AnalysisPipeline(agents=make_agents(), on_event=lambda e, s, d: events.append((e, s)))
+
+    state = await pipeline.run(MATCH_ID)
+
+    assert {"metrician_report", "psych_report", "orchestrator_report"} <= set(state.analysis_reports)
+    assert events[0] == ("started", "data_miner")
+    assert events[-1] == ("done", "orchestrator")
+    assert not state.errors
+
+
+@pytest.mark.asyncio
+async def test_data_miner_failure_stops_the_run():
+    events = []
+    agents = make_agents(data_miner=FakeAgent("data_miner", critical=True, fail=True))
+    pipeline = AnalysisPipeline(agents=agents, on_event=lambda e, s, d: events.append((e, s)))
+
+    with pytest.raises(CriticalAgentError):
+        await pipeline.run(MATCH_ID)
+    assert events == [("started", "data_miner"), ("failed", "data_miner")]
+
+
+@pytest.mark.asyncio
+async def test_swarm_failures_degrade():
+    events = []
+    agents = make_agents(
+        tactician=FakeAgent("tactician", critical=True, fail=True),
+        psych=FakeAgent("psych", fail=True),  # Non-critical: degrades without raising
+    )
+    pipeline = AnalysisPipeline(agents=agents, on_event=lambda e, s, d: events.append((e, s)))
+    state = await pipeline.run(MATCH_ID)
+
+    assert "tactician_report" not in state.analysis_reports
+    assert "orchestrator_report" in state.analysis_reports
+    assert any("tactician" in err for err in state.errors)
+    assert ("failed", "tactician") in events and ("failed", "psych") in events
+    assert ("done", "metrician") in events
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_run_cancels_agents():
+    agents = make_agents(psych=FakeAgent("psych", delay=5))
+    task = asyncio.create_task(AnalysisPipeline(agents=agents).run(MATCH_ID))
+    await asyncio.sleep(0.05)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the vectorized Poisson / Dixon-Coles score model.
+"""
+import math
+import time
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.core.poisson import (
+    batch_priors, expected_goals, market_probabilities, match_prior, score_matrix,
+)
+
+
+def side(avg_xg, avg_xga, season_xg=None, season_xga=None, played=20):
+    stats = {"understat_form": {"avg_xg": avg_xg, "avg_xga": avg_xga}}
+    if season_xg is not None:
+        stats["fbref_stats"] = {"matches_played": played, "xG": season_xg, "xGA": season_xga}
+    return stats
+
+
+def match(home, away):
+    return {"home_team": "Arsenal", "away_team": "Liverpool", "stats": {"home": home, "away": away}}
+
+
+def test_independent_poisson_matches_closed_form():
+    matrix = score_matrix(1.6, 1.1, rho=0.0)[0]
+
+    def pmf(k, lam):
+        return lam ** k * math.exp(-lam) / math.factorial(k)
+
+    assert matrix.sum() == pytest.approx(1.0)
+    assert matrix[2, 1] == pytest.approx(pmf(2, 1.6) * pmf(1, 1.1), rel=1e-3)
+
+
+def test_dixon_coles_moves_mass_to_low_draws():
+    plain = market_probabilities(score_matrix(1.3, 1.3, rho=0.0))
+    corrected = market_probabilities(score_matrix(1.3, 1.3, rho=-0.1))
+
+    assert corrected["draw"][0] > plain["draw"][0]
+    assert corrected["home_win"][0] == pytest.approx(corrected["away_win"][0])
+
+
+def test_market_probabilities_are_consistent():
+    probs = market_probabilities(score_matrix([1.8, 0.9], [0.7, 1.4]))
+
+    total = probs["home_win"] + probs["draw"] + probs["away_win"]
+    assert np.allclose(total, 1.0)
+    assert np.allclose(probs["over_2_5"] + probs["under_2_5"], 1.0)
+    assert probs["home_win"][0] > probs["away_win"][0]
+    assert probs["away_win"][1] > probs["home_win"][1]
+
+
+def test_home_advantage_and_opponent_defence_drive_rates():
+    lam_home, lam_away = expected_goals(1.5, 1.0, 1.5, 1.0)
+    assert lam_home[0] > lam_away[0]
+
+    weak_defence, _ = expected_goals(1.5, 1.0, 1.5, 2.0)
+    assert weak_defence[0] > lam_home[0]
+
+
+def test_match_prior_blends_form_and_season():
+    prior = match_prior(match(side(2.1, 0.8, 40.0, 20.0), side(1.2, 1.5)))
+
+    assert prior["model"] == "dixon-coles"
+    assert prior["home_win"] > prior["away_win"]
+    assert prior["most_likely_score"] in {"1-0", "2-0", "2-1", "1-1"}
+
+
+def test_missing_data_gives_no_prior():
+    broken = match({"understat_form": {"error": "blocked"}, "fbref_stats": "Error"}, side(1.2, 1.5))
+    assert match_prior(broken) is None
+    assert match_prior({"error": "Hybrid Fetch Failed"}) is None
+
+
+def test_batch_equals_single_matches():
+    matches = [
+        match(side(2.1, 0.8), side(1.2, 1.5)),
+        {"error": "no data"},
+        match(side(1.0, 1.6), side(1.9, 0.9)),
+    ]
+
+    priors = batch_priors(matches)
+
+    assert priors[1] is None
+    assert priors[0] == match_prior(matches[0])
+    assert priors[2] == match_prior(matches[2])
+
+
+def test_matchday_priced_in_one_array_operation():
+    rng = np.random.default_rng(7)
+    lam_home, lam_away = rng.uniform(0.5, 2.5, 10_000), rng.uniform(0.5, 2.5, 10_000)
+
+    started = time.perf_counter()
+    probs = market_probabilities(score_matrix(lam_home, lam_away))
+
+    assert time.perf_counter() - started < 2.0
+    assert probs["home_win"].shape == (10_000,)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
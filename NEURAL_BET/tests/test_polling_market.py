@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the polling odds provider against the local odds feed stand-in.
+Runs fully offline.
+"""
+import asyncio
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.base import AgentState
+from src.agents.market import MarketAgent
+from src.core.fixture_calendar import FixtureCalendar
+from src.core.odds_store import OddsStore
+from src.providers.polling_market_provider import PollingMarketProvider
+from src.replay.odds_feed_server import FEED_MARKETS, OddsFeedServer, generate_odds
+
+MATCH = "Arsenal_Liverpool_2099-02-04_PL"
+
+
+def test_generated_books_are_stable_with_a_margin():
+    odds = generate_odds(MATCH)
+
+    assert odds == generate_odds(MATCH)
+    assert set(odds) == set(FEED_MARKETS)
+    assert 1.0 < sum(1 / odds[m] for m in ("home_win", "draw", "away_win")) < 1.1
+
+
+@pytest.mark.asyncio
+async def test_bulk_poll_serves_odds_from_memory(tmp_path):
+    watched = [f"Team{i}_Other{i}" for i in range(250)]
+    async with OddsFeedServer() as feed:
+        market = PollingMarketProvider(base_url=feed.base_url, watch=watched, store=OddsStore(tmp_path), batch_size=100)
+        try:
+            assert await market.poll_once() == 250 * len(FEED_MARKETS)
+            assert feed.stats["served"] == 3  # 250 fixtures in 3 bulk requests
+
+            odds = await market.get_odds("Team7_Other7")
+        finally:
+            await market.close()
+
+    assert odds == generate_odds("Team7_Other7")
+    assert feed.stats["served"] == 3  # no request on the analysis path
+
+
+@pytest.mark.asyncio
+async def test_only_changed_prices_are_stored(tmp_path):
+    store = OddsStore(tmp_path)
+    async with OddsFeedServer() as feed:
+        market = PollingMarketProvider(base_url=feed.base_url, watch=[MATCH], store=store)
+        try:
+            await market.poll_once()
+            assert await market.poll_once() == 0  # nothing moved
+
+            feed.set_odds(MATCH, {"home_win": 1.95})
+            assert await market.poll_once() == 1
+        finally:
+            await market.close()
+
+    assert len(store) == len(FEED_MARKETS) + 1
+    assert store.latest(MATCH)["home_win"] == 1.95
+    assert store.movement(MATCH)["home_win"]["opening"] == generate_odds(MATCH)["home_win"]
+
+
+@pytest.mark.asyncio
+async def test_background_loop_and_unwatched_fixture(tmp_path):
+    async with OddsFeedServer(change_rate=1.0, seed=3) as feed:
+        async with PollingMarketProvider(base_url=feed.base_url, interval=0.05, watch=[MATCH]) as market:
+            await asyncio.sleep(0.3)
+            assert market.stats["polls"] >= 3
+            assert market.stats["changed_prices"] > len(FEED_MARKETS)
+
+            # Not watched yet: fetched once, then polled with the others
+            odds = await market.get_odds("Lyon_Nice")
+            assert odds and market.stats["misses"] == 1
+            assert "Lyon_Nice" in market.watched
+
+
+@pytest.mark.asyncio
+async def test_feed_errors_keep_last_prices():
+    async with OddsFeedServer() as feed:
+        market = PollingMarketProvider(base_url=feed.base_url, watch=[MATCH])
+        try:
+            await market.poll_once()
+            feed.error_rate = 1.0
+            assert await market.poll_once() == 0
+            odds = await market.get_odds(MATCH)
+            assert await market.get_odds("Unknown_Match") is None
+        finally:
+            await market.close()
+
+    assert odds == generate_odds(MATCH)
+    assert market.stats["errors"] == 2
+
+
+def test_watch_teams_from_calendar(tmp_path):
+    calendar = FixtureCalendar(path=tmp_path / "calendar.json")
+    calendar.replace([{"home": "Arsenal", "away": "Liverpool", "date": "2099-02-04", "time": "20:00", "league": "PL"}])
+    market = PollingMarketProvider(base_url="http://127.0.0.1:1")
+
+    assert market.watch_teams(calendar, ["Liverpool", "Atlantis"]) == ["Arsenal_Liverpool_2099-02-04_PL"]
+    assert market.watched == ["Arsenal_Liverpool_2099-02-04_PL"]
+
+
+def test_played_and_idle_fixtures_leave_the_watch_list(tmp_path):
+    calendar = FixtureCalendar(path=tmp_path / "calendar.json")
+    calendar.replace([
+        {"home": "Arsenal", "away": "Liverpool", "date": "2099-02-04", "time": "20:00", "league": "PL"},
+        {"home": "Chelsea", "away": "Arsenal", "date": "2099-02-11", "time": "17:30", "league": "PL"},
+    ])
+    market = PollingMarketProvider(base_url="http://127.0.0.1:1", watch=["Lyon_Nice_2020-01-01_L1", "Lyon_Nice"])
+    market.watch_teams(calendar, ["Arsenal"])
+    market._odds["Arsenal_Liverpool_2099-02-04_PL"] = {"home_win": 2.0}
+
+    market.refresh_watch()
+    assert market.watched == ["Lyon_Nice", "Arsenal_Liverpool_2099-02-04_PL"]  # the 2020 match was played
+
+    # The matchday is played: Arsenal's next fixture replaces it on the next cycle
+    market.refresh_watch(now=time.mktime((2099, 2, 5, 12, 0, 0, 0, 0, -1)))
+    assert market.watched == ["Chelsea_Arsenal_2099-02-11_PL"]  # "Lyon_Nice" idle for days
+    assert "Arsenal_Liverpool_2099-02-04_PL" not in market._odds
+
+
+@pytest.mark.asyncio
+async def test_market_agent_uses_polled_prices(tmp_path):
+    store = OddsStore(tmp_path)
+    async with OddsFeedServer() as feed:
+        market = PollingMarketProvider(base_url=feed.base_url, watch=[MATCH], store=store)
+        try:
+            await market.poll_once()
+            state = await MarketAgent(market, store=store).execute(AgentState(match_id=MATCH))
+        finally:
+            await market.close()
+
+    assert state.market_data == generate_odds(MATCH)
+    assert len(store) == len(FEED_MARKETS)  # the agent doesn't re-record the snapshot
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
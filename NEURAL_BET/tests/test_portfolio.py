@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the matchday portfolio (multi-bet Kelly) optimiser.
+"""
+import time
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.base import AgentState
+from src.core.portfolio import card_bets, optimise_card, optimise_stakes, simulate_outcomes
+
+
+def bet(match_id, market, odds, prob, **extra):
+    return {"match_id": match_id, "market": market, "odds": odds, "prob": prob, **extra}
+
+
+def test_single_bet_matches_kelly():
+    # p=0.55 at evens: full Kelly = (0.55 * 2 - 1) / 1 = 0.10
+    wins = np.random.default_rng(0).random((200_000, 1)) < 0.55
+    stakes = optimise_stakes(np.array([2.0]), wins, max_stake=1.0, max_exposure=0.99, max_match_exposure=0.99)
+
+    assert stakes[0] == pytest.approx(0.10, abs=0.01)
+
+
+def test_exclusive_outcomes_of_one_match():
+    wins = simulate_outcomes([bet("m1", "home_win", 2.5, 0.5), bet("m1", "away_win", 4.0, 0.3)], 50_000, seed=1)
+
+    assert not (wins[:, 0] & wins[:, 1]).any()
+    assert wins[:, 0].mean() == pytest.approx(0.5, abs=0.01)
+
+
+def test_scoreline_settlement_correlates_markets():
+    rates = {"lambda_home": 1.9, "lambda_away": 0.9}
+    wins = simulate_outcomes([bet("m1", "home_win", 1.9, 0.6, **rates), bet("m1", "over_2_5", 2.0, 0.55, **rates)], 50_000, seed=2)
+
+    assert np.corrcoef(wins.T)[0, 1] > 0.1
+
+
+def test_scorelines_keep_the_verdict_probabilities():
+    # Poisson prior gives the home side ~0.40; the verdict anchored it at 0.65
+    rates = {"lambda_home": 1.35, "lambda_away": 1.2}
+    bets = [bet("m1", "home_win", 2.20, 0.65, **rates), bet("m1", "over_2_5", 2.0, 0.45, **rates)]
+    wins = simulate_outcomes(bets, 50_000, seed=7)
+
+    assert wins[:, 0].mean() == pytest.approx(0.65, abs=0.01)
+    assert wins[:, 1].mean() == pytest.approx(0.45, abs=0.01)
+
+    with_prior = optimise_card(bets[:1], seed=8)["bets"][0]["portfolio_stake"]
+    without_prior = optimise_card([bet("m1", "home_win", 2.20, 0.65)], seed=8)["bets"][0]["portfolio_stake"]
+    assert with_prior > 0
+    assert with_prior == pytest.approx(without_prior, abs=0.005)
+
+
+def test_portfolio_respects_exposure_constraints():
+    bets = [bet(f"m{i}", "home_win", 2.2, 0.6) for i in range(20)] + [bet("m0", "draw", 4.5, 0.3)]
+
+    portfolio = optimise_card(bets, max_stake=0.05, max_exposure=0.20, max_match_exposure=0.06, seed=3)
+    stakes = np.array([b["portfolio_stake"] for b in portfolio["bets"]])
+
+    assert stakes.max() <= 0.05 + 1e-4
+    assert portfolio["exposure"] <= 0.20 + 1e-3
+    assert stakes[0] + stakes[-1] <= 0.06 + 1e-4
+    assert portfolio["expected_growth"] > 0
+    assert all(b["portfolio_units"] >= 1 for b in portfolio["bets"] if b["portfolio_stake"] > 0)
+
+
+def test_negative_value_gets_no_stake():
+    portfolio = optimise_card([bet("m1", "home_win", 2.0, 0.6), bet("m2", "home_win", 2.0, 0.4)], seed=4)
+
+    assert portfolio["bets"][0]["portfolio_stake"] > 0
+    assert portfolio["bets"][1]["portfolio_stake"] == 0
+
+
+def test_hundred_selections_under_a_second():
+    rng = np.random.default_rng(5)
+    markets = ("home_win", "draw", "away_win", "over_2_5", "btts_yes")
+    bets = [
+        bet(f"m{i // 3}", markets[i % 5], float(odds), float(prob))
+        for i, (odds, prob) in enumerate(zip(rng.uniform(1.6, 5.0, 120), rng.uniform(0.2, 0.6, 120)))
+    ]
+
+    started = time.perf_counter()
+    portfolio = optimise_card(bets, seed=6)
+
+    assert time.perf_counter() - started < 1.0
+    assert len(portfolio["bets"]) == 120
+    assert portfolio["exposure"] <= 0.25 + 1e-3
+
+
+def test_card_bets_from_analysed_matches():
+    states = [
+        AgentState(
+            match_id="Arsenal_Liverpool",
+            match_data={"prior": {"lambda_home": 1.7, "lambda_away": 1.1}},
+            analysis_reports={"value_scan": [bet("Arsenal_Liverpool", "home_win", 2.3, 0.5)]},
+        ),
+        AgentState(match_id="Lyon_Nice", match_data={}, analysis_reports={}),
+    ]
+
+    bets = card_bets(states)
+
+    assert bets == [bet("Arsenal_Liverpool", "home_win", 2.3, 0.5, lambda_home=1.7, lambda_away=1.1)]
+    assert optimise_card(bets)["bets"][0]["portfolio_stake"] > 0
+
+
+def test_empty_card():
+    assert optimise_card([]) == {"bets": [], "exposure": 0.0, "expected_growth": 0.0}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
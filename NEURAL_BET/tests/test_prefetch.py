@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the speculative match prefetcher used at dispatch confirmation time.
+"""
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.core.data_provider import MatchDataProvider
+from src.core.news_provider import NewsDataProvider
+from src.core.prefetch import MatchPrefetcher
+
+MATCH_ID = "Arsenal_Liverpool_2026-02-04_PL"
+
+
+class SlowProvider(MatchDataProvider):
+    def __init__(self, delay=0.05, payload=None):
+        self.delay = delay
+        self.payload = payload or {"home_xg": 1.8, "away_xg": 1.1}
+        self.calls = 0
+        self.cancelled = 0
+
+    async def get_match_stats(self, match_id):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return dict(self.payload)
+
+    async def get_team_form(self, team_id, last_n=5):
+        return {"form": "WWDLW"}
+
+
+class CountingNews(NewsDataProvider):
+    def __init__(self):
+        self.calls = []
+
+    async def get_team_news(self, team_name):
+        self.calls.append(team_name)
+        await asyncio.sleep(0.01)
+        return [{"title": f"{team_name} news"}]
+
+
+@pytest.mark.asyncio
+async def test_confirmed_match_uses_prefetched_data():
+    provider, news = SlowProvider(), CountingNews()
+    prefetcher = MatchPrefetcher(provider, news)
+    prefetcher.prefetch(MATCH_ID)
+    prefetcher.prefetch(MATCH_ID)  # Re-proposing the same match doesn't refetch
+
+    stats = await prefetcher.match_provider.get_match_stats(MATCH_ID)
+    home_news = await prefetcher.news_provider.get_team_news("Arsenal")
+    away_news = await prefetcher.news_provider.get_team_news("Liverpool")
+
+    assert stats["home_xg"] == 1.8
+    assert home_news[0]["title"] == "Arsenal news" and away_news[0]["title"] == "Liverpool news"
+    assert provider.calls == 1
+    assert sorted(news.calls) == ["Arsenal", "Liverpool"]
+
+    # Consumed: a second run fetches live
+    await prefetcher.match_provider.get_match_stats(MATCH_ID)
+    assert provider.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_match_is_cancelled():
+    provider = SlowProvider(delay=5)
+    prefetcher = MatchPrefetcher(provider, CountingNews())
+    prefetcher.prefetch(MATCH_ID)
+    await asyncio.sleep(0)  # Let the fetch start
+
+    prefetcher.cancel(MATCH_ID)
+    await asyncio.sleep(0)
+    assert provider.cancelled == 1
+    assert await prefetcher.take(("stats", MATCH_ID)) is None
+
+
+@pytest.mark.asyncio
+async def test_rejecting_a_candidate_keeps_news_shared_with_another():
+    news = CountingNews()
+    prefetcher = MatchPrefetcher(SlowProvider(), news)
+    prefetcher.prefetch(MATCH_ID)
+    prefetcher.prefetch("Chelsea_Arsenal_2026-02-11_PL")
+
+    prefetcher.cancel("Chelsea_Arsenal_2026-02-11_PL")
+    assert await prefetcher.take(("news", "Chelsea")) is None
+    assert (await prefetcher.take(("news", "Arsenal")))[0]["title"] == "Arsenal news"  # still prefetched
+    assert news.calls.count("Arsenal") == 1
+
+    prefetcher.cancel(MATCH_ID)
+    assert await prefetcher.take(("news", "Liverpool")) is None
+
+
+@pytest.mark.asyncio
+async def test_errors_and_stale_results_fall_back_to_live_fetch():
+    provider = SlowProvider(delay=0, payload={"error": "Understat Error: HTTP_429"})
+    prefetcher = MatchPrefetcher(provider, CountingNews())
+    prefetcher.prefetch(MATCH_ID)
+    await prefetcher.match_provider.get_match_stats(MATCH_ID)
+    assert provider.calls == 2  # Error payload was not served
+
+    provider = SlowProvider(delay=0)
+    prefetcher = MatchPrefetcher(provider, CountingNews(), ttl=-1)
+    prefetcher.prefetch(MATCH_ID)
+    await asyncio.sleep(0.01)
+    await prefetcher.match_provider.get_match_stats(MATCH_ID)
+    assert provider.calls == 2  # Stale prefetch was discarded
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the incremental team rating table (Elo + xG attack/defence),
+its Understat feed and its use by the DataMinerAgent.
+"""
+import copy
+import pytest
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.base import AgentState
+from src.agents.data_miner import DataMinerAgent
+from src.core.cache import get_cache
+from src.core.data_provider import MatchDataProvider
+from src.core.ratings import ELO_START, RatingTable
+from src.providers.understat_provider import UnderstatProvider
+from src.replay.understat_server import UnderstatReplayServer
+
+
+def result(match_id, home, away, home_goals, away_goals, date="2025-08-16", **xg):
+    return {"match_id": match_id, "date": date, "home": home, "away": away,
+            "home_goals": home_goals, "away_goals": away_goals, **xg}
+
+
+def test_elo_is_zero_sum_and_idempotent():
+    table = RatingTable()
+    results = [result("1", "Arsenal", "Chelsea", 3, 0, home_xg=2.6, away_xg=0.4)]
+
+    assert table.update(results) == 1
+    assert table.update(results) == 0  # same match id: no-op
+
+    arsenal, chelsea = table.get("Arsenal"), table.get("Chelsea FC")  # aliases share a rating
+    assert arsenal["elo"] > ELO_START > chelsea["elo"]
+    assert arsenal["elo"] + chelsea["elo"] == pytest.approx(2 * ELO_START)
+    assert arsenal["attack"] > 1.0 > arsenal["defence"]
+    assert arsenal["matches"] == 1
+
+
+def test_results_apply_in_date_order():
+    late_first = [
+        result("2", "Arsenal", "Chelsea", 0, 1, date="2025-09-01"),
+        result("1", "Chelsea", "Arsenal", 0, 4, date="2025-08-16"),
+    ]
+    in_order = list(reversed(late_first))
+    a, b = RatingTable(), RatingTable()
+    a.update(late_first)
+    b.update(in_order)
+
+    assert a.get("Arsenal") == b.get("Arsenal")
+    assert a.get("Arsenal")["last_match"] == "2025-09-01"
+
+
+def test_pages_in_any_order_give_the_same_ratings(tmp_path):
+    # Two team pages: each sorted on its own, but interleaved in time
+    arsenal_page = [
+        result("1", "Arsenal", "Chelsea", 3, 0, date="2025-08-16"),
+        result("3", "Everton", "Arsenal", 1, 1, date="2025-08-30"),
+    ]
+    everton_page = [
+        result("2", "Everton", "Chelsea", 2, 1, date="2025-08-23"),
+        result("3", "Everton", "Arsenal", 1, 1, date="2025-08-30"),
+    ]
+    a, b = RatingTable(tmp_path / "ratings.json"), RatingTable()
+    a.update(arsenal_page)
+    assert a.update(everton_page) == 1  # older than the last applied date: replayed
+    b.update(everton_page)
+    b.update(arsenal_page)
+
+    assert a.teams == b.teams
+    assert a.league_xg == b.league_xg
+    assert RatingTable(tmp_path / "ratings.json").teams == a.teams
+
+
+def test_match_ratings_and_persistence(tmp_path):
+    path = tmp_path / "ratings.json"
+    table = RatingTable(path)
+    table.update([result("1", "Arsenal", "Chelsea", 2, 2), result("2", "Chelsea", "Everton", 1, 0, date="2025-08-23")])
+
+    reloaded = RatingTable(path)
+    ratings = reloaded.match_ratings("Everton", "Arsenal")
+
+    assert reloaded.teams == table.teams
+    assert ratings["home"]["team"] == "Everton"
+    assert 0 < ratings["home_expectation"] < 1
+    assert reloaded.match_ratings("Arsenal", "Atlantis") is None
+    assert reloaded.update([result("2", "Chelsea", "Everton", 1, 0)]) == 0
+
+
+@pytest.mark.asyncio
+async def test_understat_pages_feed_the_table(tmp_path):
+    await get_cache().clear()
+    table = RatingTable(tmp_path / "ratings.json")
+    async with UnderstatReplayServer() as server:
+        async with UnderstatProvider(base_url=server.base_url, ratings=table) as provider:
+            await provider.get_team_form("Arsenal")
+            assert table.get("Arsenal")["matches"] == 38  # the 2024 season
+
+            await provider.get_team_dates("Liverpool", 2024)
+            teams = copy.deepcopy(table.teams)
+            await provider.get_team_dates("Arsenal", 2024)  # same results again
+
+    assert table.get("Liverpool")["matches"] >= 38
+    assert table.teams == teams
+    assert RatingTable(tmp_path / "ratings.json").teams == teams
+
+
+class StaticProvider(MatchDataProvider):
+    async def get_match_stats(self, match_id):
+        return {"id": match_id, "home_team": "Arsenal", "away_team": "Chelsea", "stats": {}}
+
+    async def get_team_form(self, team_id, last_n=5):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_data_miner_adds_ratings():
+    table = RatingTable()
+    table.update([result("1", "Arsenal", "Chelsea", 2, 0)])
+
+    state = await DataMinerAgent(StaticProvider(), ratings=table).execute(AgentState(match_id="Arsenal_Chelsea"))
+
+    assert state.match_data["ratings"]["home"]["elo"] > state.match_data["ratings"]["away"]["elo"]
+    assert "Elo" in state.analysis_reports["miner_report"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
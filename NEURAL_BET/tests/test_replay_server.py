@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the local Understat replay server and provider base-URL setting.
+Runs fully offline against recordings in src/replay/recordings.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.replay.understat_server import UnderstatReplayServer
+from src.providers.understat_provider import UnderstatProvider
+from src.core.cache import get_cache
+
+
+@pytest.mark.asyncio
+async def test_provider_reads_team_form_from_replay():
+    await get_cache().clear()
+    async with UnderstatReplayServer() as server:
+        async with UnderstatProvider(base_url=server.base_url) as provider:
+            form = await provider.get_team_form("Arsenal", last_n=5)
+
+    assert "error" not in form
+    assert form["matches_analyzed"] == 5
+    assert form["avg_xg"] > 0
+    assert server.stats["served"] == 1
+
+
+@pytest.mark.asyncio
+async def test_provider_finds_next_fixture_from_replay():
+    async with UnderstatReplayServer() as server:
+        async with UnderstatProvider(base_url=server.base_url) as provider:
+            fixture = await provider.get_next_fixture("Liverpool")
+
+    assert fixture is not None
+    assert fixture["date"] >= "2026-02-02"
+    assert fixture["opponent"] != "Liverpool"
+
+
+@pytest.mark.asyncio
+async def test_injected_rate_limit_surfaces_as_error():
+    await get_cache().clear()
+    async with UnderstatReplayServer(error_rate=1.0, error_status=429) as server:
+        async with UnderstatProvider(base_url=server.base_url) as provider:
+            form = await provider.get_team_form("Arsenal")
+            fixture = await provider.get_next_fixture("Arsenal")
+
+    assert "429" in form["error"]
+    assert fixture is None
+    assert server.stats["injected_errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_team_returns_404():
+    async with UnderstatReplayServer() as server:
+        async with UnderstatProvider(base_url=server.base_url) as provider:
+            form = await provider.get_team_form("Atlantis FC")
+
+    assert "404" in form["error"]
+    assert server.stats["not_found"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
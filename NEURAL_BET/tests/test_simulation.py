@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the batched Monte Carlo match simulator.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.core.data_provider import MatchDataProvider
+from src.core.poisson import market_probabilities, score_matrix
+from src.core.simulation import simulate, simulate_matchday
+
+LAM_HOME = np.array([1.8, 0.9, 1.3])
+LAM_AWAY = np.array([0.8, 1.6, 1.3])
+
+
+def test_seeded_runs_are_reproducible():
+    first = simulate(LAM_HOME, LAM_AWAY, n_sims=20_000, seed=42)
+    second = simulate(LAM_HOME, LAM_AWAY, n_sims=20_000, seed=42)
+
+    assert np.array_equal(first["home_win"], second["home_win"])
+    assert not np.array_equal(first["home_win"], simulate(LAM_HOME, LAM_AWAY, n_sims=20_000, seed=7)["home_win"])
+
+
+def test_converges_to_dixon_coles_probabilities():
+    simulated = simulate(LAM_HOME, LAM_AWAY, n_sims=200_000, seed=1)
+    exact = market_probabilities(score_matrix(LAM_HOME, LAM_AWAY))
+
+    for key in ("home_win", "draw", "away_win", "over_2_5", "btts_yes"):
+        assert np.allclose(simulated[key], exact[key], atol=4 * simulated["stderr"].max() + 1e-3), key
+    assert np.allclose(simulated["home_win"] + simulated["draw"] + simulated["away_win"], 1.0)
+
+
+def test_chunked_mode_bounds_memory_and_agrees():
+    full = simulate(LAM_HOME, LAM_AWAY, n_sims=60_000, seed=3)
+    chunked = simulate(LAM_HOME, LAM_AWAY, n_sims=60_000, seed=3, max_chunk_elements=9_000)  # 3k draws/chunk
+
+    assert np.allclose(full["over_2_5"], chunked["over_2_5"], atol=0.01)
+    assert np.allclose(chunked["under_2_5"] + chunked["over_2_5"], 1.0)
+
+
+class StatsProvider(MatchDataProvider):
+    async def get_match_stats(self, match_id):
+        if match_id.startswith("Atlantis"):
+            return {"error": "Hybrid Fetch Failed"}
+        form = {"avg_xg": 1.7, "avg_xga": 1.0}
+        return {"id": match_id, "stats": {"home": {"understat_form": form}, "away": {"understat_form": form}}}
+
+    async def get_team_form(self, team_id, last_n=5):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_simulate_matchday():
+    results = await simulate_matchday(
+        StatsProvider(), ["Arsenal_Liverpool", "Atlantis_Lyonesse"], n_sims=10_000, seed=5
+    )
+
+    assert results["Atlantis_Lyonesse"] is None
+    arsenal = results["Arsenal_Liverpool"]
+    assert arsenal["match_id"] == "Arsenal_Liverpool"
+    assert arsenal["home_win"] > arsenal["away_win"]  # same rates, home advantage
+    assert 0 < arsenal["btts_yes"] < 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the lazy start-up path and the import-time profile summary.
+"""
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.core.startup import parse_importtime, summarize_importtime
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:      4000 |      90000 | textual
+import time:       500 |       5000 |   rich.console
+time-to-interactive: 412 ms
+"""
+
+
+def test_importtime_summary():
+    rows = parse_importtime(SAMPLE)
+    assert rows[1] == ("textual", 4000, 90000)
+
+    summary = summarize_importtime(SAMPLE, top=2)
+    assert summary.splitlines()[0] == "time-to-interactive: 412 ms"
+    assert "90.0 ms  textual" in summary
+
+
+def test_tui_import_does_not_load_llm_sdks_or_providers():
+    code = (
+        "import sys; import src.tui; "
+        "heavy = [m for m in ('langchain_groq', 'langchain_mistralai', 'langchain_openai', "
+        "'understat', 'soccerdata', 'src.agents.dispatcher') if m in sys.modules]; "
+        "print(','.join(heavy))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=root_dir, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the team alias index and the rule-based date parser used by
+the dispatcher to skip the LLM extraction hop.
+"""
+import pytest
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.core.date_hints import parse_date_hint
+from src.core.team_names import get_team_index, teams_match
+from src.providers.fbref_provider import FBRefProvider
+
+TODAY = date(2026, 2, 2)  # A Monday
+
+
+def test_index_covers_every_supported_league():
+    assert set(get_team_index().leagues) == set(FBRefProvider.LEAGUE_MAP)
+
+
+@pytest.mark.parametrize("alias, expected", [
+    ("Barça", "Barcelona"),
+    ("FC Barcelona", "Barcelona"),
+    ("man utd", "Manchester United"),
+    ("Spurs", "Tottenham"),
+    ("PSG", "Paris Saint Germain"),
+    ("Bayern München", "Bayern Munich"),
+    ("Inter Milan", "Inter"),
+    ("Nott'ham Forest", "Nottingham Forest"),
+])
+def test_exact_aliases(alias, expected):
+    assert get_team_index().lookup(alias).name == expected
+
+
+def test_fuzzy_and_ambiguous_names():
+    index = get_team_index()
+    assert index.resolve("Arsnal").name == "Arsenal"
+    assert index.resolve("Liverpol").name == "Liverpool"
+    assert index.is_ambiguous("Paris")
+    assert index.resolve("Paris") is None
+    assert index.resolve("Manchester") is None
+    assert teams_match("Manchester Utd", "Manchester United")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Arsenal vs Liverpool 2026-02-04", "2026-02-04"),
+    ("Arsenal vs Liverpool le 04/02", "2026-02-04"),
+    ("OM - PSG le 4 février", "2026-02-04"),
+    ("Chelsea v Spurs on February 7th", "2026-02-07"),
+    ("Barça demain", "2026-02-03"),
+    ("Bayern ce soir", "2026-02-02"),
+    ("Juve samedi", "2026-02-07"),
+    ("Lyon lundi prochain", "2026-02-09"),
+    ("Real Madrid 1er janvier", "2027-01-01"),
+    ("Arsenal vs Liverpool", None),
+])
+def test_parse_date_hint(text, expected):
+    assert parse_date_hint(text, TODAY)[0] == expected
+
+
+def test_parse_query_clear_and_ambiguous():
+    index = get_team_index()
+
+    parsed = index.parse_query("Analyse le match Barça contre Real Madrid demain", TODAY)
+    assert parsed["confident"]
+    assert (parsed["team1"], parsed["team2"], parsed["date_hint"]) == ("Barcelona", "Real Madrid", "2026-02-03")
+    assert parsed["league"] == "LIGA"
+
+    parsed = index.parse_query("Arsnal vs Liverpol", TODAY)
+    assert parsed["confident"] and parsed["team2"] == "Liverpool"
+
+    assert not index.parse_query("Manchester match", TODAY)["confident"]
+    assert not index.parse_query("Paris ce soir", TODAY)["confident"]
+    assert not index.parse_query("qui va gagner ?", TODAY)["confident"]
+
+
+@pytest.mark.parametrize("text, team1", [
+    ("Liverpool vs Qarabag", "Liverpool"),  # unknown club
+    ("Reds vs Blues", "Liverpool"),  # one side unresolved
+])
+def test_one_sided_versus_query_goes_to_the_llm(text, team1):
+    parsed = get_team_index().parse_query(text, TODAY)
+
+    assert not parsed["confident"]
+    assert parsed["team1"] == team1 and parsed["team2"] is None
+
+
+def test_weekday_inside_a_club_name_is_not_a_date():
+    index = get_team_index()
+
+    parsed = index.parse_query("Arsenal vs Sheffield Wednesday", TODAY)
+    assert parsed["confident"]
+    assert (parsed["team1"], parsed["team2"], parsed["date_hint"]) == ("Arsenal", "Sheffield Wednesday", None)
+
+    parsed = index.parse_query("Sheffield Wednesday mercredi", TODAY)
+    assert (parsed["team1"], parsed["date_hint"]) == ("Sheffield Wednesday", "2026-02-04")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
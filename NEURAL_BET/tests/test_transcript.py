@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the bounded TUI transcript (whole-message eviction + JSONL archive).
+"""
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from rich.text import Text
+from textual.app import App, ComposeResult
+
+from src.ui.widgets.transcript import TranscriptLog
+
+
+class TranscriptApp(App):
+    def __init__(self, archive_path):
+        super().__init__()
+        self.archive_path = archive_path
+
+    def compose(self) -> ComposeResult:
+        yield TranscriptLog(id="log", wrap=True, markup=True, max_transcript_lines=40, archive_path=self.archive_path)
+
+
+@pytest.mark.asyncio
+async def test_transcript_is_bounded_and_archived(tmp_path):
+    archive = tmp_path / "session.jsonl"
+    app = TranscriptApp(archive)
+    async with app.run_test(size=(80, 20)) as pilot:
+        log = app.query_one(TranscriptLog)
+        for i in range(100):
+            log.write(Text(f"\nmessage {i}"))  # 2 lines per message
+            await pilot.pause(0)
+
+        assert len(log.lines) <= 40
+        assert log.archived_count > 0
+        assert len(log._messages) + log.archived_count == 100
+
+    records = [json.loads(line) for line in archive.read_text(encoding="utf-8").splitlines()]
+    assert records[0]["text"] == "message 0"
+    assert [r["text"] for r in records] == [f"message {i}" for i in range(len(records))]
+
+
+def visible_text(log, y):
+    return "".join(segment.text for segment in log.render_line(y)).strip()
+
+
+@pytest.mark.asyncio
+async def test_scrolling_after_eviction(tmp_path):
+    app = TranscriptApp(tmp_path / "session.jsonl")
+    async with app.run_test(size=(80, 20)) as pilot:
+        log = app.query_one(TranscriptLog)
+        for i in range(100):
+            log.write(Text(f"\nmessage {i}"))
+            await pilot.pause(0)
+        await pilot.pause()
+        assert log.archived_count > 0
+
+        # The end follows the last message, the top is the oldest one kept
+        assert visible_text(log, log.size.height - 1) == "message 99"
+        log.scroll_home(animate=False, immediate=True)
+        await pilot.pause()
+        assert log.scroll_y == 0
+        assert visible_text(log, 1) == f"message {log.archived_count}"
+
+        # Without auto-scroll, an eviction keeps the reader on the same message
+        log.auto_scroll = False
+        log.scroll_to(y=log.max_scroll_y, animate=False, immediate=True)
+        await pilot.pause()
+        reading, archived = visible_text(log, 1), log.archived_count
+        for i in range(100, 105):  # one more eviction, below the message read
+            log.write(Text(f"\nmessage {i}"))
+            await pilot.pause(0)
+        await pilot.pause()
+        assert log.archived_count > archived
+        assert visible_text(log, 1) == reading
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
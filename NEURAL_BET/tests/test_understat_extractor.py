@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the incremental Understat embedded-JSON extractor.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.providers.understat_extractor import UnderstatPageExtractor, UnderstatTeamPage
+from src.providers.understat_provider import UnderstatProvider
+from src.replay.understat_server import UnderstatReplayServer, render_team_page
+
+
+RECORDING = {
+    "team": "Atlético Test",
+    "season": 2025,
+    "datesData": [
+        {"id": "1", "isResult": True, "datetime": "2025-08-16 15:00:00", "h": {"title": "Atlético Test"}, "a": {"title": "O'Brien Town"}},
+        {"id": "2", "isResult": False, "datetime": "2026-03-01 15:00:00", "h": {"title": "Nîmes"}, "a": {"title": "Atlético Test"}},
+    ],
+    "statisticsData": {"formation": {"4-3-3": {"time": 900}}},
+    "playersData": [{"player_name": "Zé Roberto", "goals": "3"}],
+}
+
+
+def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_extracts_all_datasets_regardless_of_chunking(chunk_size):
+    html = render_team_page(RECORDING).encode("utf-8")
+    extractor = UnderstatPageExtractor(wanted=["datesData", "statisticsData", "playersData"])
+    for chunk in _chunks(html, chunk_size):
+        extractor.feed(chunk)
+
+    page = UnderstatTeamPage("Atlético Test", 2025, extractor.raw)
+    assert extractor.done
+    assert page.dates == RECORDING["datesData"]
+    assert page.statistics == RECORDING["statisticsData"]
+    assert page.players == RECORDING["playersData"]
+
+
+def test_stops_once_wanted_dataset_is_found():
+    html = render_team_page(RECORDING).encode("utf-8")
+    extractor = UnderstatPageExtractor(wanted=["datesData"])
+    consumed = 0
+    for chunk in _chunks(html, 32):
+        consumed += len(chunk)
+        if extractor.feed(chunk):
+            break
+
+    assert consumed < len(html)
+    assert "datesData" in extractor.raw
+    assert "playersData" not in extractor.raw
+
+
+@pytest.mark.asyncio
+async def test_provider_reuses_held_page():
+    async with UnderstatReplayServer() as server:
+        async with UnderstatProvider(base_url=server.base_url) as provider:
+            first = await provider.get_next_fixture("Arsenal")
+            second = await provider.get_next_fixture("Arsenal")
+            downloads_for_fixtures = server.stats["served"]
+            players = await provider.get_team_players("Arsenal", 2025)
+
+    assert first == second
+    assert downloads_for_fixtures == 1
+    assert players and players[0]["team_title"] == "Arsenal"
+    # playersData is only downloaded again if the first read stopped before it
+    assert server.stats["served"] <= 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the vectorized EV / Kelly engine and the ValueHunterAgent using it.
+"""
+import time
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.base import AgentState
+from src.core.calibration import CalibrationStore
+from src.core.odds_store import OddsStore
+from src.core.schemas import OrchestratorOutput
+from src.core.value import (
+    MAX_STAKE, evaluate, fair_probabilities, model_probabilities, scan_card,
+)
+
+ODDS = {"home_win": 2.10, "draw": 3.50, "away_win": 3.20, "over_2_5": 1.65, "btts_yes": 1.55}
+PRIOR = {"home_win": 0.55, "draw": 0.24, "away_win": 0.21, "over_2_5": 0.52, "btts_yes": 0.58}
+
+
+def test_margin_is_removed_from_1x2_book():
+    fair = fair_probabilities([ODDS])[0]
+
+    assert fair[:3].sum() == pytest.approx(1.0)
+    assert fair[0] < 1 / 2.10
+
+
+def test_quoted_complement_is_used_for_binary_markets():
+    fair = fair_probabilities([dict(ODDS, under_2_5=2.20)])[0]
+
+    implied_over, implied_under = 1 / 1.65, 1 / 2.20
+    assert fair[3] == pytest.approx(implied_over / (implied_over + implied_under))
+
+
+def test_ev_and_fractional_kelly():
+    result = evaluate([ODDS], [PRIOR], kelly_fraction=0.5)
+
+    ev_home = 0.55 * 2.10 - 1
+    assert result["ev"][0, 0] == pytest.approx(ev_home)
+    assert result["stake"][0, 0] == pytest.approx(min(MAX_STAKE, 0.5 * ev_home / 1.10))
+    assert result["stake"][0, 2] == 0  # negative EV: no stake
+
+
+def test_missing_prices_never_bet():
+    result = evaluate([{"home_win": 2.5}, None], [PRIOR, PRIOR])
+
+    assert result["stake"][0, 0] > 0
+    assert np.isnan(result["ev"][0, 1])
+    assert not result["stake"][1].any()
+
+
+def test_scan_card_ranks_value_bets():
+    card = [
+        {"match_id": "A", "odds": ODDS, "probs": PRIOR},
+        {"match_id": "B", "odds": ODDS, "probs": {"home_win": 0.40, "draw": 0.30, "away_win": 0.30}},
+    ]
+
+    bets = scan_card(card)
+
+    assert [bet["ev"] for bet in bets] == sorted((bet["ev"] for bet in bets), reverse=True)
+    assert ("A", "home_win") in {(bet["match_id"], bet["market"]) for bet in bets}
+    assert all(bet["ev"] > 0 for bet in bets)
+
+
+def test_full_card_is_pure_computation():
+    rng = np.random.default_rng(0)
+    card = [
+        {"match_id": str(i), "odds": ODDS, "probs": dict(zip(PRIOR, rng.uniform(0.2, 0.7, 5)))}
+        for i in range(2000)
+    ]
+
+    started = time.perf_counter()
+    scan_card(card)
+
+    assert time.perf_counter() - started < 1.0
+
+
+def test_orchestrator_verdict_reanchors_1x2():
+    probs = model_probabilities(PRIOR, "AWAY", 0.40)
+
+    assert probs["away_win"] == 0.40
+    assert probs["home_win"] + probs["draw"] == pytest.approx(0.60)
+    assert probs["home_win"] / probs["draw"] == pytest.approx(0.55 / 0.24)
+    assert probs["over_2_5"] == PRIOR["over_2_5"]
+
+
+@pytest.mark.asyncio
+async def test_value_hunter_without_llm(tmp_path):
+    from src.agents.value_hunter import ValueHunterAgent
+
+    verdict = OrchestratorOutput(
+        confidence_score=0.55, winner_prediction="HOME", logic_summary="...", decisive_factor="..."
+    )
+    state = AgentState(
+        match_id="Arsenal_Liverpool_2026-02-04_PL",
+        match_data={"home_team": "Arsenal", "away_team": "Liverpool", "prior": PRIOR},
+        market_data=ODDS,
+        analysis_reports={"orchestrator_final": verdict},
+    )
+
+    agent = ValueHunterAgent(store=OddsStore(tmp_path / "odds"), calibration=CalibrationStore(tmp_path / "calibration"))
+    result = await agent.execute(state)
+
+    assert agent.llm is None
+    report = result.analysis_reports["value_report"]
+    assert report.bet_recommendation == "Arsenal Win"
+    assert report.ev_percentage == pytest.approx(0.55 * 2.10 - 1, abs=1e-4)
+    assert 1 <= report.stake_unit <= 10
+    assert len(result.analysis_reports["value_scan"]) >= 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
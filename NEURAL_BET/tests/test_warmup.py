@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the opt-in provider warm-up, run offline against the replay server.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.core.cache import get_cache
+from src.core.warmup import warm_up
+from src.providers.neural_bet_provider import NeuralBetProvider
+from src.replay.understat_server import UnderstatReplayServer
+
+
+@pytest.mark.asyncio
+async def test_warm_up_prefills_watched_teams_and_reports_failures(monkeypatch):
+    await get_cache().clear()
+    async with UnderstatReplayServer() as server:
+        monkeypatch.setenv("UNDERSTAT_BASE_URL", server.base_url)
+        async with NeuralBetProvider() as provider:
+            report = await warm_up(provider, leagues=[], watched_teams=["Arsenal", "Atlantis FC"], llm_roles=())
+            assert server.stats["requests"] == 3  # TLS/connection warm-up + 2 team pages
+
+            form = await provider.understat.get_team_form("Arsenal")
+            assert "error" not in form
+            assert server.stats["requests"] == 3  # Served from the warmed cache
+
+    steps = {step["step"]: step["status"] for step in report["steps"]}
+    assert steps["understat_session"] == "ok"
+    assert steps["team_form:Arsenal"] == "ok"
+    assert report["failed"] == ["team_form:Atlantis FC"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])